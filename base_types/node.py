@@ -12,6 +12,7 @@ from .. utils.nodes import getAnimationNodeTrees
 from .. operators.callbacks import newNodeCallback
 from .. sockets.info import toIdName as toSocketIdName
 from .. utils.blender_ui import iterNodeCornerLocations
+from .. execution.profiling import getNodeProfile
 from .. execution.measurements import getAverageExecutionTime
 from .. operators.dynamic_operators import getInvokeFunctionOperator
 from .. tree_info import (getNetworkWithNode, getDirectlyLinkedSockets, getOriginNodes,
@@ -40,6 +41,26 @@ class AnimationNode:
     # can contain: 'No Execution', 'No Subprogram', 'No Auto Execution'
     options = set()
 
+    # the outputs only depend on the inputs and on properties that
+    # either update the execution code or call propertyChanged
+    pure = False
+
+    # nodes without side effects are not executed when their outputs are
+    # not used by other nodes; pure nodes never have side effects
+    sideEffects = True
+
+    # output nodes write the results into Blender data,
+    # only they are executed again when a cached frame is replayed
+    writesBlenderData = False
+
+    # the node executes code that is only known at execution time,
+    # e.g. a subprogram, so networks containing it can't use the frame cache
+    unknownSideEffects = False
+
+    # the node keeps references to its input data after the execution,
+    # e.g. in a cache, so the data must not be changed later
+    keepsInputReferences = False
+
     # can be "NONE", "ALWAYS" or "HIDDEN_ONLY"
     dynamicLabelType = "NONE"
 
@@ -94,6 +115,14 @@ class AnimationNode:
     def getBakeCode(self):
         return []
 
+    def getVectorizedExecutionCode(self):
+        """
+        Code that computes all iterations of a loop at once.
+        Inputs and outputs are numpy arrays or single values.
+        Return None when the current settings can't be vectorized.
+        """
+        return None
+
     def getUsedModules(self):
         return []
 
@@ -135,6 +164,9 @@ class AnimationNode:
     def draw_label(self):
         if nodeLabelMode == "MEASURE" and self.hide:
             return prettyTime(getAverageExecutionTime(self))
+        if nodeLabelMode == "PROFILE" and self.hide:
+            profile = getNodeProfile(self)
+            return prettyTime(profile.totalTime / max(profile.calls, 1) * 1e-9)
 
         if self.dynamicLabelType == "NONE":
             return self.bl_label
@@ -387,6 +419,11 @@ class AnimationNode:
     def getLocalBakeCode(self):
         return toString(self.getBakeCode())
 
+    def getLocalVectorizedExecutionCode(self):
+        code = self.getVectorizedExecutionCode()
+        if code is None: return None
+        return toString(code)
+
 
 @eventHandler("SCENE_UPDATE_POST")
 def createMissingIdentifiers(scene = None):
@@ -420,6 +457,8 @@ def updateNodeLabelMode():
     nodeLabelMode = "DEFAULT"
     if getExecutionCodeType() == "MEASURE":
         nodeLabelMode = "MEASURE"
+    elif getExecutionCodeType() == "PROFILE":
+        nodeLabelMode = "PROFILE"
 
 
 # Register
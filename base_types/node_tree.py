@@ -4,10 +4,11 @@ from bpy.props import *
 from .. utils.handlers import eventHandler
 from .. utils.nodes import getAnimationNodeTrees
 from . tree_auto_execution import AutoExecutionProperties
-from .. events import treeChanged, isRendering, propertyChanged
+from .. events import treeChanged, isRendering, propertyChanged, executionCodeChanged
 from .. utils.blender_ui import iterActiveScreens, isViewportRendering
-from .. preferences import getBlenderVersion, getAnimationNodesVersion
+from .. preferences import getBlenderVersion, getAnimationNodesVersion, parallelExecutionIsEnabled
 from .. tree_info import getNetworksByNodeTree, getSubprogramNetworksByNodeTree
+from .. execution.parallel import executeUnitsInParallel
 from .. execution.units import getMainUnitsByNodeTree, setupExecutionUnits, finishExecutionUnits
 
 
@@ -15,9 +16,18 @@ class LastTreeExecutionInfo(bpy.types.PropertyGroup):
 
     isDefault = BoolProperty(default = True)
     executionTime = FloatProperty(name = "Execution Time")
+    # used to estimate the cost of the next execution
+    averageExecutionTime = FloatProperty(name = "Average Execution Time")
     blenderVersion = IntVectorProperty(name = "Blender Version", default = (2, 77, 0))
     animationNodesVersion = IntVectorProperty(name = "Animation Nodes Version", default = (1, 0, 1))
 
+    def addExecutionTime(self, executionTime):
+        self.executionTime = executionTime
+        if self.averageExecutionTime == 0:
+            self.averageExecutionTime = executionTime
+        else:
+            self.averageExecutionTime += (executionTime - self.averageExecutionTime) * 0.2
+
     def updateVersions(self):
         self.blenderVersion = getBlenderVersion()
         self.animationNodesVersion = getAnimationNodesVersion()
@@ -35,6 +45,15 @@ class LastTreeExecutionInfo(bpy.types.PropertyGroup):
         numbers = tuple(intVector)
         return "{}.{}.{}".format(*numbers)
 
+class FrameCacheProperties(bpy.types.PropertyGroup):
+
+    enabled = BoolProperty(name = "Frame Cache", default = False,
+        description = "Remember the values passed into output nodes for every frame (only for trees that depend on nothing but the frame)",
+        update = executionCodeChanged)
+
+    memoryLimit = IntProperty(name = "Memory Limit", default = 256, min = 1,
+        description = "Maximum memory used by the cached frames in MB")
+
 class AnimationNodeTree(bpy.types.NodeTree):
     bl_idname = "an_AnimationNodeTree"
     bl_label = "Animation"
@@ -42,6 +61,7 @@ class AnimationNodeTree(bpy.types.NodeTree):
 
     autoExecution = PointerProperty(type = AutoExecutionProperties)
     lastExecutionInfo = PointerProperty(type = LastTreeExecutionInfo)
+    frameCache = PointerProperty(type = FrameCacheProperties)
 
     sceneName = StringProperty(name = "Scene",
         description = "The global scene used by this node tree (never none)")
@@ -49,7 +69,7 @@ class AnimationNodeTree(bpy.types.NodeTree):
     editNodeLabels = BoolProperty(name = "Edit Node Labels", default = False)
 
     def update(self):
-        treeChanged()
+        treeChanged(self)
 
     def canAutoExecute(self, events):
         def isAnimationPlaying():
@@ -99,14 +119,17 @@ class AnimationNodeTree(bpy.types.NodeTree):
         allExecutionsSuccessfull = True
 
         start = time.clock()
-        for unit in units:
-            success = unit.execute()
-            if not success:
-                allExecutionsSuccessfull = False
+        if parallelExecutionIsEnabled():
+            allExecutionsSuccessfull = all(executeUnitsInParallel(units))
+        else:
+            for unit in units:
+                success = unit.execute()
+                if not success:
+                    allExecutionsSuccessfull = False
         end = time.clock()
 
         if allExecutionsSuccessfull:
-            self.lastExecutionInfo.executionTime = end - start
+            self.lastExecutionInfo.addExecutionTime(end - start)
             self.lastExecutionInfo.updateVersions()
 
     @property
@@ -1,5 +1,6 @@
 import bpy
 from bpy.props import *
+from .. utils.memory import estimateSize
 from .. utils.recursion import noRecursion
 from .. operators.callbacks import newSocketCallback
 from .. events import treeChanged, executionCodeChanged
@@ -36,6 +37,8 @@ class SocketExecutionProperties(bpy.types.PropertyGroup):
 class AnimationNodeSocket:
     storable = True
     comparable = False
+    # value only depends on the socket properties and is immutable
+    persistentValue = False
 
     def textChanged(self, context):
         updateText(self)
@@ -303,6 +306,11 @@ class AnimationNodeSocket:
     def isCopyable(self):
         return hasattr(self, "getCopyExpression")
 
+    @classmethod
+    def estimateValueSize(cls, value):
+        '''Approximate memory usage of a value of this socket in bytes'''
+        return estimateSize(value)
+
     @classmethod
     def hasProperty(cls):
         return hasattr(cls, "drawProperty")
@@ -6,6 +6,11 @@ from .. utils.id_reference import tryToFindObjectReference
 triggerTypeItems = [
     ("MONITOR_PROPERTY", "Monitor Property", "", "", 0)]
 
+priorityItems = [
+    ("HIGH", "High", "Always execute this tree, even when the frame time budget is exceeded", "", 0),
+    ("NORMAL", "Normal", "", "", 1),
+    ("LOW", "Low", "Defer this tree before trees with a higher priority", "", 2)]
+
 idTypeItems = [
     ("OBJECT", "Object", "", "OBJECT_DATA", 0),
     ("SCENE", "Scene", "", "SCENE_DATA", 1)]
@@ -128,6 +133,9 @@ class AutoExecutionProperties(bpy.types.PropertyGroup):
         description = "Auto execute not that often; E.g. only every 0.5 seconds",
         default = 0.0, min = 0.0, soft_max = 1.0)
 
+    priority = EnumProperty(name = "Priority", default = "NORMAL", items = priorityItems,
+        description = "Trees with a lower priority are deferred first when the frame time budget is exceeded")
+
     lastExecutionTimestamp = FloatProperty(default = 0.0)
 
 
@@ -1,52 +1,240 @@
 import bpy
+import sys
 import bmesh
+import numpy
+import hashlib
 import itertools
+from collections import OrderedDict
 from mathutils import Vector
+from .. utils.memory import estimateSize as estimateValueSize
 
 class MeshData:
-    __slots__ = ("vertices", "edges", "polygons")
+    '''
+    The mesh is stored either in lists (vertices, edges, polygons) or in arrays:
+        vertex locations: (N, 3) float32 array
+        edge indices: (E, 2) int32 array
+        polygons: flat int32 array of vertex indices with the
+                  start and length of every polygon in it
+    Accessing the lists converts the arrays once. After that the lists are
+    used, because nodes can change them in place.
+    '''
+    __slots__ = ("_vertices", "_edges", "_polygons",
+                 "_vertexArray", "_edgeArray", "_polygonArrays")
 
     def __init__(self, vertices, edges, polygons):
         self.vertices = vertices
         self.edges = edges
         self.polygons = polygons
 
+    @staticmethod
+    def fromArrays(vertexLocations, edgeIndices, polygonIndices, polygonStarts, polygonLengths):
+        meshData = MeshData([], [], [])
+        meshData.setVertexArray(vertexLocations)
+        meshData.setEdgeArray(edgeIndices)
+        meshData.setPolygonArrays(polygonIndices, polygonStarts, polygonLengths)
+        return meshData
+
     def __repr__(self):
         return "<AN Mesh Data Object: Vertices: {}, Edges: {}, Polygons: {}>".format(
-                len(self.vertices), len(self.edges), len(self.polygons))
+                self.vertexAmount, self.edgeAmount, self.polygonAmount)
 
     def copy(self):
-        return MeshData(copyVectorList(self.vertices), copy2dList(self.edges), copy2dList(self.polygons))
+        meshData = MeshData([], [], [])
+        if self._vertices is None: meshData.setVertexArray(self._vertexArray.copy())
+        else: meshData.vertices = copyVectorList(self._vertices)
+        if self._edges is None: meshData.setEdgeArray(self._edgeArray.copy())
+        else: meshData.edges = copy2dList(self._edges)
+        if self._polygons is None: meshData.setPolygonArrays(*(array.copy() for array in self._polygonArrays))
+        else: meshData.polygons = copy2dList(self._polygons)
+        return meshData
 
-    def isValid(self, checkTupleLengths = True, checkIndices = True):
-        try:
-            if checkTupleLengths:
-                if not self.hasValidEdgeTupleLengths(): return False
-                if not self.hasValidPolygonTupleLengths(): return False
-            if checkIndices:
-                if not self.hasValidIndices(): return False
-        except:
-            return False
-        return True
+    def estimateSize(self):
+        '''Approximate memory usage in bytes of the lists or arrays that are in use'''
+        return estimateSlotsSize(self)
+
+
+    # List Views
+    ##########################################
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = [Vector(location) for location in self._vertexArray.tolist()]
+            self._vertexArray = None
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+        self._vertexArray = None
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._edges = [tuple(edge) for edge in self._edgeArray.tolist()]
+            self._edgeArray = None
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+        self._edgeArray = None
+
+    @property
+    def polygons(self):
+        if self._polygons is None:
+            indices, starts, lengths = (array.tolist() for array in self._polygonArrays)
+            self._polygons = [tuple(indices[start:start + length]) for start, length in zip(starts, lengths)]
+            self._polygonArrays = None
+        return self._polygons
+
+    @polygons.setter
+    def polygons(self, polygons):
+        self._polygons = polygons
+        self._polygonArrays = None
+
+
+    # Arrays
+    ##########################################
+
+    def getVertexArray(self):
+        if self._vertexArray is not None: return self._vertexArray
+        amount = len(self._vertices)
+        flatLocations = numpy.fromiter(itertools.chain.from_iterable(self._vertices), dtype = numpy.float32, count = amount * 3)
+        return flatLocations.reshape((amount, 3))
+
+    def getEdgeArray(self):
+        if self._edgeArray is not None: return self._edgeArray
+        edgeIndices = numpy.array(self._edges, dtype = numpy.int32).reshape((-1, 2))
+        if len(edgeIndices) != len(self._edges): raise ValueError("edges need two indices")
+        return edgeIndices
+
+    def getPolygonArrays(self):
+        '''Returns the vertex indices of all polygons and the start and length of every polygon'''
+        if self._polygonArrays is not None: return self._polygonArrays
+        lengths = numpy.fromiter(map(len, self._polygons), dtype = numpy.int32, count = len(self._polygons))
+        indices = numpy.fromiter(itertools.chain.from_iterable(self._polygons), dtype = numpy.int32, count = int(lengths.sum()))
+        starts = numpy.zeros(len(lengths), dtype = numpy.int32)
+        numpy.cumsum(lengths[:-1], out = starts[1:])
+        return indices, starts, lengths
+
+    def setVertexArray(self, vertexLocations):
+        self._vertexArray = numpy.asarray(vertexLocations, dtype = numpy.float32).reshape((-1, 3))
+        self._vertices = None
+
+    def setEdgeArray(self, edgeIndices):
+        self._edgeArray = numpy.asarray(edgeIndices, dtype = numpy.int32).reshape((-1, 2))
+        self._edges = None
+
+    def setPolygonArrays(self, polygonIndices, polygonStarts, polygonLengths):
+        self._polygonArrays = tuple(numpy.asarray(array, dtype = numpy.int32)
+            for array in (polygonIndices, polygonStarts, polygonLengths))
+        self._polygons = None
+
+    def getTopologyFingerprint(self):
+        '''Is equal for meshes with the same vertex amount, edges and polygons'''
+        polygonIndices, _, polygonLengths = self.getPolygonArrays()
+        md5 = hashlib.md5()
+        md5.update(str(self.vertexAmount).encode())
+        for array in (self.getEdgeArray(), polygonIndices, polygonLengths):
+            md5.update(str(len(array)).encode())
+            md5.update(numpy.ascontiguousarray(array).tobytes())
+        return md5.digest()
+
+    @property
+    def vertexAmount(self):
+        return len(self._vertexArray if self._vertices is None else self._vertices)
+
+    @property
+    def edgeAmount(self):
+        return len(self._edgeArray if self._edges is None else self._edges)
+
+    @property
+    def polygonAmount(self):
+        return len(self._polygonArrays[1] if self._polygons is None else self._polygons)
+
+
+    # Validation
+    ##########################################
+
+    def isValid(self, checkTupleLengths = True, checkIndices = True, fingerprint = None):
+        return self.getValidationError(checkTupleLengths, checkIndices, fingerprint) is None
+
+    def getValidationError(self, checkTupleLengths = True, checkIndices = True, fingerprint = None):
+        '''
+        Returns a message that describes the first invalid element or None.
+        The result is cached when the topology fingerprint is given.
+        '''
+        if fingerprint is None:
+            return self.findValidationError(checkTupleLengths, checkIndices)
+
+        key = (fingerprint, checkTupleLengths, checkIndices)
+        if key in validationCache:
+            validationCache.move_to_end(key)
+        else:
+            validationCache[key] = self.findValidationError(checkTupleLengths, checkIndices)
+            if len(validationCache) > 100: validationCache.popitem(last = False)
+        return validationCache[key]
+
+    def findValidationError(self, checkTupleLengths, checkIndices):
+        if checkTupleLengths:
+            error = self.findInvalidEdgeTupleLength() or self.findInvalidPolygonTupleLength()
+            if error is not None: return error
+        elif not self.canCreateArrays():
+            return "The edges or polygons can't be converted"
+        if checkIndices:
+            return self.findInvalidIndex()
+        return None
 
-    def hasValidEdgeTupleLengths(self):
-        checkTuple = tuple([2] * len(self.edges))
-        edgeTupleLengths = tuple(map(len, self.edges))
-        return checkTuple == edgeTupleLengths
+    def findInvalidEdgeTupleLength(self):
+        if self._edges is None: return None
+        lengths = getTupleLengths(self._edges)
+        invalid = numpy.flatnonzero(lengths != 2)
+        if len(invalid) > 0:
+            index = invalid[0]
+            return "Edge {} has {} indices instead of 2".format(index, lengths[index])
 
-    def hasValidPolygonTupleLengths(self):
-        polygonTupleLengths = set(map(len, self.polygons))
-        return all(amount >= 3 for amount in polygonTupleLengths)
+    def findInvalidPolygonTupleLength(self):
+        if self._polygons is None: lengths = self._polygonArrays[2]
+        else: lengths = getTupleLengths(self._polygons)
+        invalid = numpy.flatnonzero(lengths < 3)
+        if len(invalid) > 0:
+            index = invalid[0]
+            return "Polygon {} has {} indices, at least 3 are needed".format(index, lengths[index])
 
-    def hasValidIndices(self):
-        maxEdgeIndex = max(itertools.chain([-1], *self.edges))
-        maxPolygonIndex = max(itertools.chain([-1], *self.polygons))
+    def findInvalidIndex(self):
+        vertexAmount = self.vertexAmount
 
-        minEdgeIndex = min(itertools.chain([0], *self.edges))
-        minPolygonIndex = min(itertools.chain([0], *self.polygons))
+        invalidEdges = findInvalidIndices(self.getEdgeArray().ravel(), vertexAmount)
+        if len(invalidEdges) > 0:
+            index = invalidEdges[0]
+            return "Edge {} uses the vertex index {}, but there are only {} vertices".format(
+                index // 2, self.getEdgeArray().ravel()[index], vertexAmount)
 
-        return max(maxEdgeIndex, maxPolygonIndex) < len(self.vertices) and min(minEdgeIndex, minPolygonIndex) >= 0
+        polygonIndices, polygonStarts, _ = self.getPolygonArrays()
+        invalidLoops = findInvalidIndices(polygonIndices, vertexAmount)
+        if len(invalidLoops) > 0:
+            index = invalidLoops[0]
+            polygonIndex = numpy.searchsorted(polygonStarts, index, side = "right") - 1
+            return "Polygon {} uses the vertex index {}, but there are only {} vertices".format(
+                polygonIndex, polygonIndices[index], vertexAmount)
 
+    def canCreateArrays(self):
+        try:
+            self.getEdgeArray()
+            self.getPolygonArrays()
+            return True
+        except:
+            return False
+
+# (topology fingerprint, check tuple lengths, check indices) -> error message or None
+validationCache = OrderedDict()
+
+def getTupleLengths(tuples):
+    return numpy.fromiter(map(len, tuples), dtype = numpy.int32, count = len(tuples))
+
+def findInvalidIndices(indices, vertexAmount):
+    return numpy.flatnonzero((indices < 0) | (indices >= vertexAmount))
 
 
 
@@ -82,6 +270,9 @@ class Vertex:
     def copy(self):
         return Vertex(self.location.copy(), self.normal.copy(), self.groupWeights[:])
 
+    def estimateSize(self):
+        return estimateSlotsSize(self)
+
 
 class Polygon:
     __slots__ = ("vertexLocations", "normal", "center", "area", "materialIndex")
@@ -127,11 +318,119 @@ class Polygon:
         return Polygon(copyVectorList(self.vertexLocations), self.normal.copy(),
                        self.center, self.area, self.materialIndex)
 
+    def estimateSize(self):
+        return estimateSlotsSize(self)
+
     def __repr__(self):
         return "<Polygon - Center: ({:.3f}, {:.3f}, {:.3f}), Verts: {}>".format(
             self.center.x, self.center.y, self.center.z, len(self.vertexLocations))
 
 
+class PolygonArray:
+    '''
+    Stores many polygons in arrays instead of separate Polygon objects:
+        centers, normals: (P, 3) float32 arrays
+        areas: (P, ) float32 array
+        materialIndices: (P, ) int32 array
+        vertexLocations: (L, 3) float32 array with the locations of all polygons
+        offsets: (P + 1, ) int32 array, polygon i uses vertexLocations[offsets[i]:offsets[i + 1]]
+    '''
+    __slots__ = ("centers", "normals", "areas", "materialIndices", "vertexLocations", "offsets")
+
+    @staticmethod
+    def fromPolygons(polygons):
+        amount = len(polygons)
+        lengths = numpy.fromiter((len(polygon.vertexLocations) for polygon in polygons), dtype = numpy.int32, count = amount)
+        offsets = numpy.zeros(amount + 1, dtype = numpy.int32)
+        numpy.cumsum(lengths, out = offsets[1:])
+
+        locations = itertools.chain.from_iterable(polygon.vertexLocations for polygon in polygons)
+        return PolygonArray(
+            centers = getVectorArray((polygon.center for polygon in polygons), amount),
+            normals = getVectorArray((polygon.normal for polygon in polygons), amount),
+            areas = numpy.fromiter((polygon.area for polygon in polygons), dtype = numpy.float32, count = amount),
+            materialIndices = numpy.fromiter((polygon.materialIndex for polygon in polygons), dtype = numpy.int32, count = amount),
+            vertexLocations = getVectorArray(locations, int(offsets[-1])),
+            offsets = offsets)
+
+    @staticmethod
+    def empty():
+        return PolygonArray(
+            centers = numpy.zeros((0, 3), dtype = numpy.float32),
+            normals = numpy.zeros((0, 3), dtype = numpy.float32),
+            areas = numpy.zeros(0, dtype = numpy.float32),
+            materialIndices = numpy.zeros(0, dtype = numpy.int32),
+            vertexLocations = numpy.zeros((0, 3), dtype = numpy.float32),
+            offsets = numpy.zeros(1, dtype = numpy.int32))
+
+    def __init__(self, centers, normals, areas, materialIndices, vertexLocations, offsets):
+        self.centers = centers
+        self.normals = normals
+        self.areas = areas
+        self.materialIndices = materialIndices
+        self.vertexLocations = vertexLocations
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.centers)
+
+    def __repr__(self):
+        return "<AN Polygon Array: Polygons: {}, Vertices: {}>".format(len(self), len(self.vertexLocations))
+
+    def copy(self):
+        return PolygonArray(self.centers.copy(), self.normals.copy(), self.areas.copy(),
+            self.materialIndices.copy(), self.vertexLocations.copy(), self.offsets.copy())
+
+    def estimateSize(self):
+        return estimateSlotsSize(self)
+
+    @property
+    def lengths(self):
+        return numpy.diff(self.offsets)
+
+    def getPolygonIndexOfLocations(self):
+        return numpy.repeat(numpy.arange(len(self), dtype = numpy.int32), self.lengths)
+
+    def transformVertexLocations(self, matrix, pivotType = "WORLD_ORIGIN", pivot = None):
+        '''
+        Same as applying Matrix.Translation(pivot) * matrix * Matrix.Translation(-pivot)
+        to the locations. With the "CENTER" pivot type every polygon uses its own center.
+        '''
+        matrix = numpy.array(matrix, dtype = numpy.float32)
+        if pivotType == "CENTER": pivots = self.centers[self.getPolygonIndexOfLocations()]
+        elif pivotType == "CUSTOM": pivots = numpy.array(pivot, dtype = numpy.float32)
+        else: pivots = numpy.zeros(3, dtype = numpy.float32)
+
+        locations = (self.vertexLocations - pivots).dot(matrix[:3, :3].T)
+        self.vertexLocations = locations + matrix[:3, 3] + pivots
+
+    def toPolygons(self):
+        locations = [Vector(location) for location in self.vertexLocations.tolist()]
+        normals = self.normals.tolist()
+        centers = self.centers.tolist()
+        areas = self.areas.tolist()
+        materialIndices = self.materialIndices.tolist()
+        offsets = self.offsets.tolist()
+        return [Polygon(locations[offsets[i]:offsets[i + 1]], Vector(normals[i]), Vector(centers[i]), areas[i], materialIndices[i])
+                for i in range(len(centers))]
+
+    def toMeshData(self):
+        '''Every polygon gets its own vertices'''
+        return MeshData.fromArrays(
+            self.vertexLocations,
+            numpy.zeros((0, 2), dtype = numpy.int32),
+            numpy.arange(len(self.vertexLocations), dtype = numpy.int32),
+            self.offsets[:-1],
+            self.lengths)
+
+def estimateSlotsSize(object):
+    return sys.getsizeof(object) + sum(estimateValueSize(getattr(object, name)) for name in object.__slots__)
+
+def getVectorArray(vectors, amount):
+    flatValues = numpy.fromiter(itertools.chain.from_iterable(vectors), dtype = numpy.float32, count = amount * 3)
+    return flatValues.reshape((amount, 3))
+
+
 def copyVectorList(list):
     return [vertex.copy() for vertex in list]
 
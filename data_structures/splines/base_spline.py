@@ -1,6 +1,8 @@
+import sys
 import copy
 from mathutils import Vector
 from . utils import findNearestParameterOnLine
+from ... utils.memory import estimateSize as estimateValueSize
 
 '''
 How to use Splines:
@@ -26,6 +28,10 @@ class Spline:
     def copy(self):
         return copy.deepcopy(self)
 
+    def estimateSize(self):
+        # includes the points and the data that is calculated when the spline is updated
+        return sys.getsizeof(self) + estimateValueSize(self.__dict__)
+
 
     def transform(self, matrix):
         return self
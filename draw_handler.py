@@ -2,6 +2,7 @@ import bpy
 from . preferences import getExecutionCodeType
 from . ui.problems_panel import drawWarningOverlay
 from . ui.node_editor_hud import drawNodeEditorHud
+from . execution.profiling import drawProfileResults
 from . execution.measurements import drawMeasurementResults
 from . nodes.generic.debug_drawer import drawDebugTextBoxes
 from . nodes.interpolation.debug import drawInterpolationPreviews
@@ -11,6 +12,8 @@ def drawNodeEditor():
     drawInterpolationPreviews()
     if getExecutionCodeType() == "MEASURE":
         drawMeasurementResults()
+    elif getExecutionCodeType() == "PROFILE":
+        drawProfileResults()
     drawNodeEditorHud()
     drawWarningOverlay()
 
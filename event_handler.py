@@ -1,12 +1,22 @@
 import bpy
-import itertools
+import time
+from collections import defaultdict
 from . import problems
+from . import tree_info
 from . update import updateEverything
 from . utils.recursion import noRecursion
+from . utils.operators import makeOperator
+from . preferences import getPreferences
 from . tree_info import iterSocketsThatNeedUpdate
-from . utils.nodes import iterNodesInAnimationNodeTrees, getAnimationNodeTrees
+from . utils.nodes import getAnimationNodeTrees
 from . execution.units import setupExecutionUnits, finishExecutionUnits
-from . execution.auto_execution import iterAutoExecutionNodeTrees, executeNodeTrees, afterExecution
+from . execution.auto_execution import iterAutoExecutionNodeTrees, executeNodeTrees, afterExecution, hasDeferredNodeTrees
+
+# events that could not be handled yet are merged with the next ones
+pendingEvents = set()
+eventCounters = defaultdict(int)
+lastTreeUpdateTime = 0
+lastPropertyUpdateTime = 0
 
 @noRecursion
 def update(events):
@@ -14,18 +24,104 @@ def update(events):
         print("Skip event: cannot write to ID classes")
         return
 
-    if didNameChange() or events.intersection({"File", "Addon", "Tree"}):
-        updateEverything()
+    for event in events:
+        eventCounters[event] += 1
+    if len(pendingEvents) > 0:
+        eventCounters["Coalesced"] += 1
+
+    # everything that is keyed by names is outdated after a rename,
+    # so this has to be checked before anything is executed
+    if runStage("Check Names", lambda: didNameChange(events)):
+        tree_info.namesChanged()
+        events.add("Tree")
+
+    pendingEvents.update(events)
+    events = set(pendingEvents)
+    prefs = getPreferences()
+    now = time.perf_counter()
+    treeUpdateDeferred = False
+
+    if events.intersection({"File", "Addon"}):
+        runStage("Update Everything", updateEverything)
+        markTreeUpdated(now)
+    elif "Tree" in events:
+        # many tree changes can happen in a short time, e.g. when links are dragged,
+        # so the tree is only updated again after the debounce time
+        from . events import isRendering
+        if now - lastTreeUpdateTime < prefs.eventDebounceTime and not isRendering():
+            treeUpdateDeferred = True
+        else:
+            runStage("Update Everything", updateEverything)
+            markTreeUpdated(now)
+
+    if now - lastPropertyUpdateTime >= prefs.propertyUpdateInterval:
+        updatePropertiesIfNecessary(now)
 
-    updateProperties()
+    pendingEvents.clear()
+    if treeUpdateDeferred:
+        # the other events are still handled, trees that execute
+        # on tree changes wait until they have been updated
+        pendingEvents.add("Tree")
+        events.discard("Tree")
 
     if problems.canAutoExecute():
-        nodeTrees = list(iterAutoExecutionNodeTrees(events))
-        if len(nodeTrees) > 0:
-            setupExecutionUnits()
-            executeNodeTrees(nodeTrees)
-            afterExecution()
-            finishExecutionUnits()
+        nodeTrees = runStage("Find Trees", lambda: list(iterAutoExecutionNodeTrees(events)))
+        if len(nodeTrees) > 0 or hasDeferredNodeTrees():
+            runStage("Setup", setupExecutionUnits)
+            executedTrees = runStage("Execution", lambda: executeNodeTrees(nodeTrees, events))
+            if len(executedTrees) > 0:
+                runStage("After Execution", afterExecution)
+            runStage("Finish", finishExecutionUnits)
+
+def markTreeUpdated(now):
+    global lastTreeUpdateTime
+    lastTreeUpdateTime = now
+
+def updatePropertiesIfNecessary(now):
+    global lastPropertyUpdateTime
+    lastPropertyUpdateTime = now
+    runStage("Update Properties", updateProperties)
+
+
+# Stage Timings
+##########################################
+
+class StageTiming:
+    __slots__ = ("calls", "lastTime", "averageTime")
+
+    def __init__(self):
+        self.calls = 0
+        self.lastTime = 0
+        self.averageTime = 0
+
+    def add(self, duration):
+        self.calls += 1
+        self.lastTime = duration
+        # exponential moving average, so that old events fade out
+        self.averageTime += (duration - self.averageTime) * (1 if self.calls == 1 else 0.05)
+
+stageTimings = {}
+
+def runStage(name, function):
+    start = time.perf_counter()
+    output = function()
+    duration = time.perf_counter() - start
+
+    if name not in stageTimings:
+        stageTimings[name] = StageTiming()
+    stageTimings[name].add(duration)
+    return output
+
+def getStageTimings():
+    return stageTimings
+
+def getEventCounters():
+    return eventCounters
+
+@makeOperator("an.reset_event_statistics", "Reset Event Statistics", redraw = True)
+def resetEventStatistics():
+    stageTimings.clear()
+    eventCounters.clear()
 
 
 def failsToWriteToIDClasses():
@@ -38,20 +134,29 @@ def failsToWriteToIDClasses():
     except: return True
 
 oldNamesHash = 0
+oldTreesSignature = None
+
+def didNameChange(events):
+    global oldNamesHash, oldTreesSignature
+    # comparing all node names on every scene update would be too slow,
+    # so it is only done when a tree could have changed
+    treesSignature = getTreesSignature()
+    if (treesSignature == oldTreesSignature and "Tree" not in events
+            and not bpy.data.node_groups.is_updated): return False
+    oldTreesSignature = treesSignature
 
-def didNameChange():
-    global oldNamesHash
     newHash = getNamesHash()
     if newHash != oldNamesHash:
         oldNamesHash = newHash
         return True
     return False
 
+def getTreesSignature():
+    return tuple((tree.name, len(tree.nodes)) for tree in getAnimationNodeTrees())
+
 def getNamesHash():
-    names = set(itertools.chain(
-        (tree.name for tree in getAnimationNodeTrees()),
-        (node.name for node in iterNodesInAnimationNodeTrees())))
-    return names
+    # keys() gets all node names in one call, which is much faster than accessing every node
+    return hash(tuple((tree.name, tuple(tree.nodes.keys())) for tree in getAnimationNodeTrees()))
 
 def updateProperties():
     for socket in iterSocketsThatNeedUpdate():
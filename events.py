@@ -2,11 +2,13 @@ import bpy
 from . import tree_info
 from . import event_handler
 from . utils.handlers import eventHandler
+from . execution.units import socketValueChanged, nodePropertyChanged, tearDownExecutionUnits
 
 class EventState:
     def __init__(self):
         self.reset()
         self.isRendering = False
+        self.isBaking = False
 
     def reset(self):
         self.treeChanged = False
@@ -40,7 +42,9 @@ def renderFramePre():
     evaluateRaisedEvents()
 
 def evaluateRaisedEvents():
-    event_handler.update(event.getActives())
+    # the batch bake executes the trees itself
+    if not event.isBaking:
+        event_handler.update(event.getActives())
     event.reset()
 
 
@@ -50,18 +54,29 @@ def frameChanged(scene):
 
 def propertyChanged(self = None, context = None):
     event.propertyChanged = True
+    if isinstance(self, bpy.types.NodeSocket):
+        socketValueChanged(self)
+    elif isinstance(self, bpy.types.Node):
+        nodePropertyChanged(self)
 
 @eventHandler("FILE_LOAD_POST")
 def fileLoaded():
     from . nodes.system.subprogram_sockets import forceSubprogramUpdate
     forceSubprogramUpdate()
     event.fileChanged = True
-    treeChanged()
+    event.treeChanged = True
+    tree_info.treeChanged()
+
+@eventHandler("UNDO_POST")
+def undoPerformed():
+    # all references to Blender data are invalid after undo
+    tearDownExecutionUnits()
 
 @eventHandler("ADDON_LOAD_POST")
 def addonChanged():
     event.addonChanged = True
-    treeChanged()
+    event.treeChanged = True
+    tree_info.treeChanged()
 
 def executionCodeChanged(self = None, context = None):
     treeChanged()
@@ -71,7 +86,12 @@ def networkChanged(self = None, context = None):
 
 def treeChanged(self = None, context = None):
     event.treeChanged = True
-    tree_info.treeChanged()
+    if isinstance(self, bpy.types.NodeTree):
+        tree_info.treeChanged(self.name)
+    elif isinstance(self, bpy.types.Node):
+        tree_info.treeChanged(self.id_data.name)
+    else:
+        tree_info.allTreesChanged()
 
 
 @eventHandler("RENDER_INIT")
@@ -85,3 +105,6 @@ def renderEnd():
 
 def isRendering():
     return event.isRendering
+
+def setBaking(isBaking):
+    event.isBaking = isBaking
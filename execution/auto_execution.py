@@ -1,18 +1,28 @@
 import bpy
+import time
 from .. import problems
 from .. preferences import getPreferences
 from .. utils.blender_ui import redrawAll
 from .. utils.nodes import getAnimationNodeTrees
 
+priorityOrder = {"HIGH" : 0, "NORMAL" : 1, "LOW" : 2}
+
 def iterAutoExecutionNodeTrees(events):
     if not problems.canExecute(): return
     for nodeTree in getAnimationNodeTrees():
         if nodeTree.canAutoExecute(events):
             yield nodeTree
 
-def executeNodeTrees(nodeTrees):
-    for nodeTree in nodeTrees:
-        nodeTree.autoExecute()
+def executeNodeTrees(nodeTrees, events):
+    '''Returns the trees that have been executed'''
+    from .. events import isRendering
+    prefs = getPreferences()
+    if prefs.autoExecutionTimeBudget == 0 or isRendering():
+        deferredTrees.clear()
+        for nodeTree in nodeTrees:
+            nodeTree.autoExecute()
+        return nodeTrees
+    return executeNodeTreesInBudget(nodeTrees, events, prefs.autoExecutionTimeBudget, prefs.autoExecutionIdleTime)
 
 def afterExecution():
     prefs = getPreferences()
@@ -23,3 +33,68 @@ def afterExecution():
     from .. events import isRendering
     if prefs.redrawAllAfterAutoExecution and not isRendering():
         redrawAll()
+
+
+# Frame Time Governor
+##########################################
+
+# tree name -> time when the execution has been deferred first
+deferredTrees = {}
+# time of the last event that was not only a scene update
+lastActivityTime = 0
+
+def hasDeferredNodeTrees():
+    return len(deferredTrees) > 0
+
+def isNodeTreeDeferred(nodeTree):
+    return nodeTree.name in deferredTrees
+
+def executeNodeTreesInBudget(nodeTrees, events, budget, idleTime):
+    '''
+    Trees are executed by priority, trees that waited longer come first.
+    Trees without high priority are deferred when their recent execution time
+    does not fit into the remaining budget.
+    Deferred trees are caught up when nothing but scene updates happened for the idle time.
+    One of them can exceed the budget then, so that heavy trees are executed eventually.
+    '''
+    global lastActivityTime
+    start = time.perf_counter()
+    now = time.time()
+
+    if len(events - {"Scene"}) > 0:
+        lastActivityTime = now
+    isIdle = now - lastActivityTime >= idleTime
+
+    candidates = list(nodeTrees)
+    if isIdle:
+        candidates.extend(tree for tree in getDeferredNodeTrees() if tree not in nodeTrees)
+    candidates.sort(key = lambda tree: (priorityOrder[tree.autoExecution.priority],
+                                        deferredTrees.get(tree.name, now)))
+
+    catchUpTree = None
+    if isIdle:
+        catchUpTree = next((tree for tree in candidates if tree.name in deferredTrees), None)
+
+    executedTrees = []
+    for nodeTree in candidates:
+        elapsed = time.perf_counter() - start
+        estimate = nodeTree.lastExecutionInfo.averageExecutionTime
+        if (nodeTree.autoExecution.priority == "HIGH" or nodeTree == catchUpTree
+                or elapsed + estimate <= budget):
+            deferredTrees.pop(nodeTree.name, None)
+            nodeTree.autoExecute()
+            executedTrees.append(nodeTree)
+        elif nodeTree.name not in deferredTrees:
+            deferredTrees[nodeTree.name] = now
+    return executedTrees
+
+def getDeferredNodeTrees():
+    nodeTrees = []
+    for name in list(deferredTrees.keys()):
+        nodeTree = bpy.data.node_groups.get(name)
+        if getattr(nodeTree, "bl_idname", "") == "an_AnimationNodeTree":
+            if nodeTree.autoExecution.enabled and nodeTree.hasMainExecutionUnits:
+                nodeTrees.append(nodeTree)
+                continue
+        del deferredTrees[name]
+    return nodeTrees
@@ -0,0 +1,114 @@
+import bpy
+from array import array
+
+_activeRecorder = None
+
+def insertKeyframe(struct, data_path, index = -1, **kwargs):
+    '''
+    Used instead of keyframe_insert in the bake code, so it has the same arguments.
+    The values are only collected while a batch bake is running.
+    '''
+    if _activeRecorder is None:
+        struct.keyframe_insert(data_path, index = index, **kwargs)
+    else:
+        _activeRecorder.record(struct, data_path, index, **kwargs)
+
+def startRecording(recorder):
+    global _activeRecorder
+    _activeRecorder = recorder
+
+def stopRecording():
+    global _activeRecorder
+    _activeRecorder = None
+
+
+class KeyframeRecorder:
+    '''
+    Collects the baked values of all frames, so that the keyframes
+    of every fcurve can be created at once in the end.
+    '''
+
+    def __init__(self):
+        self.frame = 0
+        # (id pointer, data path, index) -> (id, group, frames, values)
+        self.curves = {}
+
+    def record(self, struct, dataPath, index, frame = None, group = "", **kwargs):
+        if frame is None: frame = self.frame
+        value = struct.path_resolve(dataPath)
+
+        if len(kwargs) > 0:
+            # other options like the keyframe type can't be collected
+            struct.keyframe_insert(dataPath, index = index, frame = frame, group = group, **kwargs)
+        elif isinstance(value, (bool, int, float)):
+            self.recordValue(struct, dataPath, max(index, 0), value, frame, group)
+        elif hasattr(value, "__len__") and not isinstance(value, str) and index == -1:
+            for i, component in enumerate(value):
+                self.recordValue(struct, dataPath, i, component, frame, group)
+        elif hasattr(value, "__getitem__") and not isinstance(value, str):
+            self.recordValue(struct, dataPath, index, value[index], frame, group)
+        else:
+            # e.g. enum properties can't be stored as floats
+            struct.keyframe_insert(dataPath, index = index, frame = frame, group = group)
+
+    def recordValue(self, struct, dataPath, index, value, frame, group):
+        idData = struct.id_data
+        key = (idData.as_pointer(), getPathFromID(struct, dataPath), index)
+        if key not in self.curves:
+            self.curves[key] = (idData, group, array("f"), array("f"))
+        _, _, frames, values = self.curves[key]
+        frames.append(frame)
+        values.append(value)
+
+    def writeKeyframes(self):
+        for (_, dataPath, index), (idData, group, frames, values) in self.curves.items():
+            fcurve = getOrCreateFCurve(idData, dataPath, index, group)
+            if fcurve is not None:
+                replaceKeyframes(fcurve, frames, values)
+        self.curves.clear()
+
+def getPathFromID(struct, dataPath):
+    if isinstance(struct, bpy.types.ID):
+        return dataPath
+    structPath = struct.path_from_id()
+    if dataPath.startswith("["):
+        return structPath + dataPath
+    return structPath + "." + dataPath
+
+def getOrCreateFCurve(idData, dataPath, index, group = ""):
+    try:
+        animationData = idData.animation_data
+        if animationData is None:
+            animationData = idData.animation_data_create()
+        if animationData.action is None:
+            animationData.action = bpy.data.actions.new(idData.name + "Action")
+        fcurves = animationData.action.fcurves
+        fcurve = fcurves.find(dataPath, index)
+        if fcurve is None:
+            fcurve = fcurves.new(dataPath, index, group)
+        return fcurve
+    except:
+        return None
+
+def replaceKeyframes(fcurve, frames, values):
+    points = fcurve.keyframe_points
+
+    # existing keyframes in the baked frame range are replaced
+    start, end = min(frames), max(frames)
+    for point in reversed(list(points)):
+        if start <= point.co.x <= end:
+            points.remove(point, fast = True)
+
+    oldAmount = len(points)
+    points.add(len(frames))
+
+    # the handles of the new keyframes are calculated by the update below
+    for attribute in ("co", "handle_left", "handle_right"):
+        coordinates = array("f", [0]) * (len(points) * 2)
+        points.foreach_get(attribute, coordinates)
+        coordinates[oldAmount * 2::2] = frames
+        coordinates[oldAmount * 2 + 1::2] = values
+        points.foreach_set(attribute, coordinates)
+
+    # sorts the keyframes and calculates the handles
+    fcurve.update()
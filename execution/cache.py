@@ -1,4 +1,5 @@
-from .. utils import fcurve
+from .. utils import fcurve, mesh
 
 def clearExecutionCache():
     fcurve.clearCache()
+    mesh.clearCache()
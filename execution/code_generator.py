@@ -4,7 +4,114 @@ from itertools import chain
 from functools import lru_cache
 from .. problems import NodeFailesToCreateExecutionCode
 from .. preferences import addonName, getExecutionCodeType
-from .. tree_info import iterLinkedSocketsWithInfo, isSocketLinked
+from .. tree_info import iterLinkedSocketsWithInfo, getLinkedSocketIDs, iterInputsWithLinkedIDs, iterOutputsWithLinkedIDs
+
+
+
+# Unused Nodes
+##########################################
+
+def removeUnusedNodes(nodes):
+    '''
+    Nodes without side effects whose outputs don't reach a node with
+    side effects are not executed. The monitor and measure modes keep
+    all nodes so that every node can still be inspected.
+    '''
+    if getExecutionCodeType() not in ("DEFAULT", "BAKE"): return nodes
+
+    usedNodeIDs = set()
+    for node in reversed(nodes):
+        if isNodeUsed(node, usedNodeIDs):
+            usedNodeIDs.add(node.toID())
+    return [node for node in nodes if node.toID() in usedNodeIDs]
+
+def isNodeUsed(node, usedNodeIDs):
+    if node.sideEffects and not node.pure: return True
+    for socket, linkedIDs in iterOutputsWithLinkedIDs(node):
+        for targetID in linkedIDs:
+            if targetID[0] in usedNodeIDs: return True
+    return False
+
+
+
+# Constant Folding
+##########################################
+
+def getFoldedNodes(nodes):
+    '''
+    Pure nodes whose inputs only depend on unlinked sockets with a
+    persistent value or on other folded nodes are executed once in
+    the setup script. Their results are constants for the execution code.
+    '''
+    if getExecutionCodeType() not in ("DEFAULT", "BAKE"): return []
+
+    foldedNodeIDs = set()
+    foldedNodes = []
+    for node in nodes:
+        if isNodeFoldable(node, foldedNodeIDs):
+            foldedNodeIDs.add(node.toID())
+            foldedNodes.append(node)
+    return foldedNodes
+
+def isNodeFoldable(node, foldedNodeIDs):
+    if not node.pure: return False
+    for socket, linkedIDs in iterInputsWithLinkedIDs(node):
+        if len(linkedIDs) == 0:
+            if hasattr(socket, "getValue") and not socket.persistentValue: return False
+        elif linkedIDs[0][0] not in foldedNodeIDs: return False
+    return True
+
+def getUnfoldedNodes(nodes, foldedNodes):
+    foldedNodes = set(foldedNodes)
+    return [node for node in nodes if node not in foldedNodes]
+
+def foldedNodesChanged(foldedNodeIDs, changedProperties):
+    return any((treeName, nodeName) in foldedNodeIDs for treeName, nodeName, _ in changedProperties)
+
+def iter_ExecuteFoldedNodes(foldedNodes, variables, nodeByID):
+    iterNodeExecutionLines = getFunction_IterNodeExecutionLines()
+    foldedNodeIDs = {node.toID() for node in foldedNodes}
+    for node in foldedNodes:
+        yield from iterNodeExecutionLines(node, variables)
+        for socket in node.linkedOutputs:
+            foldedTargets, otherTargets = splitFoldedTargets(socket, node, variables, nodeByID, foldedNodeIDs)
+            # the value has to stay unchanged when it is used in the execution code
+            needACopy = getTargetsThatNeedACopy(socket, foldedTargets, keepOriginal = len(otherTargets) > 0)
+            for target in foldedTargets:
+                if target in needACopy: yield getCopyLine(socket, variables[target], variables)
+                else: variables[target] = variables[socket]
+
+def iterFoldedValueLines(foldedNodes, variables, nodeByID, memoization = None, exportedSockets = None):
+    '''
+    Passes the folded values to the nodes in the execution code.
+    Values that leave the subprogram through the exported sockets are copied.
+    '''
+    if exportedSockets is None: exportedSockets = set()
+    foldedNodeIDs = {node.toID() for node in foldedNodes}
+    for node in foldedNodes:
+        if memoization is not None:
+            memoization.nodeExecuted(node, variables)
+        for socket in node.linkedOutputs:
+            _, otherTargets = splitFoldedTargets(socket, node, variables, nodeByID, foldedNodeIDs)
+            needACopy = getTargetsThatNeedACopy(socket, otherTargets, keepOriginal = True)
+            if socket.isCopyable():
+                needACopy.extend(target for target in otherTargets if target in exportedSockets and target not in needACopy)
+            socket.execution.neededCopies = len(needACopy)
+
+            for target in otherTargets:
+                if target in needACopy: yield getCopyLine(socket, variables[target], variables)
+                else:
+                    variables[target] = variables[socket]
+
+def splitFoldedTargets(socket, node, variables, nodeByID, foldedNodeIDs):
+    foldedTargets, otherTargets = [], []
+    for targetNodeID, _, identifier in getLinkedSocketIDs(socket, node):
+        target = nodeByID[targetNodeID].inputsByIdentifier[identifier]
+        # sockets of removed nodes have no variable
+        if target not in variables: continue
+        if targetNodeID in foldedNodeIDs: foldedTargets.append(target)
+        else: otherTargets.append(target)
+    return foldedTargets, otherTargets
 
 
 
@@ -26,12 +133,15 @@ def getInitialVariables(nodes):
 # Setup Code
 ##########################################
 
-def iterSetupCodeLines(nodes, variables):
+def iterSetupCodeLines(nodes, variables, nodeByID = None, foldedNodes = []):
     yield from iter_Imports(nodes)
     yield get_LoadRandomNumberCache()
     yield get_LoadMeasurementsDict()
+    yield from iter_LoadProfiler()
+    yield get_LoadKeyframeInsertion()
     yield from iter_GetNodeReferences(nodes)
     yield from iter_GetSocketValues(nodes, variables)
+    yield from iter_ExecuteFoldedNodes(foldedNodes, variables, nodeByID)
 
 def iter_Imports(nodes):
     yield get_ImportModules(nodes)
@@ -57,15 +167,23 @@ def get_LoadRandomNumberCache():
 def get_LoadMeasurementsDict():
     return "_node_execution_times = animation_nodes.execution.measurements.getMeasurementsDict()"
 
+def iter_LoadProfiler():
+    yield "_profile_events = animation_nodes.execution.profiling.getPendingEventsList()"
+    yield "getCurrentTimeNs = animation_nodes.execution.profiling.perf_counter_ns"
+
+def get_LoadKeyframeInsertion():
+    return "_insert_keyframe = animation_nodes.execution.baking.insertKeyframe"
+
 def iter_GetNodeReferences(nodes):
+    if len(nodes) == 0: return
     yield "nodes = bpy.data.node_groups[{}].nodes".format(repr(nodes[0].nodeTree.name))
     for node in nodes:
         yield "{} = nodes[{}]".format(node.identifier, repr(node.name))
 
 def iter_GetSocketValues(nodes, variables):
     for node in nodes:
-        for i, socket in enumerate(node.inputs):
-            if not isSocketLinked(socket, node):
+        for i, (socket, linkedIDs) in enumerate(iterInputsWithLinkedIDs(node)):
+            if len(linkedIDs) == 0:
                 yield getLoadSocketValueLine(socket, node, variables, i)
 
 def getLoadSocketValueLine(socket, node, variables, index = None):
@@ -88,9 +206,16 @@ def getSocketValueExpression(socket, node, index = None):
 ##########################################
 
 def getGlobalizeStatement(nodes, variables):
-    socketNames = [variables[socket] for socket in iterUnlinkedSockets(nodes) if socket.dataType != "Node Control"]
-    if len(socketNames) == 0: return ""
-    return "global " + ", ".join(socketNames)
+    names = getGlobalNames(nodes, variables)
+    for node in nodes:
+        # inlined subprograms need the globals of their own nodes
+        if hasattr(node, "getInlinedGlobalNames"):
+            names.extend(name for name in node.getInlinedGlobalNames() if name not in names)
+    if len(names) == 0: return ""
+    return "global " + ", ".join(names)
+
+def getGlobalNames(nodes, variables):
+    return [variables[socket] for socket in iterUnlinkedSockets(nodes) if socket.dataType != "Node Control"]
 
 def iterUnlinkedSockets(nodes):
     for node in nodes:
@@ -106,19 +231,21 @@ def getFunction_IterNodeExecutionLines():
         return iterNodeExecutionLines_MeasureTimes
     elif mode == "BAKE":
         return iterNodeExecutionLines_Bake
+    elif mode == "PROFILE":
+        return iterNodeExecutionLines_Profile
 
-def iterNodeExecutionLines_Basic(node, variables):
+def iterNodeExecutionLines_Basic(node, variables, memoizationFlag = None):
     yield from setupNodeForExecution(node, variables)
     try:
-        yield from iterRealNodeExecutionLines(node, variables)
+        yield from iterRealNodeExecutionLines(node, variables, memoizationFlag)
     except:
         handleExecutionCodeCreationException(node)
 
-def iterNodeExecutionLines_Monitored(node, variables):
+def iterNodeExecutionLines_Monitored(node, variables, memoizationFlag = None):
     yield from setupNodeForExecution(node, variables)
     yield "try:"
     try:
-        for line in iterRealNodeExecutionLines(node, variables):
+        for line in iterRealNodeExecutionLines(node, variables, memoizationFlag):
             yield "    " + line
         for socket in node.linkedOutputs:
             yield "    if not ({0} in globals() or {0} in locals()): raise Exception({1})".format(
@@ -130,20 +257,29 @@ def iterNodeExecutionLines_Monitored(node, variables):
     yield "    animation_nodes.problems.NodeRaisesExceptionDuringExecution({}).report()".format(repr(node.identifier))
     yield "    raise"
 
-def iterNodeExecutionLines_MeasureTimes(node, variables):
+def iterNodeExecutionLines_MeasureTimes(node, variables, memoizationFlag = None):
     yield from setupNodeForExecution(node, variables)
     try:
         yield "_execution_start_time = getCurrentTime()"
-        yield from iterRealNodeExecutionLines(node, variables)
+        yield from iterRealNodeExecutionLines(node, variables, memoizationFlag)
         yield "_node_execution_times[{}].totalTime += getCurrentTime() - _execution_start_time".format(repr(node.identifier))
         yield "_node_execution_times[{}].calls += 1".format(repr(node.identifier))
     except:
         handleExecutionCodeCreationException(node)
 
-def iterNodeExecutionLines_Bake(node, variables):
+def iterNodeExecutionLines_Profile(node, variables, memoizationFlag = None):
     yield from setupNodeForExecution(node, variables)
     try:
-        yield from iterRealNodeExecutionLines(node, variables)
+        yield "_profile_start = getCurrentTimeNs()"
+        yield from iterRealNodeExecutionLines(node, variables, memoizationFlag)
+        yield "_profile_events.append(({}, _profile_start, getCurrentTimeNs()))".format(repr(node.identifier))
+    except:
+        handleExecutionCodeCreationException(node)
+
+def iterNodeExecutionLines_Bake(node, variables, memoizationFlag = None):
+    yield from setupNodeForExecution(node, variables)
+    try:
+        yield from iterRealNodeExecutionLines(node, variables, memoizationFlag)
         yield from iterNodeBakeLines(node, variables)
     except:
         handleExecutionCodeCreationException(node)
@@ -161,21 +297,38 @@ def getNodeCommentLine(node):
     return "# Node: {} - {}".format(repr(node.nodeTree.name), repr(node.name))
 
 def iterInputCopyLines(node, variables):
-    for socket in node.inputs:
-        if socket.dataIsModified and socket.isCopyable() and not isSocketLinked(socket, node):
+    for socket, linkedIDs in iterInputsWithLinkedIDs(node):
+        if socket.dataIsModified and socket.isCopyable() and len(linkedIDs) == 0:
             newName = variables[socket] + "_copy"
             if hasattr(socket, "getDefaultValueCode"): line = "{} = {}".format(newName, socket.getDefaultValueCode())
             else: line = getCopyLine(socket, newName, variables)
             variables[socket] = newName
             yield line
 
-def iterRealNodeExecutionLines(node, variables):
+def iterRealNodeExecutionLines(node, variables, memoizationFlag = None):
     localCode = node.getLocalExecutionCode()
     globalCode = makeGlobalExecutionCode(localCode, node, variables)
+    if memoizationFlag is None:
+        yield from globalCode.splitlines()
+    else:
+        # the outputs of the last execution are still in the namespace
+        yield "if not {}:".format(memoizationFlag)
+        for line in globalCode.splitlines():
+            yield "    " + line
+        yield "    {} = True".format(memoizationFlag)
+
+def iterVectorizedNodeExecutionLines(node, variables):
+    yield from setupNodeForExecution(node, variables)
+    localCode = node.getLocalVectorizedExecutionCode()
+    globalCode = makeGlobalExecutionCode(localCode, node, variables)
     yield from globalCode.splitlines()
 
+keyframeInsertPattern = re.compile(r"([\w\.]+)\.keyframe_insert\(")
+
 def iterNodeBakeLines(node, variables):
     localCode = node.getLocalBakeCode()
+    # allows the batch bake to collect the values instead of inserting single keyframes
+    localCode = keyframeInsertPattern.sub(r"_insert_keyframe(\1, ", localCode)
     globalCode = makeGlobalExecutionCode(localCode, node, variables)
     yield from globalCode.splitlines()
 
@@ -211,13 +364,20 @@ def resolveInnerLinks(node, variables):
     for inputName, outputName in node.iterInnerLinks():
         variables[outputs[outputName]] = variables[inputs[inputName]]
 
-def linkOutputSocketsToTargets(node, variables, nodeByID):
+def linkOutputSocketsToTargets(node, variables, nodeByID, memoization = None, ownership = None):
+    if memoization is not None:
+        memoization.nodeExecuted(node, variables)
     for socket in node.linkedOutputs:
-        yield from linkSocketToTargets(socket, node, variables, nodeByID)
-
-def linkSocketToTargets(socket, node, variables, nodeByID):
-    targets = tuple(iterLinkedSocketsWithInfo(socket, node, nodeByID))
-    needACopy = getTargetsThatNeedACopy(socket, targets)
+        yield from linkSocketToTargets(socket, node, variables, nodeByID, memoization, ownership)
+
+def linkSocketToTargets(socket, node, variables, nodeByID, memoization = None, ownership = None):
+    # sockets of removed nodes have no variable
+    targets = tuple(target for target in iterLinkedSocketsWithInfo(socket, node, nodeByID) if target in variables)
+    keepOriginal = memoization is not None and memoization.isProtected(socket, variables)
+    owner = None
+    if ownership is not None and not keepOriginal and socket.isCopyable():
+        owner = ownership.getOwner(socket, node, variables)
+    needACopy = getTargetsThatNeedACopy(socket, targets, keepOriginal, owner)
     socket.execution.neededCopies = len(needACopy)
 
     for target in targets:
@@ -226,11 +386,13 @@ def linkSocketToTargets(socket, node, variables, nodeByID):
         else:
             variables[target] = variables[socket]
 
-def getTargetsThatNeedACopy(socket, targets):
+def getTargetsThatNeedACopy(socket, targets, keepOriginal = False, owner = None):
     if not socket.isCopyable(): return []
     modifiedTargets = [target for target in targets if target.dataIsModified]
-    if socket.loop.copyAlways: return modifiedTargets
+    if socket.loop.copyAlways or keepOriginal: return modifiedTargets
     if len(targets) == 1: return []
+    # the owner is executed after all other targets read the data
+    if owner is not None: return [target for target in modifiedTargets if target != owner]
     if len(targets) > len(modifiedTargets): return modifiedTargets
     else: return modifiedTargets[1:]
 
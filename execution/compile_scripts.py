@@ -1,20 +1,43 @@
+import os
+import bpy
 import sys
+import stat
+import marshal
+import hashlib
+import importlib.util
+from collections import OrderedDict
 from .. problems import InvalidSyntax
+from .. utils.operators import makeOperator
 
-cache = {}
+# compiled code objects are content addressed by the name and the source of the
+# script and the bytecode version, so that they can be stored on the disk
+cacheDirectory = None
+maxMemoryEntries = 500
+maxDiskEntries = 5000
 
-def compileScript(script, name = "<string>"):
-    # clear the cache once in a while
-    if len(cache) == 500:
-        cache.clear()
+memoryCache = OrderedDict()
+statistics = {"memoryHits" : 0, "diskHits" : 0, "misses" : 0}
+diskWritesSinceCleanup = 0
 
+def compileScript(script, name = "<string>"):
     try:
-        scriptHash = hash(script)
-        if scriptHash not in cache:
-            compiledCode = compile(script, name, "exec")
-            cache[scriptHash] = compiledCode
+        key = getScriptKey(script, name)
+
+        codeObject = loadFromMemory(key)
+        if codeObject is not None:
+            statistics["memoryHits"] += 1
+            return codeObject
+
+        codeObject = loadFromDisk(key)
+        if codeObject is not None:
+            statistics["diskHits"] += 1
+        else:
+            statistics["misses"] += 1
+            codeObject = compile(script, name, "exec")
+            writeToDisk(key, codeObject)
 
-        return cache[scriptHash]
+        storeInMemory(key, codeObject)
+        return codeObject
 
     except SyntaxError:
         lines = script.split("\n")
@@ -29,3 +52,138 @@ def compileScript(script, name = "<string>"):
         print("\n"*5)
 
         InvalidSyntax().report()
+
+def getScriptKey(script, name):
+    hasher = hashlib.sha256()
+    hasher.update(importlib.util.MAGIC_NUMBER)
+    hasher.update(name.encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(script.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+# Memory Cache
+##########################################
+
+def loadFromMemory(key):
+    codeObject = memoryCache.get(key)
+    if codeObject is not None:
+        memoryCache.move_to_end(key)
+    return codeObject
+
+def storeInMemory(key, codeObject):
+    memoryCache[key] = codeObject
+    while len(memoryCache) > maxMemoryEntries:
+        memoryCache.popitem(last = False)
+
+
+# Disk Cache
+##########################################
+
+def getCacheDirectory():
+    '''
+    Loaded bytecode is executed, so only a private directory of the
+    current user can be used. Returns None when there is no such directory.
+    '''
+    global cacheDirectory
+    if cacheDirectory is None:
+        directory = os.path.join(bpy.utils.user_resource("DATAFILES"), "animation_nodes", "bytecode")
+        try:
+            os.makedirs(directory, mode = 0o700, exist_ok = True)
+            os.chmod(directory, 0o700)
+        except OSError: return None
+        cacheDirectory = directory
+    if not isPrivateDirectory(cacheDirectory): return None
+    return cacheDirectory
+
+def isPrivateDirectory(path):
+    try: info = os.lstat(path)
+    except OSError: return False
+    if not stat.S_ISDIR(info.st_mode): return False
+    if not hasattr(os, "getuid"): return True
+    return info.st_uid == os.getuid() and info.st_mode & 0o077 == 0
+
+def isOwnedByUser(file):
+    if not hasattr(os, "getuid"): return True
+    info = os.fstat(file.fileno())
+    return stat.S_ISREG(info.st_mode) and info.st_uid == os.getuid()
+
+def getCachePath(key):
+    directory = getCacheDirectory()
+    if directory is None: return None
+    return os.path.join(directory, key + ".bytecode")
+
+def loadFromDisk(key):
+    path = getCachePath(key)
+    if path is None: return None
+    try:
+        with open(path, "rb") as f:
+            if not isOwnedByUser(f): return None
+            codeObject = marshal.loads(f.read())
+        # the modification time is used for the LRU eviction
+        os.utime(path)
+        return codeObject
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError):
+        removeFile(path)
+        return None
+
+def writeToDisk(key, codeObject):
+    global diskWritesSinceCleanup
+    path = getCachePath(key)
+    if path is None: return
+    try:
+        # write to a temporary file first so that other processes never see a partial file
+        temporaryPath = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporaryPath, "wb") as f:
+            f.write(marshal.dumps(codeObject))
+        os.replace(temporaryPath, path)
+    except OSError:
+        return
+
+    diskWritesSinceCleanup += 1
+    if diskWritesSinceCleanup >= 100:
+        diskWritesSinceCleanup = 0
+        evictDiskEntries()
+
+def evictDiskEntries():
+    directory = getCacheDirectory()
+    if directory is None: return
+    try:
+        paths = [entry.path for entry in os.scandir(directory) if entry.name.endswith(".bytecode")]
+    except OSError:
+        return
+    if len(paths) <= maxDiskEntries: return
+
+    paths.sort(key = getModificationTime)
+    for path in paths[:len(paths) - maxDiskEntries]:
+        removeFile(path)
+
+def getModificationTime(path):
+    try: return os.path.getmtime(path)
+    except OSError: return 0
+
+def removeFile(path):
+    try: os.remove(path)
+    except OSError: pass
+
+
+# Statistics
+##########################################
+
+def getCacheStatistics():
+    return dict(statistics, memoryEntries = len(memoryCache))
+
+@makeOperator("an.clear_bytecode_cache", "Clear Bytecode Cache", redraw = True)
+def clearBytecodeCache():
+    memoryCache.clear()
+    for key in statistics:
+        statistics[key] = 0
+
+    directory = getCacheDirectory()
+    if directory is None: return
+    try: paths = [entry.path for entry in os.scandir(directory)]
+    except OSError: return
+    for path in paths:
+        removeFile(path)
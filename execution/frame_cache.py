@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from .. utils.memory import estimateSize
+
+class FrameCache:
+    '''
+    Stores the values that are passed into the output nodes of a tree per frame.
+    The least recently used frames are removed when the memory limit is exceeded.
+    '''
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.totalSize = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def store(self, key, values, maxSize):
+        self.remove(key)
+        size = sum(estimateSize(value) for value in values.values())
+        if size > maxSize: return
+        self.entries[key] = (values, size)
+        self.totalSize += size
+        while self.totalSize > maxSize:
+            _, (_, removedSize) = self.entries.popitem(last = False)
+            self.totalSize -= removedSize
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.totalSize -= entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.totalSize = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_frameCacheByTree = {}
+
+def getFrameCache(treeName):
+    if treeName not in _frameCacheByTree:
+        _frameCacheByTree[treeName] = FrameCache()
+    return _frameCacheByTree[treeName]
+
+def getFrameCacheIfExists(treeName):
+    return _frameCacheByTree.get(treeName)
+
+def clearFrameCaches():
+    for frameCache in _frameCacheByTree.values():
+        frameCache.clear()
@@ -1,8 +1,18 @@
+from . ownership import DataOwnership
 from . compile_scripts import compileScript
+from . socket_values import UnlinkedSocketValues
 from .. problems import ExecutionUnitNotSetup
+from . inlining import InlinedGroup, canInlineGroup, setInlinedGroup
 from . code_generator import (getInitialVariables,
+                              removeUnusedNodes,
+                              getFoldedNodes,
+                              getUnfoldedNodes,
+                              foldedNodesChanged,
+                              iterFoldedValueLines,
                               iterSetupCodeLines,
                               getGlobalizeStatement,
+                              getGlobalNames,
+                              getModulesNeededByNodes,
                               linkOutputSocketsToTargets,
                               getFunction_IterNodeExecutionLines)
 
@@ -12,6 +22,11 @@ class GroupExecutionUnit:
         self.setupScript = ""
         self.setupCodeObject = None
         self.executionData = {}
+        self.socketValues = None
+        self.foldedNodeIDs = set()
+        self.isInlined = False
+        self.inlinedNames = set()
+        self.isSetup = False
 
         self.generateScript(nodeByID)
         self.compileScript()
@@ -22,13 +37,26 @@ class GroupExecutionUnit:
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
         self.execute = self.executionData["main"]
+        self.isSetup = True
 
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
 
+    def getInlinedData(self):
+        data = self.executionData
+        return {name : data[name] for name in self.inlinedNames if name in data}
+
+    def reloadSocketValues(self, changedProperties):
+        if foldedNodesChanged(self.foldedNodeIDs, changedProperties):
+            self.setup()
+            return
+        if self.socketValues is not None:
+            self.socketValues.reload(self.executionData, changedProperties)
+
     def finish(self):
         self.executionData.clear()
         self.execute = self.raiseNotSetupException
+        self.isSetup = False
 
 
     def getCodes(self):
@@ -38,25 +66,49 @@ class GroupExecutionUnit:
     def generateScript(self, nodeByID):
         try: nodes = self.network.getSortedAnimationNodes(nodeByID)
         except: return
+        nodes = removeUnusedNodes(nodes)
+        foldedNodes = getFoldedNodes(nodes)
+        self.foldedNodeIDs = {node.toID() for node in foldedNodes}
 
         variables = getInitialVariables(nodes)
-        self.setupScript = "\n".join(self.iterSetupScriptLines(nodes, variables, nodeByID))
+        self.socketValues = UnlinkedSocketValues(getUnfoldedNodes(nodes, foldedNodes), variables,
+            name = "socket values: {}".format(repr(self.network.name)))
+        self.setupScript = "\n".join(self.iterSetupScriptLines(nodes, foldedNodes, variables, nodeByID))
 
-    def iterSetupScriptLines(self, nodes, variables, nodeByID):
-        yield from iterSetupCodeLines(nodes, variables)
+    def iterSetupScriptLines(self, nodes, foldedNodes, variables, nodeByID):
+        yield from iterSetupCodeLines(nodes, variables, nodeByID, foldedNodes)
         yield "\n\n"
-        yield from self.iterFunctionGenerationScriptLines(nodes, variables, nodeByID)
+        yield from self.iterFunctionGenerationScriptLines(nodes, foldedNodes, variables, nodeByID)
 
-    def iterFunctionGenerationScriptLines(self, nodes, variables, nodeByID):
+    def iterFunctionGenerationScriptLines(self, nodes, foldedNodes, variables, nodeByID):
+        nodes = getUnfoldedNodes(nodes, foldedNodes)
         inputNode = self.network.getGroupInputNode(nodeByID)
         outputNode = self.network.getGroupOutputNode(nodeByID)
 
         yield self.getFunctionHeader(inputNode, variables)
         yield "    " + getGlobalizeStatement(nodes, variables)
-        yield from iterIndented(self.iterExecutionScriptLines(nodes, variables, inputNode, nodeByID))
+        executionLines = list(self.iterExecutionScriptLines(nodes, foldedNodes, variables, inputNode, outputNode, nodeByID))
+        yield from iterIndented(executionLines)
         yield "\n"
         yield "    " + self.getReturnStatement(outputNode, variables)
 
+        if canInlineGroup(self.network, nodes):
+            self.inline(executionLines, nodes, foldedNodes, variables, inputNode, outputNode)
+
+    def inline(self, executionLines, nodes, foldedNodes, variables, inputNode, outputNode):
+        outputNames = [] if outputNode is None else [variables[socket] for socket in outputNode.inputs[:-1]]
+        globalNames = getGlobalNames(nodes, variables)
+        inlinedGroup = InlinedGroup(self.network.identifier, executionLines,
+            len(inputNode.outputs) - 1, outputNames, globalNames)
+        setInlinedGroup(self.network.identifier, inlinedGroup)
+        self.isInlined = True
+
+        # the inlined code only needs the names it gets from the setup of this unit
+        self.inlinedNames = set(globalNames)
+        self.inlinedNames.update(node.identifier for node in nodes)
+        self.inlinedNames.update(variables[socket] for node in foldedNodes for socket in node.linkedOutputs)
+        self.inlinedNames.update(name.split(".")[0] for name in getModulesNeededByNodes(nodes))
+
     def getFunctionHeader(self, inputNode, variables):
         for i, socket in enumerate(inputNode.outputs):
             variables[socket] = "group_input_" + str(i)
@@ -65,14 +117,18 @@ class GroupExecutionUnit:
         header = "def main({}):".format(parameterList)
         return header
 
-    def iterExecutionScriptLines(self, nodes, variables, inputNode, nodeByID):
+    def iterExecutionScriptLines(self, nodes, foldedNodes, variables, inputNode, outputNode, nodeByID):
         iterNodeExecutionLines = getFunction_IterNodeExecutionLines()
 
+        exportedSockets = set() if outputNode is None else set(outputNode.inputs)
+        yield from iterFoldedValueLines(foldedNodes, variables, nodeByID, exportedSockets = exportedSockets)
+        nodes = [node for node in nodes if node.bl_idname not in ("an_GroupInputNode", "an_GroupOutputNode")]
+        ownership = DataOwnership(nodes, nodeByID)
+
         yield from linkOutputSocketsToTargets(inputNode, variables, nodeByID)
         for node in nodes:
-            if node.bl_idname in ("an_GroupInputNode", "an_GroupOutputNode"): continue
             yield from iterNodeExecutionLines(node, variables)
-            yield from linkOutputSocketsToTargets(node, variables, nodeByID)
+            yield from linkOutputSocketsToTargets(node, variables, nodeByID, ownership = ownership)
 
     def getReturnStatement(self, outputNode, variables):
         if outputNode is None: return "return"
@@ -0,0 +1,49 @@
+from .. preferences import getExecutionCodeSettings, getExecutionCodeType
+from . code_generator import replaceVariableName
+
+class InlinedGroup:
+    '''
+    Execution code of a group that can be placed directly into the code of
+    the invoking units. This avoids the function call and the tuple packing.
+    '''
+
+    def __init__(self, identifier, lines, inputAmount, outputNames, globalNames):
+        self.globalNames = globalNames
+        self.inputNames = ["_inline_{}_input_{}".format(identifier, i) for i in range(inputAmount)]
+        self.code = self.renameInputs("\n".join(lines))
+        self.returnExpression = self.renameInputs(", ".join(outputNames))
+
+    def renameInputs(self, code):
+        for i, name in enumerate(self.inputNames):
+            code = replaceVariableName(code, "group_input_" + str(i), name)
+        return code
+
+    def iterLines(self, inputVariables, outputVariables):
+        # the inputs get new names first, so that the
+        # group can't rebind variables of the calling unit
+        for name, inputVariable in zip(self.inputNames, inputVariables):
+            yield "{} = {}".format(name, inputVariable)
+        yield from self.code.splitlines()
+        if len(outputVariables) > 0:
+            yield "{} = {}".format(", ".join(outputVariables), self.returnExpression)
+
+
+_inlinedGroups = {}
+
+def setInlinedGroup(identifier, inlinedGroup):
+    _inlinedGroups[identifier] = inlinedGroup
+
+def getInlinedGroup(identifier):
+    return _inlinedGroups.get(identifier)
+
+def clearInlinedGroups():
+    _inlinedGroups.clear()
+
+def canInlineGroup(network, nodes):
+    maxNodeAmount = getExecutionCodeSettings().inlineGroupNodeLimit
+    if maxNodeAmount == 0: return False
+    # the other modes have timers for the invoking node that the group code would overwrite
+    if getExecutionCodeType() not in ("DEFAULT", "BAKE"): return False
+    # invoked subprograms could lead to recursion
+    if len(network.invokeSubprogramIDs) > 0: return False
+    return len(nodes) <= maxNodeAmount
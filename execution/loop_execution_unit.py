@@ -1,20 +1,38 @@
+from itertools import chain
 from .. tree_info import getNodesByType
+from .. preferences import getExecutionCodeType
+from . ownership import DataOwnership
 from . compile_scripts import compileScript
+from . socket_values import UnlinkedSocketValues
 from .. problems import ExecutionUnitNotSetup
 from . code_generator import (getInitialVariables,
+                              removeUnusedNodes,
+                              getFoldedNodes,
+                              getUnfoldedNodes,
+                              foldedNodesChanged,
+                              iterFoldedValueLines,
                               iterSetupCodeLines,
                               getCopyExpression,
                               getGlobalizeStatement,
                               getLoadSocketValueLine,
+                              iterVectorizedNodeExecutionLines,
                               linkOutputSocketsToTargets,
                               getFunction_IterNodeExecutionLines)
 
+ignoreNodes = {"an_LoopInputNode", "an_LoopGeneratorOutputNode", "an_ReassignLoopParameterNode", "an_LoopBreakNode"}
+
+# data types whose values can be stored in numpy arrays
+vectorizedDataTypes = {"Float" : "float", "Integer" : "int", "Boolean" : "bool"}
+
 class LoopExecutionUnit:
     def __init__(self, network, nodeByID):
         self.network = network
         self.setupScript = ""
         self.setupCodeObject = None
         self.executionData = {}
+        self.socketValues = None
+        self.foldedNodeIDs = set()
+        self.isSetup = False
 
         self.generateScript(nodeByID)
         self.compileScript()
@@ -25,13 +43,22 @@ class LoopExecutionUnit:
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
         self.execute = self.executionData["main"]
+        self.isSetup = True
 
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
 
+    def reloadSocketValues(self, changedProperties):
+        if foldedNodesChanged(self.foldedNodeIDs, changedProperties):
+            self.setup()
+            return
+        if self.socketValues is not None:
+            self.socketValues.reload(self.executionData, changedProperties)
+
     def finish(self):
         self.executionData.clear()
         self.execute = self.raiseNotSetupException
+        self.isSetup = False
 
 
     def getCodes(self):
@@ -42,29 +69,38 @@ class LoopExecutionUnit:
     def generateScript(self, nodeByID):
         try: nodes = self.network.getSortedAnimationNodes(nodeByID)
         except: return
+        nodes = removeUnusedNodes(nodes)
+        foldedNodes = getFoldedNodes(nodes)
+        self.foldedNodeIDs = {node.toID() for node in foldedNodes}
 
         variables = getInitialVariables(nodes)
-        self.setupScript = "\n".join(self.iterSetupScriptLines(nodes, variables, nodeByID))
+        self.socketValues = UnlinkedSocketValues(getUnfoldedNodes(nodes, foldedNodes), variables,
+            name = "socket values: {}".format(repr(self.network.name)))
+        self.setupScript = "\n".join(self.iterSetupScriptLines(nodes, foldedNodes, variables, nodeByID))
 
-    def iterSetupScriptLines(self, nodes, variables, nodeByID):
+    def iterSetupScriptLines(self, nodes, foldedNodes, variables, nodeByID):
         inputNode = self.network.getLoopInputNode(nodeByID)
 
-        yield from iterSetupCodeLines(nodes, variables)
+        yield from iterSetupCodeLines(nodes, variables, nodeByID, foldedNodes)
         yield "\n\n"
 
-        if inputNode.iterateThroughLists:
-            yield from self.iter_IteratorLength(inputNode, nodes, variables, nodeByID)
+        nodes = getUnfoldedNodes(nodes, foldedNodes)
+
+        if self.canBeVectorized(inputNode, nodes, nodeByID):
+            yield from self.iter_Vectorized(inputNode, nodes, foldedNodes, variables, nodeByID)
+        elif inputNode.iterateThroughLists:
+            yield from self.iter_IteratorLength(inputNode, nodes, foldedNodes, variables, nodeByID)
         else:
-            yield from self.iter_IterationsAmount(inputNode, nodes, variables, nodeByID)
+            yield from self.iter_IterationsAmount(inputNode, nodes, foldedNodes, variables, nodeByID)
 
 
-    def iter_IterationsAmount(self, inputNode, nodes, variables, nodeByID):
+    def iter_IterationsAmount(self, inputNode, nodes, foldedNodes, variables, nodeByID):
         yield self.get_IterationsAmount_Header(inputNode, variables)
         yield "    " + getGlobalizeStatement(nodes, variables)
         yield from iterIndented(self.iter_InitializeGeneratorsLines(inputNode, variables, nodeByID))
         yield from iterIndented(self.iter_InitializeParametersLines(inputNode, variables))
         yield from iterIndented(self.iter_IterationsAmount_PrepareLoop(inputNode, variables))
-        yield from iterIndented(self.iter_LoopBody(inputNode, nodes, variables, nodeByID), amount = 2)
+        yield from iterIndented(self.iter_LoopBody(inputNode, nodes, foldedNodes, variables, nodeByID), amount = 2)
         yield from iterIndented(self.iter_UpdateDebugLoopNodes(nodeByID))
         yield "    " + self.get_ReturnStatement(inputNode, variables, nodeByID)
 
@@ -85,13 +121,13 @@ class LoopExecutionUnit:
         yield "for current_loop_index in range(loop_iterations):"
 
 
-    def iter_IteratorLength(self, inputNode, nodes, variables, nodeByID):
+    def iter_IteratorLength(self, inputNode, nodes, foldedNodes, variables, nodeByID):
         yield self.get_IteratorLength_Header(inputNode, variables)
         yield "    " + getGlobalizeStatement(nodes, variables)
         yield from iterIndented(self.iter_InitializeGeneratorsLines(inputNode, variables, nodeByID))
         yield from iterIndented(self.iter_InitializeParametersLines(inputNode, variables))
         yield from iterIndented(self.iter_IteratorLength_PrepareLoopLines(inputNode, variables))
-        yield from iterIndented(self.iter_LoopBody(inputNode, nodes, variables, nodeByID), amount = 2)
+        yield from iterIndented(self.iter_LoopBody(inputNode, nodes, foldedNodes, variables, nodeByID), amount = 2)
         yield from iterIndented(self.iter_UpdateDebugLoopNodes(nodeByID))
         yield "    " + self.get_ReturnStatement(inputNode, variables, nodeByID)
 
@@ -151,21 +187,32 @@ class LoopExecutionUnit:
                 yield getLoadSocketValueLine(socket, inputNode, variables)
 
 
-    def iter_LoopBody(self, inputNode, nodes, variables, nodeByID):
+    def iter_LoopBody(self, inputNode, nodes, foldedNodes, variables, nodeByID):
+        yield from iterFoldedValueLines(foldedNodes, variables, nodeByID,
+            exportedSockets = self.getExportedSockets(inputNode, nodeByID))
         yield from linkOutputSocketsToTargets(inputNode, variables, nodeByID)
 
         iterNodeExecutionLines = getFunction_IterNodeExecutionLines()
-        ignoreNodes = {"an_LoopInputNode", "an_LoopGeneratorOutputNode", "an_ReassignLoopParameterNode", "an_LoopBreakNode"}
+        nodes = [node for node in nodes if node.bl_idname not in ignoreNodes]
+        ownership = DataOwnership(nodes, nodeByID)
+
         for node in nodes:
-            if node.bl_idname in ignoreNodes: continue
             yield from iterNodeExecutionLines(node, variables)
-            yield from linkOutputSocketsToTargets(node, variables, nodeByID)
+            yield from linkOutputSocketsToTargets(node, variables, nodeByID, ownership = ownership)
 
         yield from self.iter_LoopBreak(inputNode, variables, nodeByID)
         yield from self.iter_AddToGenerators(inputNode, variables, nodeByID)
         yield from self.iter_ReassignParameters(inputNode, variables, nodeByID)
         yield "pass"
 
+    def getExportedSockets(self, inputNode, nodeByID):
+        sockets = set()
+        for node in inputNode.getSortedGeneratorNodes(nodeByID):
+            sockets.add(node.addSocket)
+        for node in inputNode.getReassignParameterNodes(nodeByID):
+            sockets.add(node.inputs[0])
+        return sockets
+
     def iter_LoopBreak(self, inputNode, variables, nodeByID):
         for node in inputNode.getBreakNodes(nodeByID):
             yield "if not {}: break".format(variables[node.inputs[0]])
@@ -192,6 +239,81 @@ class LoopExecutionUnit:
 
 
 
+    def canBeVectorized(self, inputNode, nodes, nodeByID):
+        '''
+        All iterations can be calculated at once when every node in the loop
+        has vectorized code and only works with numbers and booleans.
+        Break and reassign nodes depend on the previous iteration,
+        generators only support appending numbers.
+        '''
+        if getExecutionCodeType() != "DEFAULT": return False
+        if len(inputNode.getBreakNodes(nodeByID)) > 0: return False
+        if len(inputNode.getReassignParameterNodes(nodeByID)) > 0: return False
+
+        if inputNode.iterateThroughLists:
+            for socket in inputNode.getIteratorSockets():
+                if socket.dataType not in vectorizedDataTypes: return False
+
+        for node in inputNode.getSortedGeneratorNodes(nodeByID):
+            if node.addType != "APPEND": return False
+            if node.addSocket.dataType not in ("Float", "Integer"): return False
+
+        for node in nodes:
+            if node.bl_idname in ignoreNodes: continue
+            if node.getLocalVectorizedExecutionCode() is None: return False
+            for socket in chain(node.inputs, node.outputs):
+                if socket.dataType not in vectorizedDataTypes: return False
+        return True
+
+    def iter_Vectorized(self, inputNode, nodes, foldedNodes, variables, nodeByID):
+        yield "import numpy"
+        if inputNode.iterateThroughLists:
+            yield self.get_IteratorLength_Header(inputNode, variables)
+        else:
+            yield self.get_IterationsAmount_Header(inputNode, variables)
+        yield "    " + getGlobalizeStatement(nodes, variables)
+        yield from iterIndented(self.iter_InitializeParametersLines(inputNode, variables))
+        yield from iterIndented(self.iter_Vectorized_PrepareArrays(inputNode, variables))
+        yield from iterIndented(self.iter_Vectorized_Body(inputNode, nodes, foldedNodes, variables, nodeByID))
+        yield from iterIndented(self.iter_Vectorized_Generators(inputNode, variables, nodeByID))
+        yield "    " + self.get_ReturnStatement(inputNode, variables, nodeByID)
+
+    def iter_Vectorized_PrepareArrays(self, inputNode, variables):
+        if inputNode.iterateThroughLists:
+            iterators = inputNode.getIteratorSockets()
+            lengths = ["len(loop_iterator_{})".format(i) for i in range(len(iterators))]
+            yield "loop_iterations = min([{}])".format(", ".join(lengths) if len(lengths) > 0 else "0")
+
+            for i, socket in enumerate(iterators):
+                name = "loop_iterator_element_" + str(i)
+                variables[socket] = name
+                yield "{} = numpy.array(loop_iterator_{}[:loop_iterations], dtype = {})".format(
+                    name, i, vectorizedDataTypes[socket.dataType])
+
+        variables[inputNode.indexSocket] = "current_loop_index"
+        variables[inputNode.iterationsSocket] = "loop_iterations"
+        yield "current_loop_index = numpy.arange(loop_iterations)"
+        yield "vectorized_length = len(current_loop_index)"
+
+    def iter_Vectorized_Body(self, inputNode, nodes, foldedNodes, variables, nodeByID):
+        yield from iterFoldedValueLines(foldedNodes, variables, nodeByID)
+        yield from linkOutputSocketsToTargets(inputNode, variables, nodeByID)
+
+        for node in nodes:
+            if node.bl_idname in ignoreNodes: continue
+            yield from iterVectorizedNodeExecutionLines(node, variables)
+            yield from linkOutputSocketsToTargets(node, variables, nodeByID)
+
+    def iter_Vectorized_Generators(self, inputNode, variables, nodeByID):
+        # values that don't depend on the iteration are single values
+        for i, node in enumerate(inputNode.getSortedGeneratorNodes(nodeByID)):
+            name = "loop_generator_output_" + str(i)
+            variables[node] = name
+            yield "{} = numpy.broadcast_to({}, (vectorized_length, ))".format(name, variables[node.addSocket])
+            yield "{0} = {0}[numpy.broadcast_to(numpy.asarray({1}, dtype = bool), (vectorized_length, ))]".format(
+                name, variables[node.conditionSocket])
+            yield "{0} = {0}.astype({1}).tolist()".format(name, vectorizedDataTypes[node.addSocket.dataType])
+
     def get_ReturnStatement(self, inputNode, variables, nodeByID):
         names = []
         names.extend(["loop_iterator_" + str(i) for i, socket in enumerate(inputNode.getIteratorSockets()) if socket.loop.useAsOutput])
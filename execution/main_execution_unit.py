@@ -1,10 +1,24 @@
 import sys, traceback
 from .. import problems
+from itertools import chain
+from . ownership import DataOwnership
+from . memoization import NodeMemoization
+from . parallel import getConcurrentNodeGroups, executeCodeObject
+from . frame_cache import getFrameCache
 from . compile_scripts import compileScript
+from . socket_values import UnlinkedSocketValues
+from .. tree_info import iterInputsWithLinkedIDs
+from .. preferences import nodeMemoizationIsEnabled, parallelExecutionIsEnabled
 from .. problems import ExecutionUnitNotSetup, ExceptionDuringExecution
 from . code_generator import (getInitialVariables,
+                              removeUnusedNodes,
+                              getFoldedNodes,
+                              getUnfoldedNodes,
+                              foldedNodesChanged,
+                              iterFoldedValueLines,
                               iterSetupCodeLines,
                               linkOutputSocketsToTargets,
+                              getCopyExpression,
                               getFunction_IterNodeExecutionLines)
 
 class MainExecutionUnit:
@@ -12,9 +26,21 @@ class MainExecutionUnit:
         self.network = network
         self.setupScript = ""
         self.executeScript = ""
+        self.preparingScript = ""
+        self.preparingScript = "\n".join(chain.from_iterable(linesByNode[node] for node in preparingNodes))
+        self.concurrentScripts = []
+        self.replayScript = ""
         self.setupCodeObject = None
         self.executeCodeObject = None
+        self.preparingCodeObject = None
+        self.concurrentCodeObjects = []
+        self.replayCodeObject = None
+        self.useFrameCache = False
         self.executionData = {}
+        self.socketValues = None
+        self.foldedNodeIDs = set()
+        self.memoization = None
+        self.isSetup = False
 
         self.generateScripts(nodeByID)
         self.compileScripts()
@@ -25,17 +51,63 @@ class MainExecutionUnit:
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
         self.execute = self.executeUnit
+        self.isSetup = True
 
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
 
+    def reloadSocketValues(self, changedProperties):
+        if foldedNodesChanged(self.foldedNodeIDs, changedProperties):
+            self.setup()
+            return
+        if self.socketValues is not None:
+            self.socketValues.reload(self.executionData, changedProperties)
+        if self.memoization is not None:
+            self.memoization.invalidate(self.executionData, changedProperties)
+
     def finish(self):
         self.executionData.clear()
         self.execute = self.raiseNotSetupException
+        self.isSetup = False
 
     def executeUnit(self):
+        if not self.executePreparingPart(): return False
+        for codeObject in self.concurrentCodeObjects:
+            if not self.executeConcurrentPart(codeObject):
+                ExceptionDuringExecution().report()
+                return False
+        return self.executeSequentialPart()
+
+    def executePreparingPart(self):
+        return self.runCodeObject(self.preparingCodeObject)
+
+    def executeConcurrentPart(self, codeObject):
+        return executeCodeObject(codeObject, self.executionData)
+
+    def executeSequentialPart(self):
+        if self.useFrameCache:
+            return self.executeWithFrameCache()
+        return self.runCodeObject(self.executeCodeObject)
+
+    def executeWithFrameCache(self):
+        nodeTree = self.network.nodeTree
+        frameCache = getFrameCache(nodeTree.name)
+        key = (id(self), nodeTree.scene.frame_current_final)
+
+        values = frameCache.get(key)
+        if values is not None:
+            # only the output nodes have to be executed again
+            self.executionData.update(values)
+            return self.runCodeObject(self.replayCodeObject)
+
+        if not self.runCodeObject(self.executeCodeObject): return False
+        maxSize = nodeTree.frameCache.memoryLimit * 1024 ** 2
+        frameCache.store(key, self.executionData["_frame_values"], maxSize)
+        return True
+
+    def runCodeObject(self, codeObject):
         try:
-            exec(self.executeCodeObject, self.executionData, self.executionData)
+            exec(codeObject, self.executionData, self.executionData)
             return True
         except:
             print("\n"*5)
@@ -45,28 +117,121 @@ class MainExecutionUnit:
 
 
     def getCodes(self):
-        return [self.setupScript, self.executeScript]
+        codes = [self.setupScript, self.preparingScript] + self.concurrentScripts + [self.executeScript]
+        if self.useFrameCache: codes.append(self.replayScript)
+        return codes
 
 
 
     def generateScripts(self, nodeByID):
         try: nodes = self.network.getSortedAnimationNodes(nodeByID)
         except: return
+        nodes = removeUnusedNodes(nodes)
+        foldedNodes = getFoldedNodes(nodes)
+        self.foldedNodeIDs = {node.toID() for node in foldedNodes}
+        unfoldedNodes = getUnfoldedNodes(nodes, foldedNodes)
 
-        variables = getInitialVariables(nodes)
-        self.setupScript = "\n".join(iterSetupCodeLines(nodes, variables))
-        self.executeScript = "\n".join(self.iterExecutionScriptLines(nodes, variables, nodeByID))
+        if nodeMemoizationIsEnabled():
+            self.memoization = NodeMemoization(unfoldedNodes, foldedNodes)
+
+        # the effects of some nodes can't be replayed from the values passed into output nodes
+        self.useFrameCache = (self.network.nodeTree.frameCache.enabled
+                              and not any(node.unknownSideEffects for node in nodes))
 
-    def iterExecutionScriptLines(self, nodes, variables, nodeByID):
+        variables = getInitialVariables(nodes)
+        self.setupScript = "\n".join(self.iterSetupScriptLines(nodes, variables, nodeByID, foldedNodes))
+        self.socketValues = UnlinkedSocketValues(unfoldedNodes, variables,
+            name = "socket values: {}".format(repr(self.network.treeName)))
+        self.generateExecutionScripts(unfoldedNodes, foldedNodes, variables, nodeByID)
+
+    def iterSetupScriptLines(self, nodes, variables, nodeByID, foldedNodes):
+        yield from iterSetupCodeLines(nodes, variables, nodeByID, foldedNodes)
+        if self.memoization is not None:
+            yield from self.memoization.iterSetupLines()
+
+    def generateExecutionScripts(self, nodes, foldedNodes, variables, nodeByID):
+        # the frame cache needs the whole execution in one script
+        if parallelExecutionIsEnabled() and not self.useFrameCache:
+            preparingNodes, concurrentGroups = getConcurrentNodeGroups(nodes, self.foldedNodeIDs)
+        else: preparingNodes, concurrentGroups = [], []
+
+        # the concurrent nodes only depend on each other, on folded nodes and on the preparing nodes
+        concurrentNodes = list(chain.from_iterable(concurrentGroups))
+        separateNodes = set(preparingNodes) | set(concurrentNodes)
+        sequentialNodes = [node for node in nodes if node not in separateNodes]
+        nodes = preparingNodes + concurrentNodes + sequentialNodes
+
+        foldedValueLines = list(iterFoldedValueLines(foldedNodes, variables, nodeByID, self.memoization))
+        linesByNode = self.getExecutionLinesByNode(nodes, variables, nodeByID)
+
+        self.preparingScript = "\n".join(chain(foldedValueLines,
+            chain.from_iterable(linesByNode[node] for node in preparingNodes)))
+        self.concurrentScripts = ["\n".join(chain.from_iterable(linesByNode[node] for node in group))
+                                  for group in concurrentGroups]
+        self.executeScript = "\n".join(chain.from_iterable(linesByNode[node] for node in sequentialNodes))
+
+        if self.useFrameCache:
+            self.preparingScript = ""
+            self.generateFrameCacheScripts(sequentialNodes, foldedValueLines, linesByNode, variables)
+
+    def generateFrameCacheScripts(self, nodes, foldedValueLines, linesByNode, variables):
+        '''
+        The execution remembers all values that are passed from other nodes into output nodes.
+        When a frame is replayed only the output nodes are executed with these values.
+        '''
+        outputNodes = [node for node in nodes if node.writesBlenderData]
+        outputNodeIDs = {node.toID() for node in outputNodes}
+
+        executionLines = ["_frame_values = {}"]
+        executionLines.extend(foldedValueLines)
+        replayLines = []
+        for node in nodes:
+            if node.writesBlenderData:
+                for socket in self.iterCachedInputs(node, outputNodeIDs, variables):
+                    name = variables[socket]
+                    # other nodes can change the value later, so the cache needs its own copy
+                    if socket.isCopyable():
+                        executionLines.append("_frame_values[{}] = {}".format(repr(name), getCopyExpression(socket, variables)))
+                    else:
+                        executionLines.append("_frame_values[{}] = {}".format(repr(name), name))
+                    if socket.dataIsModified and socket.isCopyable():
+                        replayLines.append("{} = {}".format(name, getCopyExpression(socket, variables)))
+                replayLines.extend(linesByNode[node])
+            executionLines.extend(linesByNode[node])
+
+        self.executeScript = "\n".join(executionLines)
+        self.replayScript = "\n".join(replayLines)
+
+    def iterCachedInputs(self, node, outputNodeIDs, variables):
+        for socket, linkedIDs in iterInputsWithLinkedIDs(node):
+            if socket not in variables or len(linkedIDs) == 0: continue
+            if all(originID[0] in outputNodeIDs for originID in linkedIDs): continue
+            yield socket
+
+    def getExecutionLinesByNode(self, nodes, variables, nodeByID):
         iterNodeExecutionLines = getFunction_IterNodeExecutionLines()
+        memoization = self.memoization
+        ownership = DataOwnership(nodes, nodeByID)
 
+        linesByNode = {}
         for node in nodes:
-            yield from iterNodeExecutionLines(node, variables)
-            yield from linkOutputSocketsToTargets(node, variables, nodeByID)
+            if memoization is None:
+                lines = list(iterNodeExecutionLines(node, variables))
+            else:
+                lines = list(memoization.iterCheckLines(node, variables))
+                lines.extend(iterNodeExecutionLines(node, variables, memoization.getFlag(node)))
+            lines.extend(linkOutputSocketsToTargets(node, variables, nodeByID, memoization, ownership))
+            linesByNode[node] = lines
+        return linesByNode
 
     def compileScripts(self):
         self.setupCodeObject = compileScript(self.setupScript, name = "setup: {}".format(repr(self.network.treeName)))
+        self.preparingCodeObject = compileScript(self.preparingScript, name = "preparation: {}".format(repr(self.network.treeName)))
         self.executeCodeObject = compileScript(self.executeScript, name = "execution: {}".format(repr(self.network.treeName)))
+        if self.useFrameCache:
+            self.replayCodeObject = compileScript(self.replayScript, name = "replay: {}".format(repr(self.network.treeName)))
+        self.concurrentCodeObjects = [compileScript(script, name = "concurrent execution {}: {}".format(i, repr(self.network.treeName)))
+                                      for i, script in enumerate(self.concurrentScripts)]
 
 
     def raiseNotSetupException(self, *args, **kwargs):
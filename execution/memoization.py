@@ -0,0 +1,96 @@
+from .. tree_info import iterInputsWithLinkedIDs
+
+class NodeMemoization:
+    '''
+    Pure nodes are only executed again when one of their inputs changed.
+    Values that come from other memoized nodes change when that node has
+    been executed again. Values of nodes that depend on the frame or on
+    the scene are compared by their fingerprint with the last execution.
+    Changed properties of a node invalidate its result directly.
+    '''
+    def __init__(self, nodes, foldedNodes = []):
+        self.flagByNode = {}
+        self.flagByNodeID = {}
+        self.changedNameByNodeID = {}
+        self.comparedSocketsByNode = {}
+        self.memoizedOriginsByNode = {}
+        self.protectedVariables = set()
+
+        # folded values only change when the whole unit is set up again
+        foldedNodeIDs = {node.toID() for node in foldedNodes}
+        for node in nodes:
+            dependencies = getMemoizationDependencies(node, foldedNodeIDs, self.flagByNodeID)
+            if dependencies is None: continue
+
+            nodeID = node.toID()
+            self.flagByNode[node] = "_memoized" + node.identifier
+            self.flagByNodeID[nodeID] = self.flagByNode[node]
+            self.changedNameByNodeID[nodeID] = "_changed" + node.identifier
+            self.comparedSocketsByNode[node], self.memoizedOriginsByNode[node] = dependencies
+
+    def getFlag(self, node):
+        return self.flagByNode.get(node)
+
+    def iterSetupLines(self):
+        yield "_get_fingerprint = animation_nodes.utils.hash.getValueFingerprint"
+        for node, flag in self.flagByNode.items():
+            yield "{} = False".format(flag)
+            if len(self.comparedSocketsByNode[node]) > 0:
+                yield "_last_fingerprint{} = None".format(node.identifier)
+
+    def iterCheckLines(self, node, variables):
+        '''Resets the flag of the node before its execution when an input changed'''
+        flag = self.flagByNode.get(node)
+        if flag is None: return
+
+        conditions = [self.changedNameByNodeID[originID] for originID in self.memoizedOriginsByNode[node]]
+        comparedSockets = self.comparedSocketsByNode[node]
+        if len(comparedSockets) > 0:
+            fingerprintName = "_fingerprint" + node.identifier
+            lastFingerprintName = "_last_fingerprint" + node.identifier
+            yield "{} = ({},)".format(fingerprintName,
+                ", ".join("_get_fingerprint({})".format(variables[socket]) for socket in comparedSockets))
+            conditions.append("{} != {}".format(fingerprintName, lastFingerprintName))
+            yield "{} = {}".format(lastFingerprintName, fingerprintName)
+        if len(conditions) > 0:
+            yield "if {}: {} = False".format(" or ".join(conditions), flag)
+        # memoized nodes that use the outputs check this
+        yield "{} = not {}".format(self.changedNameByNodeID[node.toID()], flag)
+
+    def nodeExecuted(self, node, variables):
+        if node in self.flagByNode:
+            self.protectedVariables.update(variables[socket] for socket in node.outputs)
+
+    def isProtected(self, socket, variables):
+        '''Data of memoized nodes must not be changed by other nodes'''
+        return variables[socket] in self.protectedVariables
+
+    def invalidate(self, executionData, changedProperties):
+        for treeName, nodeName, _ in changedProperties:
+            flag = self.flagByNodeID.get((treeName, nodeName))
+            if flag is not None:
+                executionData[flag] = False
+
+def getMemoizationDependencies(node, foldedNodeIDs, memoizedNodeIDs):
+    '''
+    Returns the input sockets whose values have to be compared and the memoized
+    nodes the node depends on, or None when the node can't be memoized.
+    '''
+    if not node.pure: return None
+
+    comparedSockets = []
+    memoizedOriginIDs = set()
+    for socket, linkedIDs in iterInputsWithLinkedIDs(node):
+        if len(linkedIDs) == 0:
+            # persistent values only change with a property
+            if not hasattr(socket, "getValue") or socket.persistentValue: continue
+        else:
+            originID = linkedIDs[0][0]
+            if originID in foldedNodeIDs: continue
+            if originID in memoizedNodeIDs:
+                memoizedOriginIDs.add(originID)
+                continue
+        # e.g. values that depend on the frame
+        if not socket.comparable: return None
+        comparedSockets.append(socket)
+    return comparedSockets, memoizedOriginIDs
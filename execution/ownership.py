@@ -0,0 +1,68 @@
+from .. tree_info import getLinkedSocketIDs, iterOutputsWithLinkedIDs
+
+# values of these types can be the data of any other socket
+referenceDataTypes = {"Generic", "Generic List"}
+
+class DataOwnership:
+    '''
+    Finds the target that can take the original data of a socket.
+    This is the modifying target that is executed last, when all other
+    targets have finished reading the data before.
+    Only nodes that are executed in the given order are considered.
+    '''
+    def __init__(self, nodes, nodeByID):
+        self.nodeByID = nodeByID
+        self.indexByNode = {node.toID() : index for index, node in enumerate(nodes)}
+        self.lastUseByNode = {}
+
+    def getOwner(self, socket, node, variables):
+        if node.toID() not in self.indexByNode: return None
+
+        owner, ownerIndex = None, -1
+        lastRead = -1
+        for targetNodeID, _, identifier in getLinkedSocketIDs(socket, node):
+            target = self.nodeByID[targetNodeID].inputsByIdentifier[identifier]
+            if target not in variables: continue
+
+            index = self.indexByNode.get(targetNodeID)
+            if index is None: return None
+
+            if target.dataIsModified:
+                if index > ownerIndex:
+                    owner, ownerIndex = target, index
+            else:
+                lastUse = self.getLastUse(targetNodeID)
+                if lastUse is None: return None
+                lastRead = max(lastRead, lastUse)
+
+        if owner is None or lastRead >= ownerIndex: return None
+        return owner
+
+    def getLastUse(self, nodeID):
+        if nodeID not in self.lastUseByNode:
+            self.lastUseByNode[nodeID] = self.calculateLastUse(nodeID)
+        return self.lastUseByNode[nodeID]
+
+    def calculateLastUse(self, nodeID):
+        '''
+        Outputs of a node that only reads the data can still reference it.
+        Returns None when the data can escape, then it is copied as before.
+        '''
+        lastUse = self.indexByNode.get(nodeID)
+        if lastUse is None: return None
+
+        node = self.nodeByID[nodeID]
+        if node.keepsInputReferences: return None
+
+        for socket, linkedIDs in iterOutputsWithLinkedIDs(node):
+            if not socket.isCopyable():
+                if socket.dataType in referenceDataTypes and len(linkedIDs) > 0: return None
+                continue
+            for targetNodeID, _, identifier in linkedIDs:
+                target = self.nodeByID[targetNodeID].inputsByIdentifier[identifier]
+                if target.dataIsModified: return None
+
+                targetLastUse = self.getLastUse(targetNodeID)
+                if targetLastUse is None: return None
+                lastUse = max(lastUse, targetLastUse)
+        return lastUse
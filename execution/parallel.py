@@ -0,0 +1,135 @@
+import os
+import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from .. tree_info import iterInputsWithLinkedIDs
+from .. problems import ExceptionDuringExecution
+
+_executor = None
+
+def getExecutor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers = os.cpu_count() or 1)
+    return _executor
+
+def shutdownExecutor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait = True)
+        _executor = None
+
+
+# Analysis
+##########################################
+
+def getConcurrentNodeGroups(nodes, foldedNodeIDs):
+    '''
+    Thread safe nodes don't access bpy and can be executed on other threads.
+    They start from values of other thread safe nodes, of folded nodes or of
+    preparing nodes, which are executed on the main thread before them.
+    Groups of thread safe nodes that don't share any data can be executed
+    on different threads.
+    Returns the preparing nodes and the groups.
+    '''
+    concurrentNodeIDs = set()
+    preparingNodeIDs = set()
+    groupIDByNode = {}
+    parentByGroup = {}
+
+    def findGroup(groupID):
+        while parentByGroup[groupID] != groupID:
+            groupID = parentByGroup[groupID]
+        return groupID
+
+    def joinGroups(groupID, otherGroupID):
+        parentByGroup[findGroup(otherGroupID)] = groupID
+
+    for index, node in enumerate(nodes):
+        nodeID = node.toID()
+        originIDs = set(iterOriginIDs(node)) - foldedNodeIDs
+        if not originIDs.issubset(concurrentNodeIDs | preparingNodeIDs): continue
+
+        if isThreadSafe(node):
+            concurrentNodeIDs.add(nodeID)
+            parentByGroup[index] = index
+            for originID in originIDs:
+                # the same data must not be used on different threads
+                if originID in preparingNodeIDs: groupIDByNode.setdefault(originID, index)
+                joinGroups(index, groupIDByNode[originID])
+            groupIDByNode[nodeID] = index
+        elif originIDs.isdisjoint(concurrentNodeIDs):
+            preparingNodeIDs.add(nodeID)
+
+    nodesByGroup = {}
+    for node in nodes:
+        nodeID = node.toID()
+        if nodeID in concurrentNodeIDs:
+            groupID = findGroup(groupIDByNode[nodeID])
+            nodesByGroup.setdefault(groupID, []).append(node)
+
+    # only preparing nodes whose values are used by thread safe nodes are executed first
+    neededNodeIDs = set()
+    for node in reversed(nodes):
+        nodeID = node.toID()
+        if nodeID in concurrentNodeIDs or nodeID in neededNodeIDs:
+            neededNodeIDs.update(originID for originID in iterOriginIDs(node) if originID in preparingNodeIDs)
+    preparingNodes = [node for node in nodes if node.toID() in neededNodeIDs]
+    return preparingNodes, list(nodesByGroup.values())
+
+def iterOriginIDs(node):
+    for socket, linkedIDs in iterInputsWithLinkedIDs(node):
+        for originID, _, _ in linkedIDs:
+            yield originID
+
+def isThreadSafe(node):
+    '''
+    Pure nodes can still use the Blender node in their code, e.g. to read
+    properties or to call the execute method. bpy is not thread safe.
+    '''
+    if not node.pure or hasattr(node, "execute"): return False
+    try: code = node.getLocalExecutionCode()
+    except: return False
+    return selfPattern.search(code) is None
+
+selfPattern = re.compile(r"\bself\b")
+
+
+# Execution
+##########################################
+
+def executeUnitsInParallel(units):
+    '''
+    The units are executed one after the other, so that all accesses to bpy
+    happen on the calling thread in the original order. The concurrent groups
+    of a unit run on the thread pool after its preparing nodes.
+    '''
+    return [executeUnitInParallel(unit) for unit in units]
+
+def executeUnitInParallel(unit):
+    if not unit.isSetup or len(unit.concurrentCodeObjects) == 0:
+        return unit.execute()
+    if not unit.executePreparingPart():
+        return False
+
+    # the calling thread would wait anyway, so it executes the first group itself
+    executor = getExecutor()
+    firstCodeObject, *otherCodeObjects = unit.concurrentCodeObjects
+    futures = [executor.submit(unit.executeConcurrentPart, codeObject) for codeObject in otherCodeObjects]
+    success = unit.executeConcurrentPart(firstCodeObject)
+    success = all([future.result() for future in futures]) and success
+
+    if not success:
+        ExceptionDuringExecution().report()
+        return False
+    return unit.executeSequentialPart()
+
+def executeCodeObject(codeObject, executionData):
+    '''Exceptions are only printed, problems have to be reported on the main thread'''
+    try:
+        exec(codeObject, executionData, executionData)
+        return True
+    except:
+        print("\n"*5)
+        traceback.print_exc()
+        return False
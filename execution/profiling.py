@@ -0,0 +1,222 @@
+import bpy
+import json
+import textwrap
+from time import perf_counter
+from collections import defaultdict, deque
+from .. utils.timing import prettyTime
+from .. graphics.text_box import TextBox
+from .. utils.operators import makeOperator
+from .. tree_info import getNodeByIdentifier
+from .. utils.blender_ui import iterNodeCornerLocations
+
+try: from time import perf_counter_ns
+except ImportError:
+    # only available since Python 3.7
+    def perf_counter_ns():
+        return int(perf_counter() * 1000000000)
+
+# the generated code only appends (identifier, start, end) tuples to this list,
+# everything else is calculated after the execution
+pendingEvents = []
+traceEvents = deque(maxlen = 200000)
+maxSamplesPerNode = 2000
+
+class NodeProfile:
+    __slots__ = ("calls", "totalTime", "selfTime", "minTime", "maxTime", "histogram", "samples", "sortedSamples")
+
+    def __init__(self):
+        self.calls = 0
+        self.totalTime = 0
+        self.selfTime = 0
+        self.minTime = None
+        self.maxTime = 0
+        # amount of calls per power of two nanoseconds
+        self.histogram = defaultdict(int)
+        self.samples = deque(maxlen = maxSamplesPerNode)
+        self.sortedSamples = None
+
+    def add(self, duration, childTime):
+        self.calls += 1
+        self.totalTime += duration
+        self.selfTime += duration - childTime
+        self.maxTime = max(self.maxTime, duration)
+        self.minTime = duration if self.minTime is None else min(self.minTime, duration)
+        self.histogram[duration.bit_length()] += 1
+        self.samples.append(duration)
+        self.sortedSamples = None
+
+    def getPercentile(self, percent):
+        if len(self.samples) == 0: return 0
+        # the profile is drawn much more often than it changes
+        if self.sortedSamples is None:
+            self.sortedSamples = sorted(self.samples)
+        samples = self.sortedSamples
+        index = min(int(len(samples) * percent / 100), len(samples) - 1)
+        return samples[index]
+
+    def getHistogramData(self):
+        '''Amount of calls by the upper bound of the duration in nanoseconds'''
+        return {str(2 ** bits) : amount for bits, amount in sorted(self.histogram.items())}
+
+    def __repr__(self):
+        ns = 1e-9
+        return textwrap.dedent("""\
+            Calls: {:,d}
+            Average: {}  Self: {}
+            Min: {}  Max: {}
+            P50: {}  P95: {}  P99: {}\
+            """.format(self.calls,
+                       prettyTime(self.totalTime / max(self.calls, 1) * ns),
+                       prettyTime(self.selfTime / max(self.calls, 1) * ns),
+                       prettyTime((self.minTime or 0) * ns),
+                       prettyTime(self.maxTime * ns),
+                       prettyTime(self.getPercentile(50) * ns),
+                       prettyTime(self.getPercentile(95) * ns),
+                       prettyTime(self.getPercentile(99) * ns)))
+
+profileByNodeIdentifier = defaultdict(NodeProfile)
+# inclusive time of nodes by the chain of nodes that called them,
+# e.g. the nodes inside of a group are below the invoke subprogram node
+timeByCallPath = defaultdict(int)
+executionProfile = NodeProfile()
+
+def getPendingEventsList():
+    return pendingEvents
+
+@makeOperator("an.reset_profile", "Reset Profile", redraw = True)
+def resetProfile():
+    pendingEvents.clear()
+    traceEvents.clear()
+    profileByNodeIdentifier.clear()
+    timeByCallPath.clear()
+    executionProfile.__init__()
+
+def processPendingEvents():
+    if len(pendingEvents) == 0: return
+
+    # parents start earlier and end later than their children
+    events = sorted(pendingEvents, key = lambda event: (event[1], -event[2]))
+    pendingEvents.clear()
+
+    childTimes = [0] * len(events)
+    callPaths = []
+    stack = []
+    for index, (identifier, start, end) in enumerate(events):
+        while len(stack) > 0 and events[stack[-1]][2] <= start:
+            stack.pop()
+        if len(stack) > 0:
+            childTimes[stack[-1]] += end - start
+        stack.append(index)
+        callPath = tuple(events[i][0] for i in stack)
+        timeByCallPath[callPath] += end - start
+        callPaths.append(callPath)
+
+    # frame time spikes are visible in the execution events
+    executionStart, executionEnd = events[0][1], max(event[2] for event in events)
+    executionProfile.add(executionEnd - executionStart, 0)
+    traceEvents.append((None, executionStart, executionEnd, ()))
+
+    for (identifier, start, end), childTime, callPath in zip(events, childTimes, callPaths):
+        profileByNodeIdentifier[identifier].add(end - start, childTime)
+        traceEvents.append((identifier, start, end, callPath[:-1]))
+
+def getSlowestCallPaths(amount):
+    processPendingEvents()
+    return sorted(timeByCallPath.items(), key = lambda item: item[1], reverse = True)[:amount]
+
+def getExecutionProfile():
+    processPendingEvents()
+    return executionProfile
+
+def getNodeProfile(node):
+    processPendingEvents()
+    return profileByNodeIdentifier[node.identifier]
+
+
+# Trace Export
+##########################################
+
+@makeOperator("an.export_profile_trace", "Export Profile Trace", arguments = ["String"])
+def exportProfileTrace(path = "//animation_nodes_trace.json"):
+    processPendingEvents()
+    path = bpy.path.abspath(path)
+    with open(path, "w") as f:
+        json.dump(getChromeTrace(), f)
+    print("Saved profile trace to: {}".format(path))
+
+def getChromeTrace():
+    '''
+    Can be opened with chrome://tracing or other trace viewers.
+    Events of nodes are nested below the execution and the invoking nodes.
+    The histograms and the time per call path are stored in otherData.
+    '''
+    names = {}
+    def getName(identifier):
+        if identifier not in names:
+            names[identifier] = getEventName(identifier)
+        return names[identifier]
+
+    events = []
+    for identifier, start, end, parents in traceEvents:
+        events.append({
+            "name" : getName(identifier),
+            "cat" : "execution" if identifier is None else "node",
+            "ph" : "X",
+            "ts" : start / 1000,
+            "dur" : (end - start) / 1000,
+            "pid" : 0,
+            "tid" : 0,
+            "args" : {"callPath" : " > ".join(getName(parent) for parent in parents)}})
+    events.append({"name" : "thread_name", "ph" : "M", "pid" : 0, "tid" : 0,
+                   "args" : {"name" : "Animation Nodes Execution"}})
+
+    otherData = {
+        "executionHistogram" : executionProfile.getHistogramData(),
+        "nodeHistograms" : {getName(identifier) : profile.getHistogramData()
+                            for identifier, profile in profileByNodeIdentifier.items()},
+        "timeByCallPath" : {" > ".join(getName(identifier) for identifier in callPath) : time / 1000
+                            for callPath, time in timeByCallPath.items()}}
+    return {"traceEvents" : events, "displayTimeUnit" : "ns", "otherData" : otherData}
+
+def getCallPathName(callPath):
+    return " > ".join(getEventName(identifier) for identifier in callPath)
+
+def getEventName(identifier):
+    if identifier is None: return "Execution"
+    try:
+        node = getNodeByIdentifier(identifier)
+        return "{} - {}".format(node.id_data.name, node.name)
+    except:
+        return identifier
+
+
+# Drawing
+##########################################
+
+def drawProfileResults():
+    tree = bpy.context.space_data.edit_tree
+    if tree is None: return
+    if tree.bl_idname != "an_AnimationNodeTree": return
+
+    processPendingEvents()
+
+    nodes = tree.nodes
+    region = bpy.context.region
+    leftCorners = iterNodeCornerLocations(nodes, region, horizontal = "LEFT")
+    rightCorners = iterNodeCornerLocations(nodes, region, horizontal = "RIGHT")
+
+    for node, leftBottom, rightBottom in zip(nodes, leftCorners, rightCorners):
+        if node.isAnimationNode and not node.hide:
+            drawProfileResultForNode(node, leftBottom, rightBottom)
+
+def drawProfileResultForNode(node, leftBottom, rightBottom):
+    profile = profileByNodeIdentifier.get(node.identifier)
+    if profile is None: text = "Not Profiled"
+    else: text = str(profile)
+
+    width = rightBottom.x - leftBottom.x
+
+    textBox = TextBox(text, leftBottom, width,
+                      fontSize = width / node.dimensions.x * 11)
+    textBox.padding = 3
+    textBox.draw()
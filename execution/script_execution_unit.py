@@ -1,5 +1,6 @@
 from .. utils.code import isCodeValid
 from . compile_scripts import compileScript
+from . socket_values import UnlinkedSocketValues
 from .. problems import ExecutionUnitNotSetup
 from . code_generator import getSocketValueExpression, iterSetupCodeLines, getInitialVariables
 
@@ -9,24 +10,34 @@ class ScriptExecutionUnit:
         self.setupScript = ""
         self.setupCodeObject = None
         self.executionData = {}
+        self.socketValues = None
+        self.isSetup = False
 
         self.scriptUpdated(nodeByID)
 
     def scriptUpdated(self, nodeByID = None):
         self.generateScript(nodeByID)
         self.compileScript()
+        # the old function must not be used anymore
+        self.finish()
 
     def setup(self):
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
         self.execute = self.executionData["main"]
+        self.isSetup = True
 
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
 
+    def reloadSocketValues(self, changedProperties):
+        if self.socketValues is not None:
+            self.socketValues.reload(self.executionData, changedProperties)
+
     def finish(self):
         self.executionData.clear()
         self.execute = self.raiseNotSetupException
+        self.isSetup = False
 
     def getCodes(self):
         return [self.setupScript]
@@ -37,6 +48,8 @@ class ScriptExecutionUnit:
         userCode = node.executionCode
 
         variables = getInitialVariables([node])
+        self.socketValues = UnlinkedSocketValues([node], variables,
+            name = "socket values: {}".format(repr(self.network.name)))
         setupCode = "\n".join(iterSetupCodeLines([node], variables))
 
         finalCode = []
@@ -0,0 +1,35 @@
+from .. tree_info import iterInputsWithLinkedIDs
+from . compile_scripts import compileScript
+from . code_generator import getLoadSocketValueLine
+
+class UnlinkedSocketValues:
+    '''
+    Reloads the values of unlinked input sockets in the namespace
+    of an already set up execution unit.
+    Sockets with a persistent value are only reloaded when they changed,
+    all other sockets are reloaded every time.
+    '''
+    def __init__(self, nodes, variables, name):
+        self.name = name
+        self.persistentLoadLines = {}
+
+        volatileLoadLines = []
+        for node in nodes:
+            treeName, nodeName = node.nodeTree.name, node.name
+            for i, (socket, linkedIDs) in enumerate(iterInputsWithLinkedIDs(node)):
+                if len(linkedIDs) > 0: continue
+                line = getLoadSocketValueLine(socket, node, variables, i)
+                if socket.persistentValue:
+                    self.persistentLoadLines[(treeName, nodeName, i)] = line
+                else:
+                    volatileLoadLines.append(line)
+
+        self.volatileCodeObject = compileScript("\n".join(volatileLoadLines), name = name)
+
+    def reload(self, executionData, changedProperties):
+        exec(self.volatileCodeObject, executionData, executionData)
+
+        lines = [self.persistentLoadLines[key] for key in changedProperties if key in self.persistentLoadLines]
+        if len(lines) > 0:
+            codeObject = compileScript("\n".join(lines), name = self.name)
+            exec(codeObject, executionData, executionData)
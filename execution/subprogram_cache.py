@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from .. preferences import getPreferences
+
+class SubprogramCache:
+    '''
+    Results of one cache owner (a node or a subprogram) ordered by their last usage.
+    All caches share one memory budget, see storeInCache.
+    '''
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.totalSize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return True, entry[0]
+
+    def store(self, key, value, size):
+        self.remove(key)
+        self.entries[key] = (value, size)
+        self.totalSize += size
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.totalSize -= entry[1]
+
+    def removeLeastRecentlyUsed(self):
+        _, (_, size) = self.entries.popitem(last = False)
+        self.totalSize -= size
+        self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.totalSize = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_cacheByOwner = {}
+_totalSize = 0
+
+def getCache(owner):
+    if owner not in _cacheByOwner:
+        _cacheByOwner[owner] = SubprogramCache()
+    return _cacheByOwner[owner]
+
+def getCacheIfExists(owner):
+    return _cacheByOwner.get(owner)
+
+def getCachedValue(owner, key):
+    return getCache(owner).get(key)
+
+def storeInCache(owner, key, value, size):
+    '''The size of the value in bytes is estimated by the sockets that output it'''
+    global _totalSize
+    maxSize = getMemoryLimit()
+    if size > maxSize: return
+
+    cache = getCache(owner)
+    _totalSize -= cache.totalSize
+    cache.store(key, value, size)
+    _totalSize += cache.totalSize
+
+    # the owner that uses the most memory has to give up its oldest entry
+    while _totalSize > maxSize:
+        largestCache = max(_cacheByOwner.values(), key = lambda cache: cache.totalSize)
+        oldSize = largestCache.totalSize
+        largestCache.removeLeastRecentlyUsed()
+        _totalSize -= oldSize - largestCache.totalSize
+
+def clearOwnerCache(owner):
+    global _totalSize
+    cache = _cacheByOwner.pop(owner, None)
+    if cache is not None:
+        _totalSize -= cache.totalSize
+
+def getMemoryLimit():
+    return getPreferences().subprogramCacheMemoryLimit * 1024 ** 2
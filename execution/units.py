@@ -1,8 +1,12 @@
+import re
 import traceback
 from .. import problems
 from collections import defaultdict
 from . cache import clearExecutionCache
+from . frame_cache import clearFrameCaches
+from . inlining import clearInlinedGroups
 from . measurements import resetMeasurements
+from . profiling import processPendingEvents, resetProfile
 from . main_execution_unit import MainExecutionUnit
 from . loop_execution_unit import LoopExecutionUnit
 from . group_execution_unit import GroupExecutionUnit
@@ -13,21 +17,26 @@ from .. problems import ExceptionDuringCodeCreation, CouldNotSetupExecutionUnits
 
 _mainUnitsByNodeTree = defaultdict(list)
 _subprogramUnitsByIdentifier = {}
+_changedProperties = set()
 
 def createExecutionUnits(nodeByID):
     reset()
     try:
-        createMainUnits(nodeByID)
+        # groups have to exist before the units that could inline them
         createSubprogramUnits(nodeByID)
+        createMainUnits(nodeByID)
     except:
         print("\n"*5)
         traceback.print_exc()
         ExceptionDuringCodeCreation().report()
 
 def reset():
+    tearDownExecutionUnits()
     resetMeasurements()
+    resetProfile()
     _mainUnitsByNodeTree.clear()
     _subprogramUnitsByIdentifier.clear()
+    clearInlinedGroups()
 
     for node in iterAnimationNodes():
         for socket in node.outputs:
@@ -39,7 +48,10 @@ def createMainUnits(nodeByID):
         _mainUnitsByNodeTree[network.treeName].append(unit)
 
 def createSubprogramUnits(nodeByID):
-    for network in getSubprogramNetworks():
+    # groups that don't invoke other subprograms are created first
+    networks = sorted(getSubprogramNetworks(),
+        key = lambda network: (network.type != "Group", len(network.invokeSubprogramIDs) > 0))
+    for network in networks:
         if network.type == "Group":
             unit = GroupExecutionUnit(network, nodeByID)
         if network.type == "Loop":
@@ -54,12 +66,20 @@ def setupExecutionUnits():
         if len(getAnimationNodeTrees()) == 0: return
         if not problems.canExecute(): return
 
+        # animated sockets change every frame, so they don't invalidate cached frames
+        if len(_changedProperties) > 0: clearFrameCaches()
+        changedProperties = _changedProperties | getAnimatedSockets()
+        _changedProperties.clear()
+
         for unit in getExecutionUnits():
-            unit.setup()
+            if unit.isSetup: unit.reloadSocketValues(changedProperties)
+            else: unit.setup()
 
         subprograms = {}
         for identifier, unit in _subprogramUnitsByIdentifier.items():
             subprograms["_subprogram" + identifier] = unit.execute
+            if getattr(unit, "isInlined", False):
+                subprograms.update(unit.getInlinedData())
 
         for unit in getExecutionUnits():
             unit.insertSubprogramFunctions(subprograms)
@@ -69,11 +89,43 @@ def setupExecutionUnits():
         CouldNotSetupExecutionUnits().report()
 
 def finishExecutionUnits():
+    # the units stay set up until the node trees change
+    clearExecutionCache()
+    processPendingEvents()
+
+def tearDownExecutionUnits():
     for unit in getExecutionUnits():
         unit.finish()
-
+    _changedProperties.clear()
+    clearFrameCaches()
     clearExecutionCache()
 
+def socketValueChanged(socket):
+    node = socket.node
+    _changedProperties.add((node.id_data.name, node.name, socket.getIndex(node)))
+
+def nodePropertyChanged(node):
+    _changedProperties.add((node.id_data.name, node.name, None))
+
+animatedInputPattern = re.compile(r'nodes\["(.*)"\]\.inputs\[(\d+)\]')
+
+def getAnimatedSockets():
+    """Socket values changed by fcurves or drivers don't call the update callbacks"""
+    animatedSockets = set()
+    for nodeTree in getAnimationNodeTrees():
+        animationData = nodeTree.animation_data
+        if animationData is None: continue
+
+        fcurves = list(animationData.drivers)
+        if animationData.action is not None:
+            fcurves.extend(animationData.action.fcurves)
+
+        for fcurve in fcurves:
+            match = animatedInputPattern.match(fcurve.data_path)
+            if match is not None:
+                animatedSockets.add((nodeTree.name, match.group(1), int(match.group(2))))
+    return animatedSockets
+
 
 def getMainUnitsByNodeTree(nodeTree):
     return _mainUnitsByNodeTree[nodeTree.name]
@@ -2,8 +2,8 @@ import bpy
 from . import tree_info
 from mathutils import Vector
 from . utils.nodes import idToSocket
-from . sockets.info import toBaseIdName, isList
-from . tree_info import getAllDataLinkIDs, getDirectlyLinkedSocket
+from . tree_info import getChangedDataLinkIDs, getDirectlyLinkedSocket
+from . sockets.info import toBaseIdName, isList, getDataTypes, getAllowedInputTypes
 
 def correctForbiddenNodeLinks():
     for dataOrigin, target in iterLinksThatNeedToBeCorrectedOrRemoved():
@@ -12,23 +12,47 @@ def correctForbiddenNodeLinks():
             removeLink(directOrigin, target)
     tree_info.updateIfNecessary()
 
-approvedLinkTypes = set()
-
 def iterLinksThatNeedToBeCorrectedOrRemoved():
-    for originID, targetID, originType, targetType in getAllDataLinkIDs():
-        if (originType, targetType) in approvedLinkTypes:
-            continue
+    # links that did not change since the last check are still valid
+    validLinkTypes = getValidLinkTypes()
+    invalidLinks = [link for link in getChangedDataLinkIDs() if link[2:] not in validLinkTypes]
+    for originID, targetID, originType, targetType in invalidLinks:
+        yield (idToSocket(originID), idToSocket(targetID))
+
+def isConnectionValid(origin, target):
+    return (origin.dataType, target.dataType) in getValidLinkTypes()
 
-        origin = idToSocket(originID)
-        target = idToSocket(targetID)
 
-        if isConnectionValid(origin, target):
-            approvedLinkTypes.add((originType, targetType))
-        else:
-            yield (origin, target)
+# Conversion Matrix
+##########################################
 
-def isConnectionValid(origin, target):
-    return origin.dataType in target.allowedInputTypes or target.allowedInputTypes[0] == "all"
+_validLinkTypes = None
+_conversionNodeByTypes = None
+
+def getValidLinkTypes():
+    if _validLinkTypes is None:
+        createConversionMatrix()
+    return _validLinkTypes
+
+def getConversionNodeByTypes():
+    '''Node that converts the origin type to the target type, independent of the socket names'''
+    if _conversionNodeByTypes is None:
+        createConversionMatrix()
+    return _conversionNodeByTypes
+
+def createConversionMatrix():
+    global _validLinkTypes, _conversionNodeByTypes
+    _validLinkTypes = set()
+    _conversionNodeByTypes = {}
+
+    dataTypes = getDataTypes()
+    for targetType in dataTypes:
+        allowedInputTypes = getAllowedInputTypes(targetType)
+        for originType in dataTypes:
+            if originType in allowedInputTypes or allowedInputTypes[0] == "all":
+                _validLinkTypes.add((originType, targetType))
+            elif (originType, targetType) in SimpleConvert.rules:
+                _conversionNodeByTypes[(originType, targetType)] = SimpleConvert.rules[(originType, targetType)]
 
 def tryToCorrectLink(dataOrigin, directOrigin, target):
     for corrector in linkCorrectors:
@@ -40,8 +64,9 @@ def tryToCorrectLink(dataOrigin, directOrigin, target):
 
 def removeLink(origin, target):
     nodeTree = origin.getNodeTree()
-    for link in nodeTree.links:
-        if link.from_socket == origin and link.to_socket == target:
+    # an input has only a single link, so there is no need to search all links of the tree
+    for link in target.links:
+        if link.from_socket == origin:
             nodeTree.links.remove(link)
 
 
@@ -71,6 +96,8 @@ class SimpleConvert(LinkCorrection):
         ("Object", "Vector") : "an_ObjectTransformsInputNode",
         ("Object", "Matrix") : "an_ObjectMatrixInputNode",
         ("Polygon List", "Mesh Data") : "an_MeshDataFromPolygonsNode",
+        ("Polygon List", "Polygon Array") : "an_PolygonArrayFromPolygonsNode",
+        ("Polygon Array", "Polygon List") : "an_PolygonsFromPolygonArrayNode",
         ("Object", "Shape Key List") : "an_ShapeKeysFromObjectNode",
         ("String", "Float") : "an_ParseNumberNode",
         ("Vector", "Euler") : "an_DirectionToRotationNode",
@@ -78,9 +105,9 @@ class SimpleConvert(LinkCorrection):
     }
 
     def check(self, origin, target):
-        return (origin.dataType, target.dataType) in self.rules
+        return (origin.dataType, target.dataType) in getConversionNodeByTypes()
     def insert(self, nodeTree, origin, target, dataOrigin):
-        nodeIdName = self.rules[(dataOrigin.dataType, target.dataType)]
+        nodeIdName = getConversionNodeByTypes()[(dataOrigin.dataType, target.dataType)]
         node = insertLinkedNode(nodeTree, nodeIdName, origin, target)
 
 class ConvertToIntegerList(LinkCorrection):
@@ -203,7 +230,8 @@ class ConvertFromGeneric(LinkCorrection):
     def insert(self, nodeTree, origin, target, dataOrigin):
         node = insertLinkedNode(nodeTree, "an_ConvertNode", origin, target)
         node.hide = True
-        tree_info.update()
+        tree_info.treeChanged(nodeTree.name)
+        tree_info.updateIfNecessary()
         node.assignOutputType(target.dataType)
 
 
@@ -14,6 +14,7 @@ class SetKeyframesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SetKeyframesNode"
     bl_label = "Set Keyframes"
     bl_width_default = 200
+    writesBlenderData = True
 
     paths = CollectionProperty(type = an_KeyframePath)
 
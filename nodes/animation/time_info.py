@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class TimeInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TimeInfoNode"
     bl_label = "Time Info"
+    sideEffects = False
     searchTags = ["Frame"]
 
     def create(self):
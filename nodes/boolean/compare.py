@@ -13,6 +13,7 @@ numericLabelTypes = ["Integer", "Float"]
 class CompareNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CompareNode"
     bl_label = "Compare"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     def assignedTypeChanged(self, context):
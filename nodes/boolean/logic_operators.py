@@ -15,6 +15,7 @@ operationLabels = {item[0] : item[1] for item in operationItems}
 class LogicOperatorsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_LogicOperatorsNode"
     bl_label = "Logic Operators"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     operation = EnumProperty(name = "Operation", default = "AND",
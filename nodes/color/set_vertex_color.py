@@ -8,6 +8,7 @@ from ... base_types.node import AnimationNode
 class SetVertexColorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SetVertexColorNode"
     bl_label = "Set Vertex Color"
+    writesBlenderData = True
 
     vertexColorName = StringProperty(name = "Vertex Color Group", default = "Col", update = propertyChanged)
     checkIfColorIsSet = BoolProperty(default = True)
@@ -10,6 +10,7 @@ frameTypeItems = [
 class EvaluateFCurveNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_EvaluateFCurveNode"
     bl_label = "Evaluate FCurve"
+    sideEffects = False
 
     frameType = EnumProperty(
         name = "Frame Type", default = "OFFSET",
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class FCurveInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FCurveInfoNode"
     bl_label = "FCurve Info"
+    sideEffects = False
 
     def create(self):
         self.newInput("FCurve", "FCurve", "fCurve")
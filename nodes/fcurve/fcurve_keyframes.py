@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class FCurveKeyframesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FCurveKeyframesNode"
     bl_label = "FCurve Keyframes"
+    sideEffects = False
 
     def create(self):
         self.newInput("FCurve", "FCurve", "fCurve")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class FCurvesFromObjectNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FCurvesFromObjectNode"
     bl_label = "FCurves from Object"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object", defaultDrawType = "PROPERTY_ONLY")
@@ -6,6 +6,7 @@ class DebugNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_DebugNode"
     bl_label = "Debug"
     dynamicLabelType = "HIDDEN_ONLY"
+    writesBlenderData = True
 
     printData = BoolProperty(name = "Print to Console", description = "Can be very slow when used often")
 
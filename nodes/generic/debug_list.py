@@ -5,6 +5,7 @@ from ... base_types.node import AnimationNode
 class DebugListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_DebugListNode"
     bl_label = "Debug List"
+    writesBlenderData = True
 
     textBlockName = StringProperty(name = "Text")
     dataType = StringProperty()
@@ -6,6 +6,7 @@ from ... sockets.info import getListDataTypes, toBaseDataType, toListDataType
 class CombineListsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineListsNode"
     bl_label = "Combine Lists"
+    pure = True
     dynamicLabelType = "ALWAYS"
     onlySearchTags = True
 
@@ -7,6 +7,7 @@ from ... sockets.info import getListDataTypes, toBaseDataType, toListDataType
 class CreateListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CreateListNode"
     bl_label = "Create List"
+    pure = True
     dynamicLabelType = "ALWAYS"
     onlySearchTags = True
 
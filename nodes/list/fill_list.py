@@ -12,6 +12,7 @@ fillModeItems = [
 class FillListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FillListNode"
     bl_label = "Fill List"
+    pure = True
 
     def assignedTypeChanged(self, context):
         self.generateSockets()
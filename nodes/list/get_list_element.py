@@ -8,6 +8,7 @@ from ... sockets.info import isBase, toBaseDataType, toListDataType
 class GetListElementNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetListElementNode"
     bl_label = "Get List Element"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     def assignedTypeChanged(self, context):
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class GetListLengthNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetListLengthNode"
     bl_label = "Get List Length"
+    pure = True
 
     def create(self):
         self.newInput("an_GenericSocket", "List", "list")
@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class ReverseListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ReverseListNode"
     bl_label = "Reverse List"
+    pure = True
 
     def assignedTypeChanged(self, context):
         self.generateSockets()
@@ -11,6 +11,7 @@ sliceEndType = [
 class SliceListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SliceListNode"
     bl_label = "Slice List"
+    pure = True
     bl_width_default = 170
 
     def settingChanged(self, context):
@@ -14,6 +14,7 @@ class CyclesMaterialOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CyclesMaterialOutputNode"
     bl_label = "Cycles Material Output"
     bl_width_default = 165
+    writesBlenderData = True
 
     def getPossibleSocketItems(self, context):
         sockets = self.getPossibleSockets()
@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class ViewportColorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ViewportColorNode"
     bl_label = "Viewport Color"
+    writesBlenderData = True
 
     materialName = StringProperty(update = propertyChanged)
 
@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class MatrixCombineNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_MatrixCombineNode"
     bl_label = "Combine Matrices"
+    pure = True
 
     def create(self):
         self.newInput("Matrix List", "Matrices", "matrices")
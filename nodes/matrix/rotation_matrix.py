@@ -12,6 +12,7 @@ axisItems = [
 class RotationMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RotationMatrixNode"
     bl_label = "Rotation Matrix"
+    pure = True
 
     def axisChanged(self, context):
         self.generateInput()
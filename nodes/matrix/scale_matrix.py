@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ScaleMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ScaleMatrixNode"
     bl_label = "Scale Matrix"
+    pure = True
 
     def create(self):
         self.newInput("Vector", "Scale", "scale", value = [1, 1, 1])
@@ -5,6 +5,7 @@ from ... data_structures.mesh import MeshData
 class CombineMeshDataNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineMeshDataNode"
     bl_label = "Combine Mesh Data"
+    sideEffects = False
 
     def create(self):
         self.newInput("Vector List", "Vertex Locations", "vertexLocations", dataIsModified = True)
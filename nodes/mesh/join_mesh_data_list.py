@@ -1,4 +1,5 @@
 import bpy
+import numpy
 from ... data_structures.mesh import MeshData
 from ... base_types.node import AnimationNode
 
@@ -7,15 +8,24 @@ class JoinMeshDataList(bpy.types.Node, AnimationNode):
     bl_label = "Join Mesh Data List"
 
     def create(self):
-        self.newInput("Mesh Data List", "Mesh Data List", "meshDataList", dataIsModified = True)
+        self.newInput("Mesh Data List", "Mesh Data List", "meshDataList")
         self.newOutput("Mesh Data", "Mesh Data", "meshData")
 
     def execute(self, meshDataList):
-        meshData = MeshData([], [], [])
-        offset = 0
+        if len(meshDataList) == 0: return MeshData([], [], [])
+
+        vertexArrays, edgeArrays, polygonArrays = [], [], []
+        vertexOffset, loopOffset = 0, 0
         for mesh in meshDataList:
-            meshData.vertices.extend(mesh.vertices)
-            meshData.edges.extend([(index1 + offset, index2 + offset) for index1, index2 in mesh.edges])
-            meshData.polygons.extend([tuple(index + offset for index in poly) for poly in mesh.polygons])
-            offset += len(mesh.vertices)
-        return meshData
+            vertexLocations = mesh.getVertexArray()
+            polygonIndices, polygonStarts, polygonLengths = mesh.getPolygonArrays()
+            vertexArrays.append(vertexLocations)
+            edgeArrays.append(mesh.getEdgeArray() + vertexOffset)
+            polygonArrays.append((polygonIndices + vertexOffset, polygonStarts + loopOffset, polygonLengths))
+            vertexOffset += len(vertexLocations)
+            loopOffset += len(polygonIndices)
+
+        return MeshData.fromArrays(
+            numpy.concatenate(vertexArrays),
+            numpy.concatenate(edgeArrays),
+            *(numpy.concatenate(arrays) for arrays in zip(*polygonArrays)))
@@ -11,10 +11,14 @@ meshDataTypeItems = [
     ("BMESH", "BMesh", "BMesh object", "", 1),
     ("VERTICES", "Vertices", "A list of vertex locations; The length of this list has to be equal to the amount of vertices the mesh already has", "", 2) ]
 
+# mesh pointer -> (topology fingerprint, element amounts after the last full update)
+topologyByMesh = {}
+
 class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_MeshObjectOutputNode"
     bl_label = "Mesh Object Output"
     bl_width_default = 175
+    writesBlenderData = True
     searchTags = [("Set Mesh Data on Object (old)", {"meshDataType" : repr("MESH_DATA")}),
                   ("Set BMesh on Object (old)", {"meshDataType" : repr("BMESH")}),
                   ("Set Vertices on Object (old)", {"meshDataType" : repr("VERTICES")}) ]
@@ -32,6 +36,9 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
     checkTupleLengths = BoolProperty(name = "Check Tuple Lengths", default = True,
         description = "Check that edges have two indices and polygons three or more")
 
+    cacheValidation = BoolProperty(name = "Cache Validation", default = True,
+        description = "Remember the validation result for meshes with the same topology")
+
     errorMessage = StringProperty()
 
     def create(self):
@@ -74,6 +81,7 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
     def drawAdvanced(self, layout):
         layout.prop(self, "checkIndices")
         layout.prop(self, "checkTupleLengths")
+        layout.prop(self, "cacheValidation")
 
     def getExecutionCode(self):
         yield "self.errorMessage = ''"
@@ -99,20 +107,59 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
         return True
 
     def setMeshData(self, mesh, meshData):
+        # fails for invalid tuple lengths, the validation below reports them
+        try: fingerprint = meshData.getTopologyFingerprint()
+        except: fingerprint = None
+
+        if fingerprint is not None and self.hasSameTopology(mesh, fingerprint):
+            # only the vertices moved, e.g. in deformation rigs
+            mesh.vertices.foreach_set("co", meshData.getVertexArray().ravel())
+            mesh.update()
+            return
+
         # clear existing mesh
         bmesh.new().to_mesh(mesh)
+        topologyByMesh.pop(mesh.as_pointer(), None)
 
-        isValidData = meshData.isValid(
+        error = meshData.getValidationError(
             checkTupleLengths = self.checkTupleLengths,
-            checkIndices = self.checkIndices)
+            checkIndices = self.checkIndices,
+            fingerprint = fingerprint if self.cacheValidation else None)
 
-        if isValidData:
-            mesh.from_pydata(meshData.vertices, meshData.edges, meshData.polygons)
+        if error is None:
+            self.setMeshArrays(mesh, meshData)
+            topologyByMesh[mesh.as_pointer()] = (fingerprint, getElementAmounts(mesh))
         else:
-            self.errorMessage = "The mesh data is invalid"
+            self.errorMessage = "The mesh data is invalid: " + error
+
+    def setMeshArrays(self, mesh, meshData):
+        vertexLocations = meshData.getVertexArray()
+        edgeIndices = meshData.getEdgeArray()
+        polygonIndices, polygonStarts, polygonLengths = meshData.getPolygonArrays()
+
+        mesh.vertices.add(len(vertexLocations))
+        mesh.edges.add(len(edgeIndices))
+        mesh.loops.add(len(polygonIndices))
+        mesh.polygons.add(len(polygonStarts))
+
+        mesh.vertices.foreach_set("co", vertexLocations.ravel())
+        mesh.edges.foreach_set("vertices", edgeIndices.ravel())
+        mesh.loops.foreach_set("vertex_index", polygonIndices)
+        mesh.polygons.foreach_set("loop_start", polygonStarts)
+        mesh.polygons.foreach_set("loop_total", polygonLengths)
+
+        # like from_pydata, edges are only created from the polygons when none are given
+        mesh.update(calc_edges = len(edgeIndices) == 0 and len(polygonStarts) > 0)
+
+    def hasSameTopology(self, mesh, fingerprint):
+        lastTopology = topologyByMesh.get(mesh.as_pointer())
+        if lastTopology is None: return False
+        # the mesh could have been changed somewhere else in the meantime
+        return lastTopology == (fingerprint, getElementAmounts(mesh))
 
     def setBMesh(self, mesh, bm):
         bm.to_mesh(mesh)
+        topologyByMesh.pop(mesh.as_pointer(), None)
 
     def setVertices(self, mesh, vertices):
         if len(mesh.vertices) != len(vertices):
@@ -133,3 +180,6 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
         allMaterialIndices = list(itertools.islice(itertools.cycle(materialIndices), len(mesh.polygons)))
         mesh.polygons.foreach_set("material_index", allMaterialIndices)
         mesh.polygons[0].material_index = materialIndices[0]
+
+def getElementAmounts(mesh):
+    return (len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons))
@@ -1,13 +1,15 @@
 import bpy
 from bpy.props import *
-from ... events import isRendering
 from ... utils.math import extractRotation
 from ... base_types.node import AnimationNode
-from ... data_structures.mesh import Polygon, Vertex
+from ... data_structures.mesh import Vertex
+from ... utils.mesh import (MeshEvaluation, getEvaluatedMesh, transformLocationArray,
+                            createPolygonArray, toVectorList, toTupleList, toPolygonTupleList)
 
 class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectMeshDataNode"
     bl_label = "Object Mesh Data"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object", defaultDrawType = "PROPERTY_ONLY")
@@ -20,55 +22,61 @@ class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
         self.newOutput("Polygon Indices List", "Polygon Indices", "polygonIndices")
         self.newOutput("Vertex List", "Vertices", "vertices")
         self.newOutput("Polygon List", "Polygons", "polygons")
+        self.newOutput("Polygon Array", "Polygon Array", "polygonArray")
         self.newOutput("String", "Mesh Name", "meshName", hide = True)
 
     def getExecutionCode(self):
         isLinked = self.getLinkedOutputsDict()
         if not any(isLinked.values()): return
+        # older nodes don't have this output
+        usePolygonArray = isLinked["polygons"] or isLinked.get("polygonArray", False)
 
         yield "meshName = ''"
         yield "if getattr(object, 'type', '') == 'MESH':"
-        yield "    mesh = self.getMesh(object, useModifiers, scene)"
-        yield "    meshName = mesh.name"
+        yield "    evaluation = self.getMeshEvaluation(object, useModifiers, scene)"
+        yield "    meshName = evaluation.mesh.name"
 
-        if isLinked["vertexLocations"] or isLinked["polygons"]:
-            yield "    vertexLocations = self.getVertexLocations(mesh, object, useWorldSpace, {})".format(repr(isLinked["vertexLocations"]))
+        if isLinked["vertexLocations"] or usePolygonArray:
+            yield "    vertexLocationArray = self.getVertexLocationArray(evaluation.arrays[0], object, useWorldSpace)"
+        if isLinked["vertexLocations"]:
+            yield "    vertexLocations = self.getVertexLocations(vertexLocationArray)"
         if isLinked["edgeIndices"]:
-            yield "    edgeIndices = self.getEdgeIndices(mesh)"
+            yield "    edgeIndices = self.getEdgeIndices(evaluation.arrays[1])"
         if isLinked["polygonIndices"]:
-            yield "    polygonIndices = self.getPolygonIndices(mesh)"
+            yield "    polygonIndices = self.getPolygonIndices(*evaluation.arrays[2:])"
         if isLinked["vertices"]:
-            yield "    vertices = self.getVertices(mesh, object, useWorldSpace)"
+            yield "    vertices = self.getVertices(evaluation.mesh, object, useWorldSpace)"
+        if usePolygonArray:
+            # the polygons are read only once, also when both outputs are used
+            yield "    polygonArray = self.getPolygonArray(evaluation.mesh, vertexLocationArray, evaluation.arrays[2:], object, useWorldSpace)"
         if isLinked["polygons"]:
-            yield "    polygons = self.getPolygons(mesh, vertexLocations, object, useWorldSpace)"
+            yield "    polygons = polygonArray.toPolygons()"
 
-        yield "    self.clearMesh(mesh, useModifiers, scene)"
-        yield "else: vertexLocations, edgeIndices, polygonIndices, vertices, polygons = [], [], [], [], []"
+        yield "else:"
+        yield "    vertexLocations, edgeIndices, polygonIndices, vertices, polygons = [], [], [], [], []"
+        if "polygonArray" in isLinked:
+            yield "    polygonArray = animation_nodes.data_structures.mesh.PolygonArray.empty()"
 
-
-    def getMesh(self, object, useModifiers, scene):
+    def getMeshEvaluation(self, object, useModifiers, scene):
+        # the arrays and the temporary mesh are shared with other nodes in the same execution
         if useModifiers and scene is not None:
-            settings = "RENDER" if isRendering() else "PREVIEW"
-            return object.to_mesh(scene = scene, apply_modifiers = True, settings = settings)
-        return object.data
-
-    def clearMesh(self, mesh, useModifiers, scene):
-        if useModifiers and scene is not None: bpy.data.meshes.remove(mesh)
+            return getEvaluatedMesh(object, scene)
+        return MeshEvaluation(object.data)
 
 
-    def getVertexLocations(self, mesh, object, useWorldSpace, copyVertices):
+    def getVertexLocationArray(self, locations, object, useWorldSpace):
         if useWorldSpace:
-            matrix = object.matrix_world
-            return [matrix * v.co for v in mesh.vertices]
-        else:
-            if copyVertices: return [v.co.copy() for v in mesh.vertices]
-            else: return [v.co for v in mesh.vertices]
+            return transformLocationArray(locations, object.matrix_world)
+        return locations
+
+    def getVertexLocations(self, locations):
+        return toVectorList(locations)
 
-    def getEdgeIndices(self, mesh):
-        return [tuple(edge.vertices) for edge in mesh.edges]
+    def getEdgeIndices(self, edgeIndices):
+        return toTupleList(edgeIndices)
 
-    def getPolygonIndices(self, mesh):
-        return [tuple(face.vertices) for face in mesh.polygons]
+    def getPolygonIndices(self, polygonIndices, polygonStarts, polygonLengths):
+        return toPolygonTupleList(polygonIndices, polygonStarts, polygonLengths)
 
     def getVertices(self, mesh, object, useWorldSpace):
         vertices = []
@@ -80,13 +88,6 @@ class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
             vertices = [Vertex.fromMeshVertexInLocalSpace(meshVertex) for meshVertex in mesh.vertices]
         return vertices
 
-    def getPolygons(self, mesh, vertexLocations, object, useWorldSpace):
-        polygons = []
-        if useWorldSpace:
-            matrix = object.matrix_world
-            rotation = extractRotation(matrix)
-            scale = matrix.median_scale
-            polygons = [Polygon.fromMeshPolygonInWorldSpace(meshPolygon, vertexLocations, matrix, rotation, scale) for meshPolygon in mesh.polygons]
-        else:
-            polygons = [Polygon.fromMeshPolygonInLocalSpace(meshPolygon, vertexLocations) for meshPolygon in mesh.polygons]
-        return polygons
+    def getPolygonArray(self, mesh, vertexLocations, polygonIndexArrays, object, useWorldSpace):
+        matrix = object.matrix_world if useWorldSpace else None
+        return createPolygonArray(mesh, vertexLocations, polygonIndexArrays, matrix)
@@ -0,0 +1,30 @@
+import bpy
+from ... base_types.node import AnimationNode
+from ... data_structures.mesh import PolygonArray
+
+class PolygonArrayFromPolygonsNode(bpy.types.Node, AnimationNode):
+    bl_idname = "an_PolygonArrayFromPolygonsNode"
+    bl_label = "Polygon Array from Polygons"
+    sideEffects = False
+
+    def create(self):
+        self.newInput("Polygon List", "Polygons", "polygons")
+        self.newOutput("Polygon Array", "Polygon Array", "polygonArray")
+
+    def execute(self, polygons):
+        return PolygonArray.fromPolygons(polygons)
+
+class PolygonsFromPolygonArrayNode(bpy.types.Node, AnimationNode):
+    bl_idname = "an_PolygonsFromPolygonArrayNode"
+    bl_label = "Polygons from Polygon Array"
+    sideEffects = False
+
+    def create(self):
+        self.newInput("Polygon Array", "Polygon Array", "polygonArray")
+        self.newOutput("Polygon List", "Polygons", "polygons")
+        self.newOutput("Mesh Data", "Mesh Data", "meshData")
+
+    def getExecutionCode(self):
+        isLinked = self.getLinkedOutputsDict()
+        if isLinked["polygons"]: yield "polygons = polygonArray.toPolygons()"
+        if isLinked["meshData"]: yield "meshData = polygonArray.toMeshData()"
@@ -0,0 +1,22 @@
+import bpy
+from ... base_types.node import AnimationNode
+
+class PolygonArrayInfoNode(bpy.types.Node, AnimationNode):
+    bl_idname = "an_PolygonArrayInfoNode"
+    bl_label = "Polygon Array Info"
+    sideEffects = False
+
+    def create(self):
+        self.newInput("Polygon Array", "Polygons", "polygons")
+        self.newOutput("Vector List", "Centers", "centers")
+        self.newOutput("Vector List", "Normals", "normals")
+        self.newOutput("Float List", "Areas", "areas")
+        self.newOutput("Integer List", "Material Indices", "materialIndices")
+
+    def getExecutionCode(self):
+        isLinked = self.getLinkedOutputsDict()
+
+        if isLinked["centers"]: yield "centers = animation_nodes.utils.mesh.toVectorList(polygons.centers)"
+        if isLinked["normals"]: yield "normals = animation_nodes.utils.mesh.toVectorList(polygons.normals)"
+        if isLinked["areas"]: yield "areas = polygons.areas.tolist()"
+        if isLinked["materialIndices"]: yield "materialIndices = polygons.materialIndices.tolist()"
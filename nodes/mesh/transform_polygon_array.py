@@ -0,0 +1,37 @@
+import bpy
+from bpy.props import *
+from ... tree_info import keepNodeState
+from ... base_types.node import AnimationNode
+from . transform_polygon import pivotTypeItems
+
+class TransformPolygonArrayNode(bpy.types.Node, AnimationNode):
+    bl_idname = "an_TransformPolygonArrayNode"
+    bl_label = "Transform Polygon Array"
+
+    def pivotTypeChanged(self, context):
+        self.generateSockets()
+
+    pivotType = EnumProperty(name = "Pivot Type", default = "CENTER",
+        items = pivotTypeItems, update = pivotTypeChanged)
+
+    def create(self):
+        self.generateSockets()
+        self.newOutput("Polygon Array", "Polygons", "outPolygons")
+
+    def draw(self, layout):
+        layout.prop(self, "pivotType", text = "Pivot")
+
+    @keepNodeState
+    def generateSockets(self):
+        self.inputs.clear()
+        self.newInput("Polygon Array", "Polygons", "polygons", dataIsModified = True)
+        self.newInput("Matrix", "Matrix", "matrix")
+
+        if self.pivotType == "CUSTOM":
+            self.newInput("Vector", "Pivot", "pivot")
+
+    def getExecutionCode(self):
+        # all polygons are transformed at once
+        pivotName = "pivot" if self.pivotType == "CUSTOM" else "None"
+        yield "polygons.transformVertexLocations(matrix, {}, {})".format(repr(self.pivotType), pivotName)
+        yield "outPolygons = polygons"
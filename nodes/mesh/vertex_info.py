@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VertexInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VertexInfoNode"
     bl_label = "Vertex Info"
+    sideEffects = False
 
     def create(self):
         self.newInput("Vertex", "Vertex", "vertex")
@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class FloatClampNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatClampNode"
     bl_label = "Clamp"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     def create(self):
@@ -19,6 +20,12 @@ class FloatClampNode(bpy.types.Node, AnimationNode):
         if self.outputs[0].dataType == "Integer":
             yield "outValue = int(outValue)"
 
+    def getVectorizedExecutionCode(self):
+        lines = ["outValue = numpy.minimum(numpy.maximum(value, minValue), maxValue)"]
+        if self.outputs[0].dataType == "Integer":
+            lines.append("outValue = numpy.trunc(outValue).astype(int)")
+        return lines
+
     def drawLabel(self):
         label = "clamp(min, max)"
         if self.minValueSocket.isUnlinked:
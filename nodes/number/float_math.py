@@ -39,6 +39,33 @@ stepSizeInputOperations = ("SNAP", )
 
 operationLabels = {item[0] : item[2] for item in operationItems}
 
+# used when all iterations of a loop are calculated at once
+vectorizedOperations = {
+    "ADD" : "result = a + b",
+    "SUBTRACT" : "result = a - b",
+    "MULTIPLY" : "result = a * b",
+    "DIVIDE" : "result = numpy.where(b == 0, 0, numpy.true_divide(a, numpy.where(b == 0, 1, b)))",
+    "SINE" : "result = numpy.sin(a)",
+    "COSINE" : "result = numpy.cos(a)",
+    "TANGENT" : "result = numpy.tan(a)",
+    "ARCSINE" : "result = numpy.arcsin(numpy.clip(a, -1, 1))",
+    "ARCCOSINE" : "result = numpy.arccos(numpy.clip(a, -1, 1))",
+    "ARCTANGENT" : "result = numpy.arctan(a)",
+    "ARCTANGENT2" : "result = numpy.arctan2(b, a)",
+    "HYPOTENUSE" : "result = numpy.hypot(a, b)",
+    "MINIMUM" : "result = numpy.minimum(a, b)",
+    "MAXIMUM" : "result = numpy.maximum(a, b)",
+    "ABSOLUTE" : "result = numpy.abs(a)",
+    "MODULO" : "result = numpy.where(b == 0, 0, numpy.mod(a, numpy.where(b == 0, 1, b)))",
+    "FLOOR" : "result = numpy.floor(a)",
+    "CEILING" : "result = numpy.ceil(a)",
+    "SQRT" : "result = numpy.sqrt(numpy.maximum(a, 0))",
+    "COPY_SIGN" : "result = numpy.copysign(a, b)",
+    "INVERT" : "result = - a",
+    "RECIPROCAL" : "result = numpy.where(a == 0, 0, numpy.true_divide(1, numpy.where(a == 0, 1, a)))",
+    "SNAP" : "result = numpy.where(stepSize == 0, a, numpy.round(numpy.true_divide(a, numpy.where(stepSize == 0, 1, stepSize))) * stepSize)",
+    "FLOOR_DIV" : "result = numpy.where(b == 0, 0, numpy.floor_divide(a, numpy.where(b == 0, 1, b)))" }
+
 searchItems = {
     "Add Numbers" : "ADD",
     "Subtract Numbers" : "SUBTRACT",
@@ -51,6 +78,7 @@ searchItems = {
 class FloatMathNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatMathNode"
     bl_label = "Math"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     @classmethod
@@ -137,6 +165,13 @@ class FloatMathNode(bpy.types.Node, AnimationNode):
         if self.outputs[0].dataType == "Integer":
             yield "result = int(result)"
 
+    def getVectorizedExecutionCode(self):
+        if self.operation not in vectorizedOperations: return None
+        lines = [vectorizedOperations[self.operation]]
+        if self.outputs[0].dataType == "Integer":
+            lines.append("result = numpy.trunc(result).astype(int)")
+        return lines
+
     def getUsedModules(self):
         return ["math"]
 
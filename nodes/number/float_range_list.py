@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class FloatRangeListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatRangeListNode"
     bl_label = "Number Range"
+    pure = True
     dynamicLabelType = "ALWAYS"
 
     onlySearchTags = True
@@ -7,6 +7,7 @@ from ... algorithms.perlin_noise import perlinNoise
 class FloatWiggleNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatWiggleNode"
     bl_label = "Number Wiggle"
+    sideEffects = False
 
     nodeSeed = IntProperty(update = propertyChanged)
 
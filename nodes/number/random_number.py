@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class RandomNumberNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RandomNumberNode"
     bl_label = "Random Number"
+    sideEffects = False
 
     nodeSeed = IntProperty(update = propertyChanged)
 
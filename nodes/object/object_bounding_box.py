@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class ObjectBoundingBoxNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectBoundingBoxNode"
     bl_label = "Object Bounding Box"
+    sideEffects = False
 
     useWorldSpace = BoolProperty(name = "Use World Space", default = True, update = propertyChanged)
 
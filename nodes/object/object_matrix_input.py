@@ -5,6 +5,7 @@ from ... base_types.node import AnimationNode
 class ObjectMatrixInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectMatrixInputNode"
     bl_label = "Object Matrix Input"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
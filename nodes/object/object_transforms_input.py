@@ -11,6 +11,7 @@ frameTypeItems = [
 class ObjectTransformsInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectTransformsInputNode"
     bl_label = "Object Transforms Input"
+    sideEffects = False
     bl_width_default = 165
 
     def useCurrentTransformsChanged(self, context):
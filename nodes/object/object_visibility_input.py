@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ObjectVisibilityInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectVisibilityInputNode"
     bl_label = "Object Visibility Input"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object", defaultDrawType = "PROPERTY_ONLY")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class GetObjectsFromGroupNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetObjectsFromGroupNode"
     bl_label = "Objects from Group"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object Group", "Group", "group", defaultDrawType = "PROPERTY_ONLY")
@@ -11,6 +11,7 @@ class CopyTransformsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CopyTransformsNode"
     bl_label = "Copy Transforms"
     bl_width_default = 170
+    writesBlenderData = True
 
     def useCurrentTransformsChanged(self, context):
         self.inputs["Frame"].hide = self.useCurrentTransforms
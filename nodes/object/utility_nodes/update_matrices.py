@@ -4,6 +4,7 @@ from .... base_types.node import AnimationNode
 class UpdateObjectMatricesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_UpdateObjectMatricesNode"
     bl_label = "Update Object Matrices"
+    writesBlenderData = True
 
     def create(self):
         self.newInput("Object", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
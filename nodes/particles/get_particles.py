@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class GetParticlesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetParticlesNode"
     bl_label = "Get Particles"
+    sideEffects = False
 
     def create(self):
         self.newInput("Particle System", "Particle System", "particleSystem")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ParticleSystemsInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ParticleSystemsInputNode"
     bl_label = "Particle Systems Input"
+    sideEffects = False
     bl_width_default = 150
 
     def create(self):
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ParticlesFromObjectNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ParticlesFromObjectNode"
     bl_label = "Particles from Object"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object", defaultDrawType = "PROPERTY_ONLY")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class CombineQuaternionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineQuaternionNode"
     bl_label = "Combine Quaternion"
+    pure = True
 
     def create(self):
         self.newInput("Float", "W", "w").value = 1
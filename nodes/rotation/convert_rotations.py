@@ -17,6 +17,7 @@ conversionTypeItems = [
 class ConvertRotationsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ConvertRotationsNode"
     bl_label = "Convert Rotations"
+    pure = True
     bl_width_default = 160
     dynamicLabelType = "ALWAYS"
 
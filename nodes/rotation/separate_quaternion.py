@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class SeparateQuaternionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SeparateQuaternionNode"
     bl_label = "Separate Quaternion"
+    pure = True
 
     def create(self):
         self.newInput("Quaternion", "Quaternion", "quaternion")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class GetAllSequencesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetAllSequencesNode"
     bl_label = "Get All Sequences"
+    sideEffects = False
 
     def create(self):
         self.newInput("Scene", "Scene", "scene", hide = True)
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class SequenceInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SequenceInfoNode"
     bl_label = "Sequence Info"
+    sideEffects = False
 
     def create(self):
         self.newInput("Sequence", "Sequence", "sequence", defaultDrawType = "PROPERTY_ONLY")
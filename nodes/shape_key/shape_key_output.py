@@ -7,6 +7,7 @@ class ShapeKeyOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ShapeKeyOutputNode"
     bl_label = "Shape Key Output"
     bl_width_default = 160
+    writesBlenderData = True
 
     errorMessage = StringProperty()
 
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ShapeKeysFromObjectNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ShapeKeysFromObjectNode"
     bl_label = "Shape Keys from Object"
+    sideEffects = False
 
     def create(self):
         self.newInput("Object", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
@@ -7,6 +7,7 @@ class CurveObjectOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CurveObjectOutputNode"
     bl_label = "Curve Object Output"
     bl_width_default = 175
+    writesBlenderData = True
     searchTags = ["Set Splines on Object (old)"]
 
     errorMessage = StringProperty()
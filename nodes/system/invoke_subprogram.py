@@ -2,11 +2,14 @@ import bpy
 from bpy.props import *
 from ... sockets.info import toDataType
 from ... events import executionCodeChanged
+from ... utils.hash import getValueFingerprint
 from ... base_types.node import AnimationNode
 from ... utils.blender_ui import getDpiFactor
 from ... utils.enum_items import enumItemsFromDicts
 from ... utils.nodes import newNodeAtCursor, invokeTranslation
 from ... tree_info import getSubprogramNetworks, getNodeByIdentifier, getNetworkByIdentifier
+from ... execution.inlining import getInlinedGroup
+from ... execution.subprogram_cache import getCachedValue, storeInCache, clearOwnerCache, getCacheIfExists
 
 cacheTypeItems = [
     ("DISABLED", "Disabled", ""),
@@ -14,14 +17,11 @@ cacheTypeItems = [
     ("FRAME_BASED", "Once per Frame", ""),
     ("INPUT_BASED", "Once per Input", "")]
 
-oneTimeCache = {}
-frameBasedCache = {}
-inputBasedCache = {}
-
 class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_InvokeSubprogramNode"
     bl_label = "Invoke Subprogram"
     bl_width_default = 170
+    unknownSideEffects = True
 
     def subprogramIdentifierChanged(self, context):
         self.updateSockets()
@@ -60,6 +60,11 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
         outputString = ", ".join(["output_" + str(i) for i in range(len(self.outputs))])
 
         if self.cacheType == "DISABLED" or not self.canCache:
+            inlinedGroup = self.getInlinedGroup()
+            if inlinedGroup is not None:
+                inputNames = ["input_" + str(i) for i in range(len(self.inputs))]
+                outputNames = ["output_" + str(i) for i in range(len(self.outputs))]
+                return list(inlinedGroup.iterLines(inputNames, outputNames))
             if outputString == "": return invokeString
             else: return "{} = {}".format(outputString, invokeString)
         else:
@@ -71,30 +76,39 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             if outputString != "": lines.append("{} = groupOutputData".format(outputString))
             return lines
 
-    def getCachedData(self, *args):
-        if self.cacheType == "ONE_TIME":
-            try: return True, oneTimeCache[self.identifier]
-            except: pass
-        if self.cacheType == "FRAME_BASED":
-            try: return True, frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)]
-            except: pass
-        if self.cacheType == "INPUT_BASED":
-            try: return True, inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)]
-            except: pass
+    def getInlinedGroup(self):
+        if self.cacheType != "DISABLED" and self.canCache: return None
+        return getInlinedGroup(self.subprogramIdentifier)
 
-        return False, None
+    def getInlinedGlobalNames(self):
+        inlinedGroup = self.getInlinedGroup()
+        if inlinedGroup is None: return []
+        return inlinedGroup.globalNames
+
+    def getCachedData(self, *args):
+        return getCachedValue(self.cacheOwner, self.getCacheKey(args))
 
     def setCacheData(self, data, *args):
-        if self.cacheType == "ONE_TIME": oneTimeCache[self.identifier] = data
-        elif self.cacheType == "FRAME_BASED":
-            if self.identifier not in frameBasedCache: frameBasedCache[self.identifier] = {}
-            frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)] = data
-        elif self.cacheType == "INPUT_BASED":
-            if self.subprogramIdentifier not in inputBasedCache: inputBasedCache[self.subprogramIdentifier] = {}
-            inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)] = data
+        storeInCache(self.cacheOwner, self.getCacheKey(args), data, self.estimateDataSize(data))
+
+    def estimateDataSize(self, data):
+        # subprograms with one output return the value itself
+        values = data if len(self.outputs) > 1 else [data]
+        return sum(socket.estimateValueSize(value) for socket, value in zip(self.outputs, values))
+
+    def getCacheKey(self, args):
+        if self.cacheType == "FRAME_BASED":
+            return self.nodeTree.scene.frame_current
+        if self.cacheType == "INPUT_BASED":
+            return tuple(getValueFingerprint(arg) for arg in args)
+        return None
 
-    def getArgsHash(self, *args):
-        return tuple(hash(arg) for arg in args)
+    @property
+    def cacheOwner(self):
+        # all invoke nodes of a subprogram can share the results for the same inputs
+        if self.cacheType == "INPUT_BASED":
+            return ("INPUT_BASED", self.subprogramIdentifier)
+        return (self.cacheType, self.identifier)
 
 
     def draw(self, layout):
@@ -136,6 +150,14 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             if not self.isOutputStorable: col.label("  - The output is not storable")
             if not self.isInputComparable: col.label("  - The input is not comparable")
         self.invokeFunction(layout, "clearCache", text = "Clear Cache")
+        self.drawCacheStatistics(layout)
+
+    def drawCacheStatistics(self, layout):
+        cache = getCacheIfExists(self.cacheOwner)
+        if cache is None or self.cacheType == "DISABLED": return
+        col = layout.column(align = True)
+        col.label("{} entries, {:.2f} MB".format(len(cache), cache.totalSize / 1024 ** 2))
+        col.label("Hits: {}, Misses: {}, Evicted: {}".format(cache.hits, cache.misses, cache.evictions))
 
 
     def updateSockets(self):
@@ -152,9 +174,9 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
         self.isOutputStorable = all(socket.storable for socket in self.outputs)
 
     def clearCache(self):
-        oneTimeCache.pop(self.identifier, None)
-        frameBasedCache.pop(self.identifier, None)
-        inputBasedCache.pop(self.subprogramIdentifier, None)
+        clearOwnerCache(("ONE_TIME", self.identifier))
+        clearOwnerCache(("FRAME_BASED", self.identifier))
+        clearOwnerCache(("INPUT_BASED", self.subprogramIdentifier))
 
 
     @property
@@ -166,6 +188,11 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     def subprogramNetwork(self):
         return getNetworkByIdentifier(self.subprogramIdentifier)
 
+    @property
+    def keepsInputReferences(self):
+        # cached results can be the input data itself
+        return self.cacheType != "DISABLED" and self.canCache
+
     @property
     def canCache(self):
         if self.cacheType == "DISABLED": return True
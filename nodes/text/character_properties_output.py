@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class CharacterPropertiesOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CharacterPropertiesOutputNode"
     bl_label = "Character Properties Output"
+    writesBlenderData = True
 
     allowNegativeIndex = BoolProperty(default = True)
 
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class JoinStringsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_JoinStringsNode"
     bl_label = "Join Texts"
+    pure = True
 
     def create(self):
         self.newInput("String List", "Texts", "texts")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ReplicateStringsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ReplicateStringsNode"
     bl_label = "Replicate Text"
+    pure = True
 
     def create(self):
         self.newInput("String", "Text", "text")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class StringLengthNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_StringLengthNode"
     bl_label = "Text Length"
+    pure = True
 
     def create(self):
         self.newInput("String", "Text", "text")
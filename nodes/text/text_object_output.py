@@ -8,6 +8,7 @@ class TextObjectOutputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TextObjectOutputNode"
     bl_label = "Text Object Output"
     bl_width_default = 170
+    writesBlenderData = True
 
     errorMessage = StringProperty()
 
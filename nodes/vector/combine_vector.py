@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class CombineVectorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineVectorNode"
     bl_label = "Combine Vector"
+    pure = True
     dynamicLabelType = "HIDDEN_ONLY"
 
     def create(self):
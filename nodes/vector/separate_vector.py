@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class SeparateVectorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SeparateVectorNode"
     bl_label = "Separate Vector"
+    pure = True
 
     def create(self):
         self.newInput("Vector", "Vector", "vector")
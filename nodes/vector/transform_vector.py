@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class TransformVectorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TransformVectorNode"
     bl_label = "Transform Vector"
+    pure = True
 
     def create(self):
         self.newInput("Vector", "Vector", "vector")
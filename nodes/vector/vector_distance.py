@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VectorDistanceNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VectorDistanceNode"
     bl_label = "Vector Distance"
+    pure = True
 
     def create(self):
         self.newInput("Vector", "A", "a")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VectorLengthNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VectorLengthNode"
     bl_label = "Vector Length"
+    pure = True
 
     def create(self):
         self.newInput("Vector", "Vector", "vector")
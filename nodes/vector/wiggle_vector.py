@@ -8,6 +8,7 @@ from ... algorithms.perlin_noise import perlinNoise
 class VectorWiggleNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VectorWiggleNode"
     bl_label = "Vector Wiggle"
+    sideEffects = False
 
     nodeSeed = IntProperty(update = propertyChanged)
 
@@ -1,6 +1,12 @@
 import bpy
+import time
 from bpy.props import *
+from .. events import setBaking
+from .. update import updateEverything
 from .. preferences import getPreferences
+from .. utils.nodes import getAnimationNodeTrees
+from .. execution.units import setupExecutionUnits, finishExecutionUnits
+from .. execution.baking import KeyframeRecorder, startRecording, stopRecording
 
 class BakeAnimation(bpy.types.Operator):
     bl_idname = "an.bake_to_keyframes"
@@ -11,27 +17,69 @@ class BakeAnimation(bpy.types.Operator):
     endFrame = IntProperty(default = 250)
 
     def invoke(self, context, event):
-        context.window_manager.modal_handler_add(self)
-        self.timer = context.window_manager.event_timer_add(0.001, context.window)
+        self.scene = context.scene
+        self.oldFrame = self.scene.frame_current
+        self.oldExecutionCodeType = getPreferences().executionCode.type
 
+        # the execution units are only created once for all frames
         getPreferences().executionCode.type = "BAKE"
+        updateEverything()
+        self.nodeTrees = [tree for tree in getAnimationNodeTrees()
+                          if tree.autoExecution.enabled and tree.hasMainExecutionUnits]
 
-        self.scene = context.scene
-        self.scene.frame_set(self.startFrame)
+        self.recorder = KeyframeRecorder()
+        startRecording(self.recorder)
+        setBaking(True)
+
+        self.frame = self.startFrame
+        self.frameAmount = max(self.endFrame - self.startFrame + 1, 1)
+        context.window_manager.progress_begin(0, self.frameAmount)
+        context.window_manager.modal_handler_add(self)
+        self.timer = context.window_manager.event_timer_add(0.001, context.window)
         return {"RUNNING_MODAL"}
 
     def modal(self, context, event):
-        currentFrame = self.scene.frame_current
+        if event.type in {"RIGHTMOUSE", "ESC"}:
+            return self.finish(context)
 
         if event.type == "TIMER":
-            self.scene.frame_set(currentFrame + 1)
+            # bake as many frames as possible between two ui updates
+            start = time.perf_counter()
+            while self.frame <= self.endFrame and time.perf_counter() - start < 0.1:
+                self.bakeFrame(self.frame)
+                self.frame += 1
+            context.window_manager.progress_update(self.frame - self.startFrame)
 
-        if event.type in {"RIGHTMOUSE", "ESC"} or self.scene.frame_current == self.endFrame:
-            return self.finish()
+            if self.frame > self.endFrame:
+                return self.finish(context)
 
         return {"RUNNING_MODAL"}
 
-    def finish(self):
-        getPreferences().executionCode.type = "DEFAULT"
-        bpy.context.window_manager.event_timer_remove(self.timer)
+    def bakeFrame(self, frame):
+        self.scene.frame_set(frame)
+        self.recorder.frame = frame
+
+        setupExecutionUnits()
+        for tree in self.nodeTrees:
+            tree._execute()
+        finishExecutionUnits()
+
+    def finish(self, context):
+        # keyframes of frames that have been baked before a cancellation are kept
+        self.recorder.writeKeyframes()
+        self.restoreState(context)
         return {"FINISHED"}
+
+    def cancel(self, context):
+        # e.g. when the file is closed, only the state is restored then
+        self.restoreState(context)
+
+    def restoreState(self, context):
+        stopRecording()
+        setBaking(False)
+
+        context.window_manager.event_timer_remove(self.timer)
+        context.window_manager.progress_end()
+
+        getPreferences().executionCode.type = self.oldExecutionCodeType
+        self.scene.frame_set(self.oldFrame)
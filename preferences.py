@@ -93,12 +93,25 @@ class ExecutionCodeProperties(bpy.types.PropertyGroup):
         ("DEFAULT", "Default", "", "NONE", 0),
         ("MONITOR", "Monitor Execution", "", "NONE", 1),
         ("MEASURE", "Measure Execution Times", "", "NONE", 2),
-        ("BAKE", "Bake", "", "NONE", 3)]
+        ("BAKE", "Bake", "", "NONE", 3),
+        ("PROFILE", "Profile Execution", "", "NONE", 4)]
 
     type = EnumProperty(name = "Execution Code Type", default = "DEFAULT",
         description = "Different execution codes can be useful in different contexts",
         update = settingChanged, items = executionCodeTypeItems)
 
+    memoizeNodes = BoolProperty(name = "Memoize Nodes", default = False,
+        description = "Skip pure nodes in main networks when their inputs did not change since the last execution",
+        update = settingChanged)
+
+    parallelExecution = BoolProperty(name = "Parallel Execution", default = False,
+        description = "Execute independent pure nodes of main networks on multiple threads (only in the default execution code)",
+        update = settingChanged)
+
+    inlineGroupNodeLimit = IntProperty(name = "Inline Group Node Limit", default = 10, min = 0,
+        description = "Groups with at most this many nodes are inlined into the invoking code (0 disables inlining)",
+        update = settingChanged)
+
 class AddonPreferences(bpy.types.AddonPreferences):
     bl_idname = addonName
 
@@ -108,6 +121,22 @@ class AddonPreferences(bpy.types.AddonPreferences):
     sceneUpdateAfterAutoExecution = BoolProperty(
         name = "Scene Update After Auto Execution", default = True)
 
+    autoExecutionTimeBudget = FloatProperty(name = "Auto Execution Time Budget", default = 0.0, min = 0.0, soft_max = 0.2,
+        description = ("Maximum time in seconds that auto execution can use per update. "
+                       "Trees without high priority are deferred when it is exceeded (0 = no budget)"))
+
+    autoExecutionIdleTime = FloatProperty(name = "Auto Execution Idle Time", default = 0.5, min = 0.0,
+        description = "Deferred trees are executed when nothing but scene updates happened for this time (in seconds)")
+
+    eventDebounceTime = FloatProperty(name = "Event Debounce Time", default = 0.1, min = 0,
+        description = "Tree changes that happen within this time (in seconds) are handled together")
+
+    propertyUpdateInterval = FloatProperty(name = "Property Update Interval", default = 0.5, min = 0,
+        description = "Time (in seconds) between two updates of socket properties and custom triggers")
+
+    subprogramCacheMemoryLimit = IntProperty(name = "Subprogram Cache Memory Limit", default = 512, min = 1,
+        description = "Maximum memory (in MB) used by all Invoke Subprogram caches together")
+
     nodeColors = PointerProperty(type = NodeColorProperties)
     developer = PointerProperty(type = DeveloperProperties)
     executionCode = PointerProperty(type = ExecutionCodeProperties)
@@ -124,6 +153,20 @@ class AddonPreferences(bpy.types.AddonPreferences):
         subcol.prop(self, "redrawAllAfterAutoExecution", text = "Redraw All")
         subcol.prop(self, "sceneUpdateAfterAutoExecution", text = "Scene Update")
 
+        subcol = col.column(align = True)
+        subcol.label("Auto Execution Budget:")
+        subcol.prop(self, "autoExecutionTimeBudget", text = "Time Budget")
+        subcol.prop(self, "autoExecutionIdleTime", text = "Idle Time")
+
+        subcol = col.column(align = True)
+        subcol.label("Events:")
+        subcol.prop(self, "eventDebounceTime", text = "Debounce Time")
+        subcol.prop(self, "propertyUpdateInterval", text = "Property Update Interval")
+
+        subcol = col.column(align = True)
+        subcol.label("Subprogram Cache:")
+        subcol.prop(self, "subprogramCacheMemoryLimit", text = "Memory Limit (MB)")
+
         col = row.column()
 
         subcol = col.column(align = True)
@@ -148,6 +191,13 @@ def getExecutionCodeSettings():
 def getExecutionCodeType():
     return getExecutionCodeSettings().type
 
+def nodeMemoizationIsEnabled():
+    return getExecutionCodeSettings().memoizeNodes
+
+def parallelExecutionIsEnabled():
+    settings = getExecutionCodeSettings()
+    return settings.parallelExecution and settings.type == "DEFAULT"
+
 def getColorSettings():
     return getPreferences().nodeColors
 
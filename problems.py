@@ -293,3 +293,8 @@ class NodeRaisesExceptionDuringExecution(Problem):
 
 class ExecutionUnitNotSetup(Exception):
     pass
+
+class NodeLinkCycle(Exception):
+    def __init__(self, nodeIDs):
+        self.nodeIDs = nodeIDs
+        super().__init__("Cycle in the node links, affected nodes: " + ", ".join(repr(nodeID[1]) for nodeID in nodeIDs))
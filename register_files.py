@@ -12,6 +12,7 @@ from . base_types import node as node_base
 from . nodes.sound import bake as sound_bake
 from . base_types import socket as socket_base
 from . ui.node_menu import registerMenu, unregisterMenu
+from . execution.parallel import shutdownExecutor
 
 def registerFiles():
     id_keys.register()
@@ -44,3 +45,4 @@ def unregisterFiles():
 
     unregisterMenu()
     keymap.unregister()
+    shutdownExecutor()
@@ -17,6 +17,7 @@ class FloatSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     drawColor = (0.4, 0.4, 0.7, 1)
     comparable = True
     storable = True
+    persistentValue = True
 
     value = FloatProperty(default = 0.0,
         set = setValue, get = getValue,
@@ -80,7 +81,7 @@ class FloatListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     allowedInputTypes = ["Float List", "Integer List"]
     drawColor = (0.4, 0.4, 0.7, 0.5)
     storable = True
-    comparable = False
+    comparable = True
 
     @classmethod
     def getDefaultValue(cls):
@@ -94,6 +95,10 @@ class FloatListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     def getCopyExpression(cls):
         return "value[:]"
 
+    @classmethod
+    def estimateValueSize(cls, value):
+        return sys.getsizeof(value) + len(value) * sys.getsizeof(0.0)
+
     @classmethod
     def correctValue(cls, value):
         if isinstance(value, list):
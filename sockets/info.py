@@ -22,6 +22,7 @@ class SocketInfo:
         self.listDataTypes = set()
 
         self.copyFunctionByType = dict()
+        self.allowedInputTypes = dict()
 
     def update(self, socketClasses):
         self.reset()
@@ -48,6 +49,8 @@ class SocketInfo:
         self.typeConversion[idName] = dataType
         self.typeConversion[dataType] = idName
 
+        self.allowedInputTypes[dataType] = tuple(socketClass.allowedInputTypes)
+
         if socketClass.isCopyable():
             copyFunction = eval("lambda value: " + socketClass.getCopyExpression())
         else:
@@ -148,6 +151,9 @@ def getCopyExpression(input):
 def getCopyFunction(input):
     return _socketInfo.copyFunctionByType[input]
 
+def getAllowedInputTypes(dataType):
+    return _socketInfo.allowedInputTypes[dataType]
+
 
 def getListDataTypeItemsCallback(self, context):
     return getListDataTypeItems()
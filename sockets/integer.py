@@ -1,4 +1,5 @@
 import bpy
+import sys
 from bpy.props import *
 from .. events import propertyChanged
 from .. base_types.socket import AnimationNodeSocket
@@ -16,6 +17,7 @@ class IntegerSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     drawColor = (0.3, 0.4, 1.0, 1.0)
     comparable = True
     storable = True
+    persistentValue = True
 
     value = IntProperty(default = 0,
         set = setValue, get = getValue,
@@ -70,7 +72,7 @@ class IntegerListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     allowedInputTypes = ["Integer List"]
     drawColor = (0.3, 0.4, 1.0, 0.5)
     storable = True
-    comparable = False
+    comparable = True
 
     @classmethod
     def getDefaultValue(cls):
@@ -84,6 +86,11 @@ class IntegerListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     def getCopyExpression(cls):
         return "value[:]"
 
+    @classmethod
+    def estimateValueSize(cls, value):
+        # large integers are stored in bigger objects, but they are rare
+        return sys.getsizeof(value) + len(value) * sys.getsizeof(2 ** 30)
+
     @classmethod
     def correctValue(cls, value):
         if isinstance(value, list):
@@ -1,6 +1,6 @@
 import bpy
 from mathutils import Vector
-from .. data_structures.mesh import Polygon
+from .. data_structures.mesh import Polygon, PolygonArray
 from .. base_types.socket import AnimationNodeSocket
 
 class PolygonSocket(bpy.types.NodeSocket, AnimationNodeSocket):
@@ -59,3 +59,27 @@ class PolygonListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
             if all(isinstance(element, Polygon) for element in value):
                 return value, 0
         return cls.getDefaultValue(), 2
+
+
+class PolygonArraySocket(bpy.types.NodeSocket, AnimationNodeSocket):
+    bl_idname = "an_PolygonArraySocket"
+    bl_label = "Polygon Array Socket"
+    dataType = "Polygon Array"
+    allowedInputTypes = ["Polygon Array"]
+    drawColor = (0.4, 0.7, 0.3, 0.8)
+    storable = True
+    comparable = False
+
+    @classmethod
+    def getDefaultValue(cls):
+        return PolygonArray.empty()
+
+    @classmethod
+    def getCopyExpression(cls):
+        return "value.copy()"
+
+    @classmethod
+    def correctValue(cls, value):
+        if isinstance(value, PolygonArray):
+            return value, 0
+        return cls.getDefaultValue(), 2
@@ -12,6 +12,7 @@ class StringSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     drawColor = (1, 1, 1, 1)
     comparable = True
     storable = True
+    persistentValue = True
 
     value = StringProperty(default = "", update = propertyChanged, options = {"TEXTEDIT_UPDATE"})
 
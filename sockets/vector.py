@@ -1,4 +1,5 @@
 import bpy
+import sys
 from bpy.props import *
 from mathutils import Vector
 from .. events import propertyChanged
@@ -56,7 +57,7 @@ class VectorListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     allowedInputTypes = ["Vector List"]
     drawColor = (0.15, 0.15, 0.8, 0.5)
     storable = True
-    comparable = False
+    comparable = True
 
     @classmethod
     def getDefaultValue(cls):
@@ -70,6 +71,13 @@ class VectorListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     def getCopyExpression(cls):
         return "[element.copy() for element in value]"
 
+    @classmethod
+    def estimateValueSize(cls, value):
+        if len(value) == 0: return sys.getsizeof(value)
+        # the coordinates are stored outside of the vector object
+        vectorSize = sys.getsizeof(value[0]) + len(value[0]) * 4
+        return sys.getsizeof(value) + len(value) * vectorSize
+
     @classmethod
     def correctValue(cls, value):
         if isinstance(value, list):
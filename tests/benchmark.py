@@ -0,0 +1,205 @@
+'''
+Measures the hot paths of the execution engine on synthetic node trees.
+
+The benchmark runs inside Blender, so no stand-ins for bpy or mathutils
+are needed. It works in background mode on a normal Linux machine:
+
+    blender -b -noaudio --python-expr "import bpy; \
+        bpy.ops.wm.addon_enable(module = 'animation_nodes'); \
+        bpy.ops.an.run_benchmark(path = '/tmp/an_benchmark.json', size = 500)"
+
+The results are written as JSON to the given path.
+
+To guard against regressions, a baseline file can be given. When it does
+not exist yet, the results are stored as the new baseline. Otherwise the
+medians are compared with it and the operator fails when one of them got
+slower than the tolerance in percent allows. Use --python-exit-code 1 so
+that a failed comparison also fails the CI job:
+
+    blender -b -noaudio --python-exit-code 1 --python-expr "import bpy; \
+        bpy.ops.wm.addon_enable(module = 'animation_nodes'); \
+        bpy.ops.an.run_benchmark(path = '/tmp/an_benchmark.json', size = 500, \
+            baselinePath = '/ci/an_benchmark_baseline.json', tolerance = 25)"
+'''
+
+import os
+import bpy
+import json
+import platform
+from time import perf_counter
+from .. import tree_info
+from .. update import updateEverything
+from .. utils.nodes import createNodeByIdDict
+from .. utils.operators import makeOperator
+from .. preferences import getExecutionCodeType
+from .. execution import units, compile_scripts
+
+shapes = ("CHAIN", "FAN", "LAYERS")
+
+# differences below this are measurement noise
+minimalRegression = 0.001
+
+@makeOperator("an.run_benchmark", "Run Benchmark", arguments = ["String", "Int", "Int", "String", "Int"])
+def runBenchmark(path = "//an_benchmark.json", size = 200, repetitions = 20, baselinePath = "", tolerance = 25):
+    results = {
+        "blenderVersion" : list(bpy.app.version),
+        "pythonVersion" : platform.python_version(),
+        "executionCodeType" : getExecutionCodeType(),
+        "size" : size,
+        "repetitions" : repetitions,
+        "benchmarks" : [benchmarkShape(shape, size, repetitions) for shape in shapes] }
+
+    path = bpy.path.abspath(path)
+    with open(path, "w") as f:
+        json.dump(results, f, indent = 2)
+    print("Saved benchmark results to: {}".format(path))
+
+    if baselinePath != "":
+        checkBaseline(results, bpy.path.abspath(baselinePath), tolerance)
+
+def benchmarkShape(shape, size, repetitions):
+    tree = bpy.data.node_groups.new("Benchmark " + shape, "an_AnimationNodeTree")
+    try:
+        createSyntheticNodes(tree, shape, size)
+        return {"shape" : shape, "nodeAmount" : len(tree.nodes),
+                "timings" : measureTree(tree, repetitions)}
+    finally:
+        bpy.data.node_groups.remove(tree)
+        updateEverything()
+
+def measureTree(tree, repetitions):
+    timings = {}
+
+    start = perf_counter()
+    tree_info.update()
+    timings["treeAnalysis"] = perf_counter() - start
+
+    nodeByID = createNodeByIdDict()
+    compile_scripts.memoryCache.clear()
+    start = perf_counter()
+    units.createExecutionUnits(nodeByID)
+    timings["codeGeneration"] = perf_counter() - start
+
+    codes = [code for unit in units.getExecutionUnits() for code in unit.getCodes()]
+    start = perf_counter()
+    for code in codes:
+        compile(code, "<benchmark>", "exec")
+    timings["compilation"] = perf_counter() - start
+
+    start = perf_counter()
+    units.setupExecutionUnits()
+    timings["setup"] = perf_counter() - start
+
+    reloadTimes, executionTimes = [], []
+    for i in range(repetitions):
+        start = perf_counter()
+        units.setupExecutionUnits()
+        reloadTimes.append(perf_counter() - start)
+
+        start = perf_counter()
+        tree._execute()
+        executionTimes.append(perf_counter() - start)
+
+    timings["reload"] = summarize(reloadTimes)
+    timings["execution"] = summarize(executionTimes)
+    units.tearDownExecutionUnits()
+    nodeByID.clear()
+    return timings
+
+def summarize(times):
+    if len(times) == 0: return {}
+    times = sorted(times)
+    return {"min" : times[0],
+            "median" : times[len(times) // 2],
+            "max" : times[-1],
+            "total" : sum(times)}
+
+
+# Baseline
+##########################################
+
+def checkBaseline(results, path, tolerance):
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump(results, f, indent = 2)
+        print("Saved new benchmark baseline to: {}".format(path))
+        return
+
+    with open(path, "r") as f:
+        baseline = json.load(f)
+    if baseline["size"] != results["size"]:
+        raise Exception("The baseline was measured with a different size")
+
+    regressions = list(findRegressions(baseline, results, tolerance))
+    for regression in regressions:
+        print("Regression in {} {}: {:.6f}s -> {:.6f}s".format(*regression))
+    if len(regressions) > 0:
+        raise Exception("{} benchmark timings are more than {}% slower than the baseline".format(
+            len(regressions), tolerance))
+    print("No benchmark regressions compared to: {}".format(path))
+
+def findRegressions(baseline, results, tolerance):
+    baselineByShape = {benchmark["shape"] : benchmark for benchmark in baseline["benchmarks"]}
+    for benchmark in results["benchmarks"]:
+        if benchmark["shape"] not in baselineByShape: continue
+        oldTimings = getComparableTimings(baselineByShape[benchmark["shape"]]["timings"])
+        newTimings = getComparableTimings(benchmark["timings"])
+        for name, newTime in newTimings.items():
+            oldTime = oldTimings.get(name)
+            if oldTime is None: continue
+            if newTime - oldTime > max(oldTime * tolerance / 100, minimalRegression):
+                yield benchmark["shape"], name, oldTime, newTime
+
+def getComparableTimings(timings):
+    '''Repeated timings are compared by their median'''
+    return {name : value["median"] if isinstance(value, dict) else value
+            for name, value in timings.items() if not isinstance(value, dict) or "median" in value}
+
+
+# Synthetic Trees
+##########################################
+
+def createSyntheticNodes(tree, shape, size):
+    '''The time info node makes sure that nothing can be folded'''
+    timeInfo = tree.nodes.new("an_TimeInfoNode")
+    if shape == "CHAIN":
+        createChain(tree, timeInfo.outputs[0], size)
+    elif shape == "FAN":
+        createFan(tree, timeInfo.outputs[0], size)
+    elif shape == "LAYERS":
+        createLayers(tree, timeInfo.outputs[0], size)
+
+def createChain(tree, source, size):
+    for i in range(size):
+        node = newMathNode(tree, "ADD")
+        tree.links.new(node.inputs[0], source)
+        source = node.outputs[0]
+    newDebugNode(tree, source)
+
+def createFan(tree, source, size):
+    for i in range(size):
+        node = tree.nodes.new("an_CombineVectorNode")
+        tree.links.new(node.inputs[0], source)
+        newDebugNode(tree, node.outputs[0])
+
+def createLayers(tree, source, size):
+    width = max(int(size ** 0.5), 1)
+    sources = [source] * width
+    for i in range(max(size // width, 1)):
+        nodes = [newMathNode(tree, "MULTIPLY") for _ in range(width)]
+        for j, node in enumerate(nodes):
+            tree.links.new(node.inputs[0], sources[j])
+            tree.links.new(node.inputs[1], sources[(j + 1) % width])
+        sources = [node.outputs[0] for node in nodes]
+    for socket in sources:
+        newDebugNode(tree, socket)
+
+def newMathNode(tree, operation):
+    node = tree.nodes.new("an_FloatMathNode")
+    node.operation = operation
+    return node
+
+def newDebugNode(tree, socket):
+    node = tree.nodes.new("an_DebugNode")
+    tree.links.new(node.inputs[0], socket)
+    return node
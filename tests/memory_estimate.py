@@ -0,0 +1,67 @@
+'''
+Checks that the memory estimates of large data structures, which limit
+the frame and subprogram caches, are in the right order of magnitude.
+
+The test runs inside Blender and fails with an exception:
+
+    blender -b -noaudio --python-exit-code 1 --python-expr "import bpy; \
+        bpy.ops.wm.addon_enable(module = 'animation_nodes'); \
+        bpy.ops.an.test_memory_estimate(size = 100000)"
+'''
+
+import numpy
+import tracemalloc
+from mathutils import Vector
+from .. utils.memory import estimateSize
+from .. utils.operators import makeOperator
+from .. data_structures.mesh import MeshData, PolygonArray, Polygon
+
+# the estimate has to be closer to the real size than this factor
+tolerance = 3
+
+@makeOperator("an.test_memory_estimate", "Test Memory Estimate", arguments = ["Int"])
+def testMemoryEstimate(size = 100000):
+    checkEstimate("Mesh Data Arrays", *measureAllocation(lambda: createMeshDataFromArrays(size)))
+    checkEstimate("Mesh Data Lists", *measureAllocation(lambda: createMeshDataFromLists(size)))
+    checkEstimate("Polygon Array", *measureAllocation(lambda: createPolygonArray(size)))
+    checkEstimate("Mesh Data List", *measureAllocation(lambda: [createMeshDataFromLists(size // 100) for _ in range(100)]))
+    print("All memory estimates are within a factor of {}".format(tolerance))
+
+def measureAllocation(createValue):
+    tracemalloc.start()
+    try:
+        value = createValue()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+def checkEstimate(name, value, realSize):
+    estimatedSize = estimateSize(value)
+    print("{}: estimated {} bytes, allocated {} bytes".format(name, estimatedSize, realSize))
+    if not realSize / tolerance <= estimatedSize <= realSize * tolerance:
+        raise Exception("The memory estimate of {} is wrong: {} instead of about {} bytes".format(
+            name, estimatedSize, realSize))
+
+
+# Test Data
+##########################################
+
+def createMeshDataFromArrays(size):
+    return MeshData.fromArrays(
+        numpy.random.random((size, 3)),
+        numpy.arange(size * 2).reshape((size, 2)) % size,
+        numpy.arange(size * 4) % size,
+        numpy.arange(size) * 4,
+        numpy.full(size, 4))
+
+def createMeshDataFromLists(size):
+    vertices = [Vector((i, i * 2, i * 3)) for i in range(size)]
+    edges = [(i, (i + 1) % size) for i in range(size)]
+    polygons = [tuple((i + j) % size for j in range(4)) for i in range(size)]
+    return MeshData(vertices, edges, polygons)
+
+def createPolygonArray(size):
+    polygons = [Polygon([Vector((i, 0, 0)), Vector((i, 1, 0)), Vector((i, 1, 1))],
+                        Vector((1, 0, 0)), Vector((i, 0.7, 0.3)), 0.5, 0) for i in range(size)]
+    return PolygonArray.fromPolygons(polygons)
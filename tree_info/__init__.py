@@ -6,12 +6,20 @@ from .. utils.nodes import idToNode, idToSocket, createNodeByIdDict
 def __setup():
     from . forest_data import ForestData
     from . networks import NodeNetworks
+    from . forest_graph import ForestGraph
 
-    global _needsUpdate, _forestData, _networks
+    global _needsUpdate, _needsFullUpdate, _changedTrees, _forestData, _networks, _graph, _updateCounters
+    global _allLinksChanged, _nodesWithChangedLinks
 
+    _updateCounters = {"Full Updates" : 0, "Incremental Updates" : 0}
     _needsUpdate = True
+    _needsFullUpdate = True
+    _changedTrees = set()
+    _allLinksChanged = True
+    _nodesWithChangedLinks = set()
     _forestData = ForestData()
     _networks = NodeNetworks()
+    _graph = ForestGraph()
 
 
 def updateAndRetryOnException(function):
@@ -31,23 +39,108 @@ def updateAndRetryOnException(function):
 @eventHandler("FILE_LOAD_POST")
 @measureTime
 def update():
+    global _allLinksChanged
+    _updateCounters["Full Updates"] += 1
+    _allLinksChanged = True
     _forestData.update()
+    rebuildGraph()
+    updateNetworks(changedTrees = None)
 
+@measureTime
+def updateChangedTrees():
+    _updateCounters["Incremental Updates"] += 1
+    treeNames = set(_changedTrees)
+    _forestData.updateTrees(treeNames)
+    # properties of nodes can change the networks without changing the forest data
+    changedTrees = treeNames | {nodeID[0] for nodeID in _forestData.changedNodes}
+    _nodesWithChangedLinks.update(_forestData.changedNodes)
+    updateGraph()
+    updateNetworks(changedTrees)
+
+    from .. preferences import debuggingIsEnabled
+    if debuggingIsEnabled():
+        checkConsistency()
+
+def rebuildGraph():
+    from . forest_graph import ForestGraph
+    global _graph
+    _graph = ForestGraph.fromForestData(_forestData)
+
+def updateGraph():
+    try: _graph.updateNodes(_forestData, _forestData.changedNodes)
+    except KeyError:
+        print("Incremental update of the tree info graph failed")
+        rebuildGraph()
+        return
+    if _graph.hasManyUnusedIndices():
+        rebuildGraph()
+
+def updateNetworks(changedTrees):
     nodeByID = createNodeByIdDict()
-    _networks.update(_forestData, nodeByID)
+    _networks.update(_forestData, nodeByID, changedTrees)
     nodeByID.clear()
 
-    global _needsUpdate
+    global _needsUpdate, _needsFullUpdate
     _needsUpdate = False
+    _needsFullUpdate = False
+    _changedTrees.clear()
 
 def updateIfNecessary():
-    if _needsUpdate:
+    if _needsFullUpdate:
         update()
+    elif _needsUpdate:
+        updateChangedTrees()
+
+def treeChanged(treeName = None):
+    '''
+    Only the data of the given tree is updated next time.
+    Without a tree name everything will be recalculated.
+    '''
+    global _needsUpdate, _needsFullUpdate
+    _needsUpdate = True
+    if treeName is None:
+        _needsFullUpdate = True
+    else:
+        _changedTrees.add(treeName)
 
-def treeChanged():
+def namesChanged():
+    '''Trees with renamed nodes are found by their signature'''
     global _needsUpdate
     _needsUpdate = True
 
+def allTreesChanged():
+    '''The differences of all trees are applied, but the data is not rebuilt'''
+    global _needsUpdate
+    _needsUpdate = True
+    _changedTrees.update(_forestData.nodesByTree.keys())
+
+def getUpdateCounters():
+    return dict(_updateCounters, **{"Reused Node Orders" : _networks.reusedOrderAmount})
+
+@eventHandler("UNDO_POST")
+def undoPerformed():
+    treeChanged()
+
+def checkConsistency():
+    from . forest_data import ForestData
+    from . forest_graph import ForestGraph
+    expectedData = ForestData()
+    expectedData.update()
+    differences = _forestData.findDifferences(expectedData)
+    if graphDiffers(_graph, ForestGraph.fromForestData(expectedData)):
+        differences.append("graph")
+    if any(not _networks.isOrderValid(network.sortedAnimationNodeIDs, network.nodeIDs)
+           for network in _networks.networks if network.sortedAnimationNodeIDs is not None):
+        differences.append("node order")
+    if len(differences) > 0:
+        print("Incremental tree info update is inconsistent in: " + ", ".join(differences))
+        update()
+
+
+def graphDiffers(graph, expectedGraph):
+    if graph.indexBySocket.keys() != expectedGraph.indexBySocket.keys(): return True
+    return any(set(graph.getLinkedSocketIDs(socketID)) != set(expectedGraph.getLinkedSocketIDs(socketID))
+               for socketID in expectedGraph.indexBySocket)
 
 
 def getNodeByIdentifier(identifier):
@@ -59,29 +152,45 @@ def getIdentifierAmount():
 @updateAndRetryOnException
 def getNodesByType(idName, nodeByID = None):
     if nodeByID is None:
-        return [idToNode(nodeID) for nodeID in _forestData.nodesByType[idName]]
+        return [idToNode(nodeID) for nodeID in _graph.getNodeIDsByType(idName)]
     else:
-        return [nodeByID[nodeID] for nodeID in _forestData.nodesByType[idName]]
+        return [nodeByID[nodeID] for nodeID in _graph.getNodeIDsByType(idName)]
 
 
 def isSocketLinked(socket, node):
     socketID = ((node.id_data.name, node.name), socket.is_output, socket.identifier)
-    return len(_forestData.linkedSockets[socketID]) > 0
+    return _graph.getLinkAmount(_graph.getSocketIndex(socketID)) > 0
+
+def getLinkedSocketIDs(socket, node):
+    '''The returned tuple must not be changed'''
+    socketID = ((node.id_data.name, node.name), socket.is_output, socket.identifier)
+    return _graph.getLinkedSocketIDs(socketID)
+
+def iterInputsWithLinkedIDs(node):
+    '''Faster than getLinkedSocketIDs for every input, because the node is looked up only once'''
+    return iterSocketsWithLinkedIDs(node, node.inputs, _graph.getInputIndices)
+
+def iterOutputsWithLinkedIDs(node):
+    return iterSocketsWithLinkedIDs(node, node.outputs, _graph.getOutputIndices)
+
+def iterSocketsWithLinkedIDs(node, sockets, getSocketIndices):
+    nodeIndex = _graph.getNodeIndex(node.toID())
+    if nodeIndex == -1:
+        return ((socket, ()) for socket in sockets)
+    linkedSocketIDs = _graph.linkedSocketIDs
+    return ((socket, linkedSocketIDs[index]) for socket, index in zip(sockets, getSocketIndices(nodeIndex)))
 
 def getDirectlyLinkedSockets(socket):
-    socketID = socket.toID()
-    linkedIDs = _forestData.linkedSocketsWithReroutes[socketID]
+    linkedIDs = _graph.getDirectlyLinkedSocketIDs(socket.toID())
     return [idToSocket(linkedID) for linkedID in linkedIDs]
 
 def getDirectlyLinkedSocket(socket):
-    socketID = socket.toID()
-    linkedSocketIDs = _forestData.linkedSocketsWithReroutes[socketID]
+    linkedSocketIDs = _graph.getDirectlyLinkedSocketIDs(socket.toID())
     if len(linkedSocketIDs) > 0:
         return idToSocket(linkedSocketIDs[0])
 
 def getLinkedSockets(socket):
-    socketID = socket.toID()
-    linkedIDs = _forestData.linkedSockets[socketID]
+    linkedIDs = _graph.getLinkedSocketIDs(socket.toID())
     return [idToSocket(linkedID) for linkedID in linkedIDs]
 
 def iterSocketsThatNeedUpdate():
@@ -89,11 +198,11 @@ def iterSocketsThatNeedUpdate():
         yield idToSocket(socketID)
 
 def getUndefinedNodes(nodeByID):
-    return [nodeByID[nodeID] for nodeID in _forestData.nodesByType["NodeUndefined"]]
+    return [nodeByID[nodeID] for nodeID in _graph.getNodeIDsByType("NodeUndefined")]
 
 def iterLinkedSocketsWithInfo(socket, node, nodeByID):
     socketID = ((node.id_data.name, node.name), socket.is_output, socket.identifier)
-    linkedIDs = _forestData.linkedSockets[socketID]
+    linkedIDs = _graph.getLinkedSocketIDs(socketID)
     for linkedID in linkedIDs:
         linkedIdentifier = linkedID[2]
         linkedNode = nodeByID[linkedID[0]]
@@ -106,46 +215,74 @@ def iterLinkedSocketsWithInfo(socket, node, nodeByID):
 # improve performance of higher level functions
 
 def getOriginNodes(node):
-    nodeID = node.toID()
-    linkedNodeIDs = set()
-    for socketID in _forestData.socketsByNode[nodeID][0]:
-        for linkedSocketID in _forestData.linkedSockets[socketID]:
-            linkedNodeIDs.add(linkedSocketID[0])
-    return [idToNode(nodeID) for nodeID in linkedNodeIDs]
+    nodeIndex = _graph.getNodeIndex(node.toID())
+    if nodeIndex == -1: return []
+    linkedNodeIndices = set()
+    for socketIndex in _graph.getInputIndices(nodeIndex):
+        for linkedIndex in _graph.iterLinkedIndices(socketIndex):
+            linkedNodeIndices.add(_graph.nodeBySocket[linkedIndex])
+    return [idToNode(_graph.nodeIDs[index]) for index in linkedNodeIndices]
 
 def getAllDataLinkIDs():
-    linkDataIDs = set()
-    dataType = _forestData.dataTypeBySocket
-    for socketID, linkedIDs in _forestData.linkedSockets.items():
-        for linkedID in linkedIDs:
-            if socketID[1]: # check which one is origin/target
-                linkDataIDs.add((socketID, linkedID, dataType[socketID], dataType[linkedID]))
-            else:
-                linkDataIDs.add((linkedID, socketID, dataType[linkedID], dataType[socketID]))
-    return linkDataIDs
+    socketIDs = _graph.socketIDs
+    dataTypes = _graph.dataTypes
+    return {(socketIDs[origin], socketIDs[target], dataTypes[origin], dataTypes[target])
+            for origin, target in _graph.iterLinks()}
+
+def getChangedDataLinkIDs():
+    '''
+    Returns the data links that can be new or have a different type since the last call.
+    These are the links of the nodes that changed in the updates in between.
+    '''
+    global _allLinksChanged
+    if _allLinksChanged:
+        links = getAllDataLinkIDs()
+    else:
+        links = set(iterDataLinkIDsOfNodes(_nodesWithChangedLinks))
+    _allLinksChanged = False
+    _nodesWithChangedLinks.clear()
+    return links
+
+def iterDataLinkIDsOfNodes(nodeIDs):
+    socketIDs = _graph.socketIDs
+    dataTypes = _graph.dataTypes
+    linkedSockets = _graph.linkedSockets
+    for nodeID in nodeIDs:
+        nodeIndex = _graph.getNodeIndex(nodeID)
+        if nodeIndex == -1: continue
+        for target in _graph.getInputIndices(nodeIndex):
+            for origin in linkedSockets[target]:
+                yield (socketIDs[origin], socketIDs[target], dataTypes[origin], dataTypes[target])
+        for origin in _graph.getOutputIndices(nodeIndex):
+            for target in linkedSockets[origin]:
+                yield (socketIDs[origin], socketIDs[target], dataTypes[origin], dataTypes[target])
 
 def getLinkedInputsDict(node):
-    linkedSockets = _forestData.linkedSockets
-    socketIDs = _forestData.socketsByNode[node.toID()][0]
-    return {socketID[2] : len(linkedSockets[socketID]) > 0 for socketID in socketIDs}
+    return getLinkedSocketsDict(node, _graph.getInputIndices)
 
 def getLinkedOutputsDict(node):
-    linkedSockets = _forestData.linkedSockets
-    socketIDs = _forestData.socketsByNode[node.toID()][1]
-    return {socketID[2] : len(linkedSockets[socketID]) > 0 for socketID in socketIDs}
+    return getLinkedSocketsDict(node, _graph.getOutputIndices)
+
+def getLinkedSocketsDict(node, getSocketIndices):
+    nodeIndex = _graph.getNodeIndex(node.toID())
+    if nodeIndex == -1: return {}
+    socketIDs = _graph.socketIDs
+    linkedSockets = _graph.linkedSockets
+    return {socketIDs[index][2] : len(linkedSockets[index]) > 0
+            for index in getSocketIndices(nodeIndex)}
 
 def iterLinkedOutputSockets(node):
-    linkedSockets = _forestData.linkedSockets
-    socketIDs = _forestData.socketsByNode[node.toID()][1]
-    for socket, socketID in zip(node.outputs, socketIDs):
-        if len(linkedSockets[socketID]) > 0:
+    nodeIndex = _graph.getNodeIndex(node.toID())
+    if nodeIndex == -1: return
+    for socket, socketIndex in zip(node.outputs, _graph.getOutputIndices(nodeIndex)):
+        if _graph.getLinkAmount(socketIndex) > 0:
             yield socket
 
 def iterUnlinkedInputSockets(node):
-    linkedSockets = _forestData.linkedSockets
-    socketIDs = _forestData.socketsByNode[node.toID()][0]
-    for socket, socketID in zip(node.inputs, socketIDs):
-        if len(linkedSockets[socketID]) == 0:
+    nodeIndex = _graph.getNodeIndex(node.toID())
+    if nodeIndex == -1: return
+    for socket, socketIndex in zip(node.inputs, _graph.getInputIndices(nodeIndex)):
+        if _graph.getLinkAmount(socketIndex) == 0:
             yield socket
 
 
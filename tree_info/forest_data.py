@@ -1,3 +1,4 @@
+import bpy
 from itertools import chain
 from collections import defaultdict
 from .. utils.nodes import getAnimationNodeTrees, iterAnimationNodesSockets
@@ -22,73 +23,76 @@ class ForestData:
         self.dataTypeBySocket = dict()
         self.socketsThatNeedUpdate = set()
 
+        # used to find the differences when only some trees changed
+        self.nodesByTree = defaultdict(list)
+        self.linksByTree = defaultdict(set)
+        self.signatureByNode = dict()
+        self.signatureByTree = dict()
+        self.rerouteNodes = self.nodesByType["NodeReroute"]
+
+        # nodes whose sockets or links changed in the last update
+        self.changedNodes = set()
+
     def update(self):
         self._reset()
         self.insertNodeTrees()
-        self.rerouteNodes = self.nodesByType["NodeReroute"]
         self.findLinksSkippingReroutes()
 
     def insertNodeTrees(self):
         for tree in getAnimationNodeTrees():
             self.insertNodes(tree.nodes, tree.name)
             self.insertLinks(tree.links, tree.name)
+            self.signatureByTree[tree.name] = getTreeSignature(tree)
+        self.nodes = list(chain.from_iterable(self.nodesByTree.values()))
 
     def insertNodes(self, nodes, treeName):
-        appendNode = self.nodes.append
-        nodesByType = self.nodesByType
-        typeByNode = self.typeByNode
-        nodeByIdentifier = self.nodeByIdentifier
-        socketsByNode = self.socketsByNode
-        reroutePairs = self.reroutePairs
-        dataTypeBySocket = self.dataTypeBySocket
-        animationNodes = self.animationNodes
-        socketsThatNeedUpdate = self.socketsThatNeedUpdate
-
         for node in nodes:
             nodeID = (treeName, node.name)
+            self.nodesByTree[treeName].append(nodeID)
+            self.insertNode(node, nodeID)
 
-            inputIDs = [(nodeID, False, socket.identifier) for socket in node.inputs]
-            outputIDs = [(nodeID, True, socket.identifier) for socket in node.outputs]
-
-            appendNode(nodeID)
-            typeByNode[nodeID] = node.bl_idname
-            nodesByType[node.bl_idname].add(nodeID)
+    def insertNode(self, node, nodeID):
+        inputIDs = [(nodeID, False, socket.identifier) for socket in node.inputs]
+        outputIDs = [(nodeID, True, socket.identifier) for socket in node.outputs]
 
-            socketsByNode[nodeID] = (inputIDs, outputIDs)
+        self.typeByNode[nodeID] = node.bl_idname
+        self.nodesByType[node.bl_idname].add(nodeID)
+        self.signatureByNode[nodeID] = getNodeSignature(node)
 
-            if node.bl_idname == "NodeReroute":
-                reroutePairs[inputIDs[0]] = outputIDs[0]
-                reroutePairs[outputIDs[0]] = inputIDs[0]
-            elif node.bl_idname == "NodeFrame":
-                pass
-            else:
-                if node.bl_idname != "NodeUndefined":
-                    animationNodes.add(nodeID)
-                    nodeByIdentifier[node.identifier] = nodeID
+        self.socketsByNode[nodeID] = (inputIDs, outputIDs)
 
-                chainedSockets = chain(node.inputs, node.outputs)
-                chainedSocketIDs = chain(inputIDs, outputIDs)
-                for socket, socketID in zip(chainedSockets, chainedSocketIDs):
-                        dataTypeBySocket[socketID] = socket.dataType
-                        if hasattr(socket, "updateProperty"):
-                            socketsThatNeedUpdate.add(socketID)
+        if node.bl_idname == "NodeReroute":
+            self.reroutePairs[inputIDs[0]] = outputIDs[0]
+            self.reroutePairs[outputIDs[0]] = inputIDs[0]
+        elif node.bl_idname == "NodeFrame":
+            pass
+        else:
+            if node.bl_idname != "NodeUndefined":
+                self.animationNodes.add(nodeID)
+                self.nodeByIdentifier[node.identifier] = nodeID
 
+            chainedSockets = chain(node.inputs, node.outputs)
+            chainedSocketIDs = chain(inputIDs, outputIDs)
+            for socket, socketID in zip(chainedSockets, chainedSocketIDs):
+                    self.dataTypeBySocket[socketID] = socket.dataType
+                    if hasattr(socket, "updateProperty"):
+                        self.socketsThatNeedUpdate.add(socketID)
 
     def insertLinks(self, links, treeName):
-        linkedSocketsWithReroutes = self.linkedSocketsWithReroutes
-
         for link in links:
-            originSocket = link.from_socket
-            targetSocket = link.to_socket
-            originID = ((treeName, link.from_node.name), originSocket.is_output, originSocket.identifier)
-            targetID = ((treeName, link.to_node.name), targetSocket.is_output, targetSocket.identifier)
+            self.insertLink(getLinkIDs(link, treeName))
 
-            linkedSocketsWithReroutes[originID].append(targetID)
-            linkedSocketsWithReroutes[targetID].append(originID)
+    def insertLink(self, linkIDs):
+        originID, targetID = linkIDs
+        self.linksByTree[originID[0][0]].add(linkIDs)
+        self.linkedSocketsWithReroutes[originID].append(targetID)
+        self.linkedSocketsWithReroutes[targetID].append(originID)
 
-    def findLinksSkippingReroutes(self):
+    def findLinksSkippingReroutes(self, nodes = None, changedNodes = None):
+        '''Nodes whose linked sockets are different afterwards are added to changedNodes'''
+        if nodes is None: nodes = self.nodes
         rerouteNodes = self.rerouteNodes
-        nonRerouteNodes = filter(lambda n: n not in rerouteNodes, self.nodes)
+        nonRerouteNodes = filter(lambda n: n not in rerouteNodes, nodes)
 
         socketsByNode = self.socketsByNode
         linkedSockets = self.linkedSockets
@@ -97,7 +101,10 @@ class ForestData:
 
         for node in nonRerouteNodes:
             for socket in chainIterable(socketsByNode[node]):
-                linkedSockets[socket] = tuple(iterLinkedSockets(socket, set()))
+                newLinkedSockets = tuple(iterLinkedSockets(socket, set()))
+                if changedNodes is not None and linkedSockets.get(socket, ()) != newLinkedSockets:
+                    changedNodes.add(node)
+                linkedSockets[socket] = newLinkedSockets
 
     def iterLinkedSockets(self, socket, visitedReroutes):
         """If the socket is linked to a reroute node the function
@@ -111,3 +118,142 @@ class ForestData:
                 yield from self.iterLinkedSockets(self.reroutePairs[socket], visitedReroutes)
             else:
                 yield socket
+
+
+    # Incremental Update
+    ##########################################
+
+    def updateTrees(self, treeNames):
+        '''
+        Applies the differences of the given trees to the existing data.
+        Trees whose nodes, links or node names changed without
+        an update of the tree are detected by their signature.
+        '''
+        self.changedNodes = set()
+
+        treeByName = {tree.name : tree for tree in getAnimationNodeTrees()}
+        for treeName, tree in treeByName.items():
+            if self.signatureByTree.get(treeName) != getTreeSignature(tree):
+                treeNames.add(treeName)
+        treeNames.update(set(self.nodesByTree) - set(treeByName))
+
+        for treeName in treeNames:
+            self.updateTree(treeName, treeByName.get(treeName))
+
+        self.nodes = list(chain.from_iterable(self.nodesByTree[tree.name] for tree in treeByName.values()))
+
+    def updateTree(self, treeName, tree):
+        '''
+        Only the links of nodes that changed themselves or whose links changed
+        are searched again. Reroutes can connect any sockets of the tree, so
+        all links of the tree are searched again when a reroute changed.
+        '''
+        oldRerouteNodes = {nodeID for nodeID in self.rerouteNodes if nodeID[0] == treeName}
+
+        if tree is None:
+            self.applyNodeDifferences(treeName, [])
+            self.applyLinkDifferences(treeName, set())
+            self.signatureByTree.pop(treeName, None)
+            self.nodesByTree.pop(treeName, None)
+            self.linksByTree.pop(treeName, None)
+            return
+
+        self.applyNodeDifferences(treeName, tree.nodes)
+        self.applyLinkDifferences(treeName, {getLinkIDs(link, treeName) for link in tree.links})
+        self.signatureByTree[treeName] = getTreeSignature(tree)
+
+        changedNodes = {nodeID for nodeID in self.changedNodes if nodeID[0] == treeName}
+        if changedNodes.isdisjoint(oldRerouteNodes) and changedNodes.isdisjoint(self.rerouteNodes):
+            nodes = [nodeID for nodeID in changedNodes if nodeID in self.socketsByNode]
+        else:
+            nodes = self.nodesByTree[treeName]
+        self.findLinksSkippingReroutes(nodes, self.changedNodes)
+
+    def applyNodeDifferences(self, treeName, nodes):
+        oldNodeIDs = set(self.nodesByTree[treeName])
+        newNodeIDs = set()
+        newNodeOrder = []
+
+        for node in nodes:
+            nodeID = (treeName, node.name)
+            newNodeIDs.add(nodeID)
+            newNodeOrder.append(nodeID)
+            if nodeID in oldNodeIDs:
+                if self.signatureByNode[nodeID] == getNodeSignature(node): continue
+                self.removeNode(nodeID)
+            self.insertNode(node, nodeID)
+            self.changedNodes.add(nodeID)
+
+        for nodeID in oldNodeIDs - newNodeIDs:
+            self.removeNode(nodeID)
+            self.changedNodes.add(nodeID)
+
+        self.nodesByTree[treeName] = newNodeOrder
+
+    def removeNode(self, nodeID):
+        inputIDs, outputIDs = self.socketsByNode.pop(nodeID)
+        nodeType = self.typeByNode.pop(nodeID)
+        self.nodesByType[nodeType].discard(nodeID)
+        self.animationNodes.discard(nodeID)
+
+        identifier = self.signatureByNode.pop(nodeID)[1]
+        if self.nodeByIdentifier.get(identifier) == nodeID:
+            del self.nodeByIdentifier[identifier]
+
+        for socketID in chain(inputIDs, outputIDs):
+            self.dataTypeBySocket.pop(socketID, None)
+            self.socketsThatNeedUpdate.discard(socketID)
+            self.reroutePairs.pop(socketID, None)
+            self.linkedSockets.pop(socketID, None)
+
+    def applyLinkDifferences(self, treeName, newLinks):
+        oldLinks = self.linksByTree[treeName]
+        for originID, targetID in oldLinks - newLinks:
+            self.linkedSocketsWithReroutes[originID].remove(targetID)
+            self.linkedSocketsWithReroutes[targetID].remove(originID)
+            self.changedNodes.update((originID[0], targetID[0]))
+        for linkIDs in newLinks - oldLinks:
+            self.insertLink(linkIDs)
+            self.changedNodes.update((linkIDs[0][0], linkIDs[1][0]))
+        self.linksByTree[treeName] = set(newLinks)
+
+
+    # Consistency Check
+    ##########################################
+
+    def findDifferences(self, other):
+        '''Used to check that incremental updates give the same result as a full update'''
+        differences = []
+        for name in ("nodesByType", "typeByNode", "nodeByIdentifier", "socketsByNode",
+                     "reroutePairs", "dataTypeBySocket"):
+            if withoutEmptySets(getattr(self, name)) != withoutEmptySets(getattr(other, name)):
+                differences.append(name)
+        for name in ("linkedSockets", "linkedSocketsWithReroutes"):
+            if getLinksAsSets(getattr(self, name)) != getLinksAsSets(getattr(other, name)):
+                differences.append(name)
+        for name in ("nodes", "animationNodes", "socketsThatNeedUpdate"):
+            if set(getattr(self, name)) != set(getattr(other, name)):
+                differences.append(name)
+        return differences
+
+def withoutEmptySets(data):
+    return {key : value for key, value in data.items() if value != set()}
+
+def getLinksAsSets(linkedSockets):
+    # the order of links can be different after an incremental update
+    return {socketID : set(linkedIDs) for socketID, linkedIDs in linkedSockets.items() if len(linkedIDs) > 0}
+
+def getNodeSignature(node):
+    return (node.bl_idname, getattr(node, "identifier", None),
+            tuple((socket.identifier, socket.dataType if hasattr(socket, "dataType") else None) for socket in node.inputs),
+            tuple((socket.identifier, socket.dataType if hasattr(socket, "dataType") else None) for socket in node.outputs))
+
+def getTreeSignature(tree):
+    return (len(tree.links), tuple(tree.nodes.keys()))
+
+def getLinkIDs(link, treeName):
+    originSocket = link.from_socket
+    targetSocket = link.to_socket
+    originID = ((treeName, link.from_node.name), originSocket.is_output, originSocket.identifier)
+    targetID = ((treeName, link.to_node.name), targetSocket.is_output, targetSocket.identifier)
+    return originID, targetID
@@ -0,0 +1,164 @@
+from array import array
+from itertools import chain
+from collections import defaultdict
+
+class ForestGraph:
+    '''
+    Integer indexed representation of the forest data that is used by the queries.
+    Every node and socket gets an index that stays the same as long as it exists,
+    so that only the changed nodes have to be updated after a change of the forest.
+    Indices of removed nodes and sockets are not reused, the graph is created
+    again when too many of them exist.
+    The links are stored as tuples of socket indices for every socket.
+    '''
+
+    def __init__(self):
+        self.nodeIDs = []
+        self.indexByNode = {}
+        self.typeByNode = []
+        self.inputIndices = []
+        self.outputIndices = []
+        self.nodesByType = defaultdict(set)
+
+        self.socketIDs = []
+        self.indexBySocket = {}
+        self.nodeBySocket = array("l")
+        self.dataTypes = []
+
+        # linked sockets skipping reroutes, the IDs are the tuples of the forest data
+        self.linkedSockets = []
+        self.linkedSocketIDs = []
+        self.directlyLinkedSockets = []
+
+    @classmethod
+    def fromForestData(cls, forestData):
+        graph = cls()
+        graph.updateNodes(forestData, forestData.socketsByNode.keys())
+        return graph
+
+    def updateNodes(self, forestData, nodeIDs):
+        '''
+        The nodes have to contain all nodes whose sockets or links changed,
+        like the changedNodes of the forest data.
+        '''
+        nodeIDs = list(nodeIDs)
+        socketsByNode = forestData.socketsByNode
+        for nodeID in nodeIDs:
+            if nodeID in socketsByNode: self.insertNode(nodeID, forestData)
+            else: self.removeNode(nodeID)
+        # the linked sockets have an index now
+        for nodeID in nodeIDs:
+            if nodeID in socketsByNode: self.updateLinks(nodeID, forestData)
+
+    def insertNode(self, nodeID, forestData):
+        inputIDs, outputIDs = forestData.socketsByNode[nodeID]
+        nodeIndex = self.indexByNode.get(nodeID)
+        if nodeIndex is None:
+            nodeIndex = len(self.nodeIDs)
+            self.indexByNode[nodeID] = nodeIndex
+            self.nodeIDs.append(nodeID)
+            self.typeByNode.append(None)
+            self.inputIndices.append(())
+            self.outputIndices.append(())
+        else:
+            # sockets that still exist keep their index
+            self.removeSockets(set(self.inputIndices[nodeIndex] + self.outputIndices[nodeIndex])
+                - {self.indexBySocket[socketID] for socketID in chain(inputIDs, outputIDs) if socketID in self.indexBySocket})
+            self.nodesByType[self.typeByNode[nodeIndex]].discard(nodeIndex)
+
+        nodeType = forestData.typeByNode[nodeID]
+        self.typeByNode[nodeIndex] = nodeType
+        self.nodesByType[nodeType].add(nodeIndex)
+        dataTypeBySocket = forestData.dataTypeBySocket
+        self.inputIndices[nodeIndex] = tuple(self.insertSocket(socketID, nodeIndex, dataTypeBySocket) for socketID in inputIDs)
+        self.outputIndices[nodeIndex] = tuple(self.insertSocket(socketID, nodeIndex, dataTypeBySocket) for socketID in outputIDs)
+
+    def insertSocket(self, socketID, nodeIndex, dataTypeBySocket):
+        socketIndex = self.indexBySocket.get(socketID)
+        if socketIndex is None:
+            socketIndex = len(self.socketIDs)
+            self.indexBySocket[socketID] = socketIndex
+            self.socketIDs.append(socketID)
+            self.nodeBySocket.append(nodeIndex)
+            self.dataTypes.append(None)
+            self.linkedSockets.append(())
+            self.linkedSocketIDs.append(())
+            self.directlyLinkedSockets.append(())
+        self.dataTypes[socketIndex] = dataTypeBySocket.get(socketID)
+        return socketIndex
+
+    def removeNode(self, nodeID):
+        nodeIndex = self.indexByNode.pop(nodeID, None)
+        if nodeIndex is None: return
+        self.removeSockets(self.inputIndices[nodeIndex] + self.outputIndices[nodeIndex])
+        self.nodesByType[self.typeByNode[nodeIndex]].discard(nodeIndex)
+        self.nodeIDs[nodeIndex] = None
+        self.typeByNode[nodeIndex] = None
+        self.inputIndices[nodeIndex] = ()
+        self.outputIndices[nodeIndex] = ()
+
+    def removeSockets(self, socketIndices):
+        for socketIndex in socketIndices:
+            del self.indexBySocket[self.socketIDs[socketIndex]]
+            self.socketIDs[socketIndex] = None
+            self.dataTypes[socketIndex] = None
+            self.linkedSockets[socketIndex] = ()
+            self.linkedSocketIDs[socketIndex] = ()
+            self.directlyLinkedSockets[socketIndex] = ()
+
+    def updateLinks(self, nodeID, forestData):
+        nodeIndex = self.indexByNode[nodeID]
+        indexBySocket = self.indexBySocket
+        for socketIndex in chain(self.inputIndices[nodeIndex], self.outputIndices[nodeIndex]):
+            socketID = self.socketIDs[socketIndex]
+            linkedIDs = tuple(forestData.linkedSockets.get(socketID, ()))
+            self.linkedSocketIDs[socketIndex] = linkedIDs
+            self.linkedSockets[socketIndex] = tuple(indexBySocket[linkedID] for linkedID in linkedIDs)
+            self.directlyLinkedSockets[socketIndex] = tuple(indexBySocket[linkedID]
+                for linkedID in forestData.linkedSocketsWithReroutes.get(socketID, ()))
+
+    def hasManyUnusedIndices(self):
+        return len(self.indexBySocket) * 2 < len(self.socketIDs)
+
+    def getSocketIndex(self, socketID):
+        return self.indexBySocket.get(socketID, -1)
+
+    def getNodeIndex(self, nodeID):
+        return self.indexByNode.get(nodeID, -1)
+
+    def getLinkAmount(self, socketIndex):
+        if socketIndex == -1: return 0
+        return len(self.linkedSockets[socketIndex])
+
+    def iterLinkedIndices(self, socketIndex):
+        if socketIndex == -1: return iter(())
+        return iter(self.linkedSockets[socketIndex])
+
+    def getLinkedSocketIDs(self, socketID):
+        socketIndex = self.getSocketIndex(socketID)
+        if socketIndex == -1: return ()
+        return self.linkedSocketIDs[socketIndex]
+
+    def getDirectlyLinkedSocketIDs(self, socketID):
+        socketIndex = self.getSocketIndex(socketID)
+        if socketIndex == -1: return []
+        socketIDs = self.socketIDs
+        return [socketIDs[index] for index in self.directlyLinkedSockets[socketIndex]]
+
+    def getInputIndices(self, nodeIndex):
+        return self.inputIndices[nodeIndex]
+
+    def getOutputIndices(self, nodeIndex):
+        return self.outputIndices[nodeIndex]
+
+    def getNodeIDsByType(self, idName):
+        nodeIDs = self.nodeIDs
+        return [nodeIDs[index] for index in sorted(self.nodesByType.get(idName, ()))]
+
+    def iterLinks(self):
+        '''Yields every link once as (originIndex, targetIndex)'''
+        linkedSockets = self.linkedSockets
+        for outputIndices in self.outputIndices:
+            for socketIndex in outputIndices:
+                for targetIndex in linkedSockets[socketIndex]:
+                    yield socketIndex, targetIndex
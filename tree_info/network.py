@@ -10,6 +10,9 @@ class NodeNetwork:
         self.name = ""
         self.description = ""
         self.identifier = None
+        # networks this network has been joined from
+        self.fragments = []
+        self.sortedAnimationNodeIDs = None
         self.analyse(nodeByID)
 
     def analyse(self, nodeByID):
@@ -101,7 +104,9 @@ class NodeNetwork:
         nodeIDs = []
         for network in networks:
             nodeIDs.extend(network.nodeIDs)
-        return NodeNetwork(nodeIDs, forestData, nodeByID)
+        network = NodeNetwork(nodeIDs, forestData, nodeByID)
+        network.fragments = list(networks)
+        return network
 
     def getNodes(self, nodeByID = None):
         if nodeByID is None:
@@ -159,9 +164,27 @@ class NodeNetwork:
 
 
     def getSortedAnimationNodes(self, nodeByID = None):
+        nodeIDs = self.getSortedAnimationNodeIDs()
+        if nodeByID is None:
+            nodes = self.nodeTree.nodes
+            return [nodes[nodeID[1]] for nodeID in nodeIDs]
+        else:
+            return [nodeByID[nodeID] for nodeID in nodeIDs]
+
+    def getSortedAnimationNodeIDs(self):
+        if self.sortedAnimationNodeIDs is None:
+            if len(self.fragments) > 0:
+                # the fragments are not linked with each other
+                self.sortedAnimationNodeIDs = [nodeID for fragment in self.fragments
+                                               for nodeID in fragment.getSortedAnimationNodeIDs()]
+            else:
+                self.sortedAnimationNodeIDs = self.sortNodeIDs()
+        return self.sortedAnimationNodeIDs
+
+    def sortNodeIDs(self):
         '''
         Used Algorithm:
-        https://en.wikipedia.org/wiki/Topological_sorting#Depth-first_search
+        https://en.wikipedia.org/wiki/Topological_sorting#Kahn.27s_algorithm
         '''
 
         # localize variables
@@ -169,46 +192,30 @@ class NodeNetwork:
         linkedSockets = self.forestData.linkedSockets
         animationNodes = self.forestData.animationNodes
 
-        markedNodeIDs = set()
-        temporaryMarkedNodeIDs = set()
-        unmarkedNodeIDs = self.nodeIDs.copy()
-        sortedAnimationNodesIDs = list()
-
-        nodeTree = self.nodeTree
-
-        def sort():
-            while unmarkedNodeIDs:
-                visit(unmarkedNodeIDs.pop())
-
-        def visit(nodeID):
-            if nodeID in temporaryMarkedNodeIDs:
-                problems.NodeLinkRecursion().report()
-                raise Exception()
-
-            if nodeID not in markedNodeIDs:
-                temporaryMarkedNodeIDs.add(nodeID)
+        # sorting the ids first makes the generated code independent of the set order
+        nodeIDs = sorted(self.nodeIDs)
+        dependencyAmounts = dict.fromkeys(nodeIDs, 0)
+        dependentNodes = {nodeID : [] for nodeID in nodeIDs}
 
-                for dependentNode in iterDependentNodes(nodeID):
-                    visit(dependentNode)
-
-                temporaryMarkedNodeIDs.remove(nodeID)
-                markedNodeIDs.add(nodeID)
-
-                if nodeID in animationNodes:
-                    sortedAnimationNodesIDs.append(nodeID)
-
-        def iterDependentNodes(nodeID):
+        for nodeID in nodeIDs:
             for socketID in socketsByNode[nodeID][0]:
-                for otherSocketID in linkedSockets[socketID]:
-                    yield otherSocketID[0]
-
-        def idsToNodes(nodeIDs):
-            if nodeByID is None:
-                nodes = nodeTree.nodes
-                return [nodes[nodeID[1]] for nodeID in nodeIDs]
-            else:
-                return [nodeByID[nodeID] for nodeID in nodeIDs]
-
-        sort()
-
-        return idsToNodes(sortedAnimationNodesIDs)
+                for originSocketID in linkedSockets.get(socketID, ()):
+                    dependentNodes[originSocketID[0]].append(nodeID)
+                    dependencyAmounts[nodeID] += 1
+
+        readyNodeIDs = [nodeID for nodeID in reversed(nodeIDs) if dependencyAmounts[nodeID] == 0]
+        sortedNodeIDs = []
+        while readyNodeIDs:
+            nodeID = readyNodeIDs.pop()
+            sortedNodeIDs.append(nodeID)
+            for dependentID in dependentNodes[nodeID]:
+                dependencyAmounts[dependentID] -= 1
+                if dependencyAmounts[dependentID] == 0:
+                    readyNodeIDs.append(dependentID)
+
+        if len(sortedNodeIDs) < len(nodeIDs):
+            problems.NodeLinkRecursion().report()
+            cycleNodeIDs = [nodeID for nodeID in nodeIDs if dependencyAmounts[nodeID] > 0]
+            raise problems.NodeLinkCycle(cycleNodeIDs)
+
+        return [nodeID for nodeID in sortedNodeIDs if nodeID in animationNodes]
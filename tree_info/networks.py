@@ -5,20 +5,34 @@ from . network import NodeNetwork
 class NodeNetworks:
     def __init__(self):
         self._reset()
+        self.reusedOrderAmount = 0
 
     def _reset(self):
         self.networks = []
         self.networkByNode = {}
+        self.fragmentsByTree = {}
 
-    def update(self, forestData, nodeByID):
+    def update(self, forestData, nodeByID, changedTrees = None):
+        '''
+        Networks of trees that are not in changedTrees are reused.
+        When changedTrees is None all networks are recalculated.
+        '''
+        oldFragmentsByTree = self.fragmentsByTree
         self._reset()
         self.forestData = forestData
 
-        networksByIdentifier = defaultdict(list)
-        for nodes in self.iterNodeGroups():
-            if not self.groupContainsAnimationNodes(nodes): continue
+        for treeName, nodes in forestData.nodesByTree.items():
+            if changedTrees is None or treeName not in oldFragmentsByTree:
+                self.fragmentsByTree[treeName] = list(self.iterNetworkFragments(nodes, nodeByID))
+            elif treeName in changedTrees:
+                fragments = list(self.iterNetworkFragments(nodes, nodeByID))
+                self.keepSortedNodes(fragments, oldFragmentsByTree[treeName])
+                self.fragmentsByTree[treeName] = fragments
+            else:
+                self.fragmentsByTree[treeName] = oldFragmentsByTree[treeName]
 
-            network = NodeNetwork(nodes, self.forestData, nodeByID)
+        networksByIdentifier = defaultdict(list)
+        for network in chain.from_iterable(self.fragmentsByTree.values()):
             networksByIdentifier[network.identifier].append(network)
 
         for identifier, networks in networksByIdentifier.items():
@@ -33,14 +47,55 @@ class NodeNetworks:
             for nodeID in network.nodeIDs:
                 self.networkByNode[nodeID] = network
 
+    def keepSortedNodes(self, fragments, oldFragments):
+        '''
+        The node order only has to be calculated again when the
+        links of the changed nodes don't fit to the old order anymore.
+        '''
+        changedNodes = self.forestData.changedNodes
+        oldFragmentByNodes = {frozenset(fragment.nodeIDs) : fragment for fragment in oldFragments}
+        for fragment in fragments:
+            oldFragment = oldFragmentByNodes.get(frozenset(fragment.nodeIDs))
+            if oldFragment is None or oldFragment.sortedAnimationNodeIDs is None: continue
+            changedNodeIDs = [nodeID for nodeID in fragment.nodeIDs if nodeID in changedNodes]
+            if self.isOrderValid(oldFragment.sortedAnimationNodeIDs, changedNodeIDs):
+                fragment.sortedAnimationNodeIDs = oldFragment.sortedAnimationNodeIDs
+                self.reusedOrderAmount += 1
+
+    def isOrderValid(self, sortedNodeIDs, nodeIDs):
+        '''Checks that the linked nodes of the given nodes are on the correct side of them'''
+        if len(nodeIDs) == 0: return True
+        socketsByNode = self.forestData.socketsByNode
+        linkedSockets = self.forestData.linkedSockets
+        indexByNode = {nodeID : index for index, nodeID in enumerate(sortedNodeIDs)}
+
+        for nodeID in nodeIDs:
+            index = indexByNode.get(nodeID)
+            if index is None: continue
+            inputIDs, outputIDs = socketsByNode[nodeID]
+            for socketID in inputIDs:
+                for originID in linkedSockets.get(socketID, ()):
+                    originIndex = indexByNode.get(originID[0])
+                    if originIndex is not None and originIndex >= index: return False
+            for socketID in outputIDs:
+                for targetID in linkedSockets.get(socketID, ()):
+                    targetIndex = indexByNode.get(targetID[0])
+                    if targetIndex is not None and targetIndex <= index: return False
+        return True
+
+    def iterNetworkFragments(self, nodes, nodeByID):
+        for nodeGroup in self.iterNodeGroups(nodes):
+            if self.groupContainsAnimationNodes(nodeGroup):
+                yield NodeNetwork(nodeGroup, self.forestData, nodeByID)
+
     def groupContainsAnimationNodes(self, nodes):
         typeByNode = self.forestData.typeByNode
         nonAnimationNodes = ("NodeFrame", "NodeReroute")
         return any(typeByNode[node] not in nonAnimationNodes for node in nodes)
 
-    def iterNodeGroups(self):
+    def iterNodeGroups(self, nodes):
         foundNodes = set()
-        for node in self.forestData.nodes:
+        for node in nodes:
             if node not in foundNodes:
                 nodeGroup = self.getAllConnectedNodes(node)
                 foundNodes.update(nodeGroup)
@@ -2,6 +2,8 @@ import bpy
 from .. problems import canExecute
 from .. utils.layout import writeText
 from .. utils.blender_ui import isViewportRendering
+from .. preferences import getPreferences
+from .. execution.auto_execution import isNodeTreeDeferred
 
 class AutoExecutionPanel(bpy.types.Panel):
     bl_idname = "an_auto_execution_panel"
@@ -46,6 +48,12 @@ class AutoExecutionPanel(bpy.types.Panel):
 
         layout.prop(autoExecution, "minTimeDifference", slider = True)
 
+        col = layout.column(align = True)
+        col.prop(autoExecution, "priority", text = "Priority")
+        col.prop(getPreferences(), "autoExecutionTimeBudget", text = "Budget")
+        if isNodeTreeDeferred(tree):
+            col.label("Deferred (budget exceeded)", icon = "TIME")
+
         col = layout.column()
         col.operator("an.add_auto_execution_trigger", text = "New Trigger", icon = "ZOOMIN")
         customTriggers = autoExecution.customTriggers
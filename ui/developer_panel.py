@@ -1,5 +1,10 @@
 import bpy
 from .. preferences import getPreferences
+from .. utils.timing import prettyTime
+from .. tree_info import getUpdateCounters
+from .. execution.compile_scripts import getCacheStatistics
+from .. execution.profiling import getExecutionProfile, getSlowestCallPaths, getCallPathName
+from .. event_handler import getStageTimings, getEventCounters
 from .. operators.output_execution_code import setupTextEditorCallback, executionCodeTextBlockName
 
 
@@ -32,6 +37,11 @@ class DeveloperPanel(bpy.types.Panel):
 
         layout.separator()
 
+        col = layout.column()
+        self.drawEventStatistics(col)
+
+        layout.separator()
+
         layout.prop(preferences.nodeColors, "nodeColorMode", text = "Color Mode")
 
     def drawExecutionCodeSettings(self, layout, preferences):
@@ -44,6 +54,12 @@ class DeveloperPanel(bpy.types.Panel):
         row.prop(executionCode, "type", text = "")
         if executionCode.type == "MEASURE":
             row.operator("an.reset_measurements", text = "", icon = "RECOVER_LAST")
+        if executionCode.type == "PROFILE":
+            row.operator("an.reset_profile", text = "", icon = "RECOVER_LAST")
+            row.operator("an.export_profile_trace", text = "", icon = "EXPORT")
+        col.prop(executionCode, "memoizeNodes")
+        col.prop(executionCode, "parallelExecution")
+        col.prop(executionCode, "inlineGroupNodeLimit")
 
         row = col.row(align = True)
         row.operator("an.print_current_execution_code", text = "Print", icon = "CONSOLE")
@@ -52,6 +68,28 @@ class DeveloperPanel(bpy.types.Panel):
         subrow.active = executionCodeTextBlockName in bpy.data.texts
         subrow.operator("an.select_area", text = "", icon = "ZOOM_SELECTED").callback = setupTextEditorCallback
 
+        statistics = getCacheStatistics()
+        row = layout.row(align = True)
+        row.label("Bytecode Cache: {} hits, {} from disk, {} misses".format(
+            statistics["memoryHits"], statistics["diskHits"], statistics["misses"]))
+        row.operator("an.clear_bytecode_cache", text = "", icon = "X")
+
+        if executionCode.type == "PROFILE":
+            self.drawProfileSummary(layout)
+
+    def drawProfileSummary(self, layout):
+        profile = getExecutionProfile()
+        if profile.calls == 0: return
+
+        col = layout.column(align = True)
+        col.label("Executions: {}, P50: {}, P95: {}, Max: {}".format(profile.calls,
+            prettyTime(profile.getPercentile(50) * 1e-9),
+            prettyTime(profile.getPercentile(95) * 1e-9),
+            prettyTime(profile.maxTime * 1e-9)))
+        col.label("Slowest Call Paths:")
+        for callPath, time in getSlowestCallPaths(5):
+            col.label("  {}: {}".format(getCallPathName(callPath), prettyTime(time * 1e-9)))
+
     def drawProfilingSettings(self, layout, preferences):
         profiling = preferences.developer.profiling
 
@@ -64,3 +102,16 @@ class DeveloperPanel(bpy.types.Panel):
         props.function = profiling.function
         props.sort = profiling.sort
         props.output = profiling.output
+
+    def drawEventStatistics(self, layout):
+        row = layout.row(align = True)
+        row.label("Events:")
+        row.operator("an.reset_event_statistics", text = "", icon = "RECOVER_LAST")
+
+        col = layout.column(align = True)
+        for name, amount in sorted(getEventCounters().items()):
+            col.label("{}: {}".format(name, amount))
+        for name, amount in getUpdateCounters().items():
+            col.label("Tree Info - {}: {}".format(name, amount))
+        for name, timing in getStageTimings().items():
+            col.label("{}: {} (last {})".format(name, prettyTime(timing.averageTime), prettyTime(timing.lastTime)))
@@ -355,10 +355,14 @@ class MeshMenu(bpy.types.Menu):
         insertNode(layout, "an_VertexInfoNode", "Vertex Info")
         insertNode(layout, "an_PolygonInfoNode", "Polygon Info")
         insertNode(layout, "an_TransformPolygonNode", "Transform Polygon")
+        insertNode(layout, "an_PolygonArrayInfoNode", "Polygon Array Info")
+        insertNode(layout, "an_TransformPolygonArrayNode", "Transform Polygon Array")
         layout.separator()
         insertNode(layout, "an_SeparateMeshDataNode", "Separate")
         insertNode(layout, "an_CombineMeshDataNode", "Combine")
         insertNode(layout, "an_MeshDataFromPolygonsNode", "Mesh Data from Polygons")
+        insertNode(layout, "an_PolygonArrayFromPolygonsNode", "Polygon Array from Polygons")
+        insertNode(layout, "an_PolygonsFromPolygonArrayNode", "Polygons from Polygon Array")
         layout.menu("an_mesh_generators_menu", text = "Generators")
         layout.menu("an_mesh_operators_menu", text = "Operators")
         layout.separator()
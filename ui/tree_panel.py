@@ -2,6 +2,7 @@ import bpy
 from .. problems import canExecute
 from .. utils.layout import writeText
 from .. utils.timing import prettyTime
+from .. execution.frame_cache import getFrameCacheIfExists
 
 class TreePanel(bpy.types.Panel):
     bl_idname = "an_tree_panel"
@@ -34,6 +35,19 @@ class TreePanel(bpy.types.Panel):
         layout.prop_search(tree, "sceneName", bpy.data, "scenes", icon = "SCENE_DATA", text = "Scene")
         layout.prop(tree, "editNodeLabels")
 
+        self.drawFrameCache(layout, tree)
+
+    def drawFrameCache(self, layout, tree):
+        col = layout.column(align = True)
+        col.prop(tree.frameCache, "enabled")
+        if not tree.frameCache.enabled: return
+
+        col.prop(tree.frameCache, "memoryLimit", text = "Limit (MB)")
+        frameCache = getFrameCacheIfExists(tree.name)
+        if frameCache is not None:
+            col.label("{} frames, {:.1f} MB".format(len(frameCache), frameCache.totalSize / 1024 ** 2))
+            col.label("Hits: {}, Misses: {}".format(frameCache.hits, frameCache.misses))
+
 
     @classmethod
     def getTree(cls):
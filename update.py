@@ -11,9 +11,10 @@ from . utils.nodes import iterAnimationNodes, getAnimationNodeTrees, createNodeB
 def updateEverything():
     '''
     Call when the node tree changed in a way that the execution code does
-    not work anymore.
+    not work anymore. Only the changed trees are analyzed again, unless
+    a file or addon was loaded or undo was used.
     '''
-    tree_info.update()
+    tree_info.updateIfNecessary()
     problems.reset()
     enableUseFakeUser()
     callNodeEditFunctions()
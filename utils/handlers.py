@@ -10,6 +10,7 @@ fileLoadPostHandlers = []
 addonLoadPostHandlers = []
 sceneUpdatePostHandlers = []
 frameChangePostHandlers = []
+undoPostHandlers = []
 
 renderPreHandlers = []
 renderInitHandlers = []
@@ -23,6 +24,7 @@ def eventHandler(event):
         if event == "ADDON_LOAD_POST": addonLoadPostHandlers.append(function)
         if event == "SCENE_UPDATE_POST": sceneUpdatePostHandlers.append(function)
         if event == "FRAME_CHANGE_POST": frameChangePostHandlers.append(function)
+        if event == "UNDO_POST": undoPostHandlers.append(function)
 
         if event == "RENDER_INIT": renderInitHandlers.append(function)
         if event == "RENDER_PRE": renderPreHandlers.append(function)
@@ -63,6 +65,11 @@ def frameChangedPost(scene):
     for handler in frameChangePostHandlers:
         handler(scene)
 
+@persistent
+def undoPost(scene):
+    for handler in undoPostHandlers:
+        handler()
+
 @persistent
 def renderInitialized(scene):
     for handler in renderInitHandlers:
@@ -83,6 +90,8 @@ def registerHandlers():
     bpy.app.handlers.scene_update_post.append(sceneUpdatePost)
     bpy.app.handlers.load_post.append(loadPost)
     bpy.app.handlers.save_pre.append(savePre)
+    bpy.app.handlers.undo_post.append(undoPost)
+    bpy.app.handlers.redo_post.append(undoPost)
 
     bpy.app.handlers.render_complete.append(renderCompleted)
     bpy.app.handlers.render_init.append(renderInitialized)
@@ -97,6 +106,8 @@ def unregisterHandlers():
     bpy.app.handlers.scene_update_post.remove(sceneUpdatePost)
     bpy.app.handlers.load_post.remove(loadPost)
     bpy.app.handlers.save_pre.remove(savePre)
+    bpy.app.handlers.undo_post.remove(undoPost)
+    bpy.app.handlers.redo_post.remove(undoPost)
 
     bpy.app.handlers.render_complete.remove(renderCompleted)
     bpy.app.handlers.render_init.remove(renderInitialized)
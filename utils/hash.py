@@ -1,4 +1,7 @@
 import hashlib
+from array import array
+from itertools import chain
+from mathutils import Vector
 
 # Changing this function can result in broken files
 def hashStringToNumber(text):
@@ -6,3 +9,36 @@ def hashStringToNumber(text):
     md5.update(text.encode("utf-8"))
     number = int(int(md5.hexdigest(), 16) % 1e8)
     return number
+
+def getValueFingerprint(value):
+    '''
+    Returns a hashable key that is equal for values with the same content.
+    Long number and vector lists are reduced to a digest of their binary data.
+    Only values of comparable sockets are supported.
+    '''
+    if isinstance(value, list):
+        if len(value) > 16:
+            digest = getListDigest(value)
+            if digest is not None:
+                return (type(value[0]).__name__, len(value), digest)
+        return ("list", tuple(getValueFingerprint(element) for element in value))
+    if isinstance(value, Vector):
+        return ("Vector", tuple(value))
+    return value
+
+def getListDigest(elements):
+    if isinstance(elements[0], Vector):
+        # all vectors need the same size, otherwise different lists could have the same data
+        size = len(elements[0])
+        if not all(isinstance(vector, Vector) and len(vector) == size for vector in elements): return None
+        return getNumberArrayDigest("d", chain.from_iterable(elements))
+    if isinstance(elements[0], float):
+        return getNumberArrayDigest("d", elements)
+    if isinstance(elements[0], int):
+        return getNumberArrayDigest("q", elements)
+    return None
+
+def getNumberArrayDigest(typecode, numbers):
+    try: data = array(typecode, numbers)
+    except (TypeError, OverflowError): return None
+    return hashlib.md5(data.tobytes()).digest()
@@ -0,0 +1,33 @@
+import sys
+import numpy
+
+# long lists are estimated from this many elements
+sampleAmount = 32
+
+def estimateSize(value, depth = 0):
+    '''
+    Approximate memory usage of a value in bytes.
+    Data structures with an estimateSize method measure themselves.
+    '''
+    if isinstance(value, numpy.ndarray):
+        return value.nbytes
+    # the class is checked, because e.g. splines return None for unknown attributes
+    if hasattr(type(value), "estimateSize"):
+        return value.estimateSize()
+
+    size = sys.getsizeof(value)
+    if depth < 3 and isinstance(value, (list, tuple)):
+        size += estimateElementsSize(value, depth + 1)
+    elif depth < 3 and isinstance(value, dict):
+        size += estimateElementsSize(list(value.values()), depth + 1)
+    return size
+
+def estimateElementsSize(elements, depth):
+    amount = len(elements)
+    if amount <= sampleAmount:
+        return sum(estimateSize(element, depth) for element in elements)
+
+    # the elements are spread over the list, because the first ones can be special
+    step = amount / sampleAmount
+    sampleSize = sum(estimateSize(elements[int(i * step)], depth) for i in range(sampleAmount))
+    return sampleSize * amount // sampleAmount
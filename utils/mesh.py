@@ -0,0 +1,117 @@
+import bpy
+import numpy
+from mathutils import Vector
+from .. events import isRendering
+from . math import extractRotation
+from .. data_structures.mesh import PolygonArray
+
+# Read Arrays
+###########################
+
+def getVertexLocationArray(mesh):
+    locations = numpy.empty(len(mesh.vertices) * 3, dtype = numpy.float32)
+    mesh.vertices.foreach_get("co", locations)
+    return locations.reshape((-1, 3))
+
+def getEdgeIndexArray(mesh):
+    indices = numpy.empty(len(mesh.edges) * 2, dtype = numpy.int32)
+    mesh.edges.foreach_get("vertices", indices)
+    return indices.reshape((-1, 2))
+
+def getPolygonIndexArrays(mesh):
+    '''Returns the vertex indices of all polygons and the start and length of every polygon'''
+    indices = numpy.empty(len(mesh.loops), dtype = numpy.int32)
+    starts = numpy.empty(len(mesh.polygons), dtype = numpy.int32)
+    lengths = numpy.empty(len(mesh.polygons), dtype = numpy.int32)
+    mesh.loops.foreach_get("vertex_index", indices)
+    mesh.polygons.foreach_get("loop_start", starts)
+    mesh.polygons.foreach_get("loop_total", lengths)
+    return indices, starts, lengths
+
+def getMeshArrays(mesh):
+    return (getVertexLocationArray(mesh), getEdgeIndexArray(mesh)) + getPolygonIndexArrays(mesh)
+
+def getPolygonAttributeArray(mesh, attribute, dtype = numpy.float32, size = 1):
+    values = numpy.empty(len(mesh.polygons) * size, dtype = dtype)
+    mesh.polygons.foreach_get(attribute, values)
+    return values if size == 1 else values.reshape((-1, size))
+
+def createPolygonArray(mesh, vertexLocations, polygonIndexArrays, matrix = None):
+    '''
+    The vertex locations have to be in the same space as the matrix transforms into.
+    The polygon index arrays are the vertex indices, starts and lengths of the polygons.
+    '''
+    indices, starts, lengths = polygonIndexArrays
+    offsets = numpy.zeros(len(lengths) + 1, dtype = numpy.int32)
+    numpy.cumsum(lengths, out = offsets[1:])
+    # the loops of the polygons in polygon order
+    loopIndices = numpy.repeat(starts - offsets[:-1], lengths) + numpy.arange(offsets[-1], dtype = numpy.int32)
+
+    centers = getPolygonAttributeArray(mesh, "center", size = 3)
+    normals = getPolygonAttributeArray(mesh, "normal", size = 3)
+    areas = getPolygonAttributeArray(mesh, "area")
+    if matrix is not None:
+        centers = transformLocationArray(centers, matrix)
+        normals = normals.dot(numpy.array(extractRotation(matrix), dtype = numpy.float32)[:3, :3].T)
+        areas = areas * matrix.median_scale
+
+    return PolygonArray(centers, normals, areas,
+        getPolygonAttributeArray(mesh, "material_index", dtype = numpy.int32),
+        vertexLocations[indices[loopIndices]], offsets)
+
+
+# Convert Arrays
+###########################
+
+def transformLocationArray(locations, matrix):
+    matrix = numpy.array(matrix, dtype = numpy.float32)
+    return locations.dot(matrix[:3, :3].T) + matrix[:3, 3]
+
+def toVectorList(locations):
+    return [Vector(location) for location in locations.tolist()]
+
+def toTupleList(indices):
+    return list(map(tuple, indices.tolist()))
+
+def toPolygonTupleList(indices, starts, lengths):
+    indices = indices.tolist()
+    return [tuple(indices[start:start + length]) for start, length in zip(starts.tolist(), lengths.tolist())]
+
+
+# Evaluated Meshes
+###########################
+
+class MeshEvaluation:
+    '''Mesh whose arrays are only read once, even when many nodes use them'''
+    __slots__ = ("mesh", "_arrays")
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self._arrays = None
+
+    @property
+    def arrays(self):
+        if self._arrays is None:
+            self._arrays = getMeshArrays(self.mesh)
+        return self._arrays
+
+# the cache is cleared after every execution, the meshes are removed then
+cache = {}
+
+def clearCache():
+    for evaluation in cache.values():
+        try: bpy.data.meshes.remove(evaluation.mesh)
+        except ReferenceError: pass
+    cache.clear()
+
+def getEvaluatedMesh(object, scene):
+    '''
+    Applies the modifiers of the object only once per execution.
+    The temporary mesh stays valid until the cache is cleared.
+    '''
+    settings = "RENDER" if isRendering() else "PREVIEW"
+    identifier = (object.as_pointer(), scene.as_pointer(), settings)
+    if identifier not in cache:
+        mesh = object.to_mesh(scene = scene, apply_modifiers = True, settings = settings)
+        cache[identifier] = MeshEvaluation(mesh)
+    return cache[identifier]